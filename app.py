@@ -1,14 +1,15 @@
 from flask import Flask
-from flask_session import Session
-from controllers import auth_controller, contact_controller
+from controllers import auth_controller, contact_controller, api_controller
 import os
 import sys
+import time
 
 # Configuración básica para evitar el error de sesión
 class BaseConfig:
     # Asegurar que SECRET_KEY sea siempre string, nunca bytes
     SECRET_KEY = str(os.environ.get('SECRET_KEY', 'dev-key-segura-para-flask-session-2024'))
-    SESSION_TYPE = 'filesystem'
+    SESSION_BACKEND = 'cookie'  # 'cookie', 'memory', 'sql' o 'filesystem'
+    SESSION_TYPE = 'filesystem'  # Solo para SESSION_BACKEND = 'filesystem'
     SESSION_PERMANENT = False
     SESSION_USE_SIGNER = False  # Deshabilitado temporalmente para evitar error de bytes
     SESSION_KEY_PREFIX = 'contactos_'
@@ -27,24 +28,19 @@ class BaseConfig:
 
 def create_app():
     """Factory function para crear la aplicación Flask"""
+    started = time.perf_counter()
     app = Flask(__name__)
     
     # Cargar configuración básica primero
     app.config.from_object(BaseConfig)
     
-    # Intentar cargar configuración personalizada si existe
+    # Configuración personalizada (config.py) si existe
     try:
-        from config_auto import Config as AutoConfig
-        app.config.from_object(AutoConfig)
-        print("✅ Usando configuración automática")
+        from config import Config as FileConfig
+        app.config.from_object(FileConfig)
+        print("✅ Usando configuración del archivo")
     except ImportError:
-        try:
-            from config import Config as FileConfig
-            app.config.from_object(FileConfig)
-            print("✅ Usando configuración del archivo")
-        except ImportError:
-            print("⚠️  Usando configuración básica")
-            print("💡 Para configuración personalizada, ejecuta: python setup_database.py")
+        print("⚠️  Usando configuración básica")
     
     # Asegurar que SECRET_KEY sea siempre string (nunca bytes)
     if isinstance(app.config.get('SECRET_KEY'), bytes):
@@ -55,33 +51,55 @@ def create_app():
         app.config['SECRET_KEY'] = str(app.config['SECRET_KEY'])
     
     # Mostrar configuración
-    print(f"\n🔧 Configuración MySQL:")
-    print(f"   Host: {app.config.get('MYSQL_HOST')}")
-    print(f"   Usuario: {app.config.get('MYSQL_USER')}")
-    print(f"   Base de datos: {app.config.get('MYSQL_DATABASE')}")
+    from models.database import get_backend
+    print(f"\n🔧 Configuración de la base de datos:")
+    print(f"   {get_backend(app).describe()}")
     
-    # Configurar Flask-Session ANTES de inicializar la base de datos
-    # Esto es clave para evitar el error
-    Session(app)
+    # Configurar el almacenamiento de sesiones ANTES de inicializar la base de datos
+    from models.session_store import init_session
+    backend = init_session(app)
+    print(f"   Sesiones: {backend}")
     
     # Importar después de configurar la sesión
     from models.database import init_db
     
     try:
-        # Inicializar base de datos
-        init_db(app)
-        print("✅ Base de datos inicializada correctamente")
+        # Comprobar la versión del esquema (las tablas se crean con 'flask db upgrade')
+        version = init_db(app)
+        if version is None:
+            print("⚠️  Esquema desactualizado: ejecuta 'flask --app app db upgrade'")
+        else:
+            print(f"✅ Base de datos lista (esquema v{version})")
     except Exception as e:
         print(f"\n❌ Error inicializando base de datos: {e}")
         print("\n💡 SOLUCIONES:")
-        print("1. Asegúrate que MySQL esté corriendo")
-        print("2. Ejecuta: python setup_database.py")
+        print("1. Asegúrate que MySQL esté corriendo (o usa DB_BACKEND=sqlite)")
+        print("2. Ejecuta: flask --app app db upgrade")
         print("3. Verifica credenciales")
         raise
     
+    # Métricas de rendimiento por petición (/metrics y cabecera Server-Timing)
+    from models.metrics import init_metrics
+    # Antes de los blueprints para medir también sus before_request
+    init_metrics(app)
+    
+    # Compresión de las respuestas grandes; después de las métricas para que
+    # su tiempo cuente en la duración de la petición
+    from models.compression import init_compression
+    init_compression(app)
+    
+    # Recursos estáticos con hash (asset_url y /assets/)
+    from models.assets import init_assets
+    init_assets(app)
+    
     # Registrar blueprints
     app.register_blueprint(auth_controller.bp)
     app.register_blueprint(contact_controller.bp)
+    app.register_blueprint(api_controller.bp)
+    
+    # Registrar comandos CLI
+    from cli import register_commands
+    register_commands(app)
     
     # Ruta principal
     @app.route('/')
@@ -89,6 +107,28 @@ def create_app():
         from flask import redirect, url_for
         return redirect(url_for('auth.login'))
     
+    # Estado del pool de conexiones (y de las réplicas, si hay) para monitoreo
+    @app.route('/health/db')
+    def health_db():
+        from flask import jsonify
+        from models.database import pool_stats, replica_stats
+        replicas = replica_stats()
+        return jsonify({**pool_stats(), 'replicas': replicas} if replicas else pool_stats())
+    
+    # Contadores de las cachés de contactos, usuarios y fragmentos HTML
+    @app.route('/health/cache')
+    def health_cache():
+        from flask import jsonify
+        from models.cache import get_contact_cache, get_user_cache, get_fragment_cache
+        caches = {'contactos': get_contact_cache(), 'usuarios': get_user_cache(),
+                  'fragmentos': get_fragment_cache()}
+        return jsonify({name: cache.stats() if cache is not None else {'backend': 'none'}
+                        for name, cache in caches.items()})
+    
+    # Tiempo de arranque (sin contar la importación de módulos)
+    app.config['STARTUP_TIME'] = time.perf_counter() - started
+    print(f"⏱️  Aplicación creada en {app.config['STARTUP_TIME'] * 1000:.0f} ms")
+    
     return app
 
 if __name__ == '__main__':
@@ -96,4 +136,5 @@ if __name__ == '__main__':
     print(f"\n🚀 Aplicación Flask iniciada")
     print("   🌐 Local: http://localhost:5000")
     print("   👤 Login: http://localhost:5000/auth/login")
+    print("   🏭 Producción: gunicorn -c gunicorn.conf.py wsgi:app")
     app.run(host='0.0.0.0', port=5000, debug=False)  # debug=False para evitar problemas
\ No newline at end of file
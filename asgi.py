@@ -0,0 +1,207 @@
+"""
+Aplicación ASGI con los endpoints de contactos de la API en versión asíncrona.
+
+Mientras una petición espera a la base de datos el bucle de eventos atiende
+otras, así que un solo proceso multiplexa cientos de peticiones concurrentes
+de listado/lectura sin un hilo por petición. Sus dependencias (Quart, los
+drivers asíncronos y hypercorn) están en requirements-asgi.txt:
+
+    pip install -r requirements-asgi.txt
+    hypercorn asgi:app --bind 0.0.0.0:8001
+
+Expone las mismas rutas /api/v1/contacts que la aplicación WSGI. Los tokens
+se obtienen en esta última (POST /api/v1/tokens) y valen en ambas porque
+comparten SECRET_KEY; los ETag también coinciden. Con varios workers use
+CONTACT_CACHE_BACKEND=redis (o 'none'): en 'memory' las versiones de los
+contactos son de cada proceso. Como la aplicación WSGI, comprueba al
+arrancar la versión del esquema y responde 503 hasta que se migre.
+"""
+
+from functools import wraps
+import logging
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+
+try:
+    from quart import Quart, request, jsonify, g, url_for
+except ImportError:
+    raise RuntimeError("asgi.py requiere: pip install quart")
+
+from app import BaseConfig
+from controllers.api_controller import (
+    TOKEN_SALT, contacts_etag, _error, _serialize, _type_errors, _missing_fields, _contact_from_json,
+    _update_from_json,
+)
+from models.async_contact import AsyncContactStore
+from models.async_db import create_async_database
+from models.cache import create_cache
+from models.contact import Contact, ContactConflictError
+from models.schema import SchemaVersionError, check_schema
+
+logger = logging.getLogger(__name__)
+
+
+def create_asgi_app():
+    """Factory de la aplicación Quart"""
+    app = Quart(__name__)
+    app.config.from_object(BaseConfig)
+    try:
+        from config import Config as FileConfig
+        app.config.from_object(FileConfig)
+    except ImportError:
+        pass
+
+    serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt=TOKEN_SALT)
+    cache = create_cache(app.config)
+
+    # Misma comprobación que init_db en la aplicación WSGI
+    try:
+        check_schema(app)
+    except SchemaVersionError as e:
+        logger.error(str(e))
+        message = str(e)
+
+        @app.before_request
+        async def schema_outdated():
+            return _error(message, 503)
+
+    @app.before_serving
+    async def open_database():
+        db = create_async_database(app.config)
+        await db.open()
+        app.extensions['contacts'] = AsyncContactStore(db, cache)
+
+    @app.after_serving
+    async def close_database():
+        await app.extensions['contacts'].db.close()
+
+    def contacts():
+        return app.extensions['contacts']
+
+    def token_required(f):
+        """Decorador que exige un token Bearer válido"""
+        @wraps(f)
+        async def decorated_function(*args, **kwargs):
+            auth = request.headers.get('Authorization', '')
+            if not auth.startswith('Bearer '):
+                return _error('Token de acceso requerido', 401)
+            try:
+                payload = serializer.loads(auth[7:], max_age=app.config.get('API_TOKEN_MAX_AGE', 86400))
+            except SignatureExpired:
+                return _error('Token expirado', 401)
+            except BadSignature:
+                return _error('Token inválido', 401)
+            g.api_user_id = payload['uid']
+            return await f(*args, **kwargs)
+
+        return decorated_function
+
+    async def conditional(parts, build):
+        """Responder 304 sin tocar los datos si el cliente ya tiene la versión actual"""
+        version = await contacts().version(g.api_user_id)
+        etag = contacts_etag(g.api_user_id, version, *parts) if version is not None else None
+        if etag and request.if_none_match.contains_weak(etag):
+            response = app.response_class('', status=304)
+            response.set_etag(etag, weak=True)
+            return response
+        response = await build()
+        if etag and response.status_code == 200:
+            response.set_etag(etag, weak=True)
+        return response
+
+    @app.route('/api/v1/contacts', methods=['GET'])
+    @token_required
+    async def list_contacts():
+        """Listar contactos paginados por cursor"""
+        limit = min(max(request.args.get('limit', 50, type=int), 1), app.config.get('API_MAX_PAGE_SIZE', 200))
+        after_arg, before_arg = request.args.get('after'), request.args.get('before')
+
+        async def build():
+            after = Contact.decode_cursor(after_arg)
+            before = Contact.decode_cursor(before_arg)
+            items, next_cursor, prev_cursor = await contacts().get_page_by_user(
+                g.api_user_id, limit=limit, after=after, before=None if after else before)
+            return jsonify({
+                'items': [_serialize(c) for c in items],
+                'next': next_cursor,
+                'prev': prev_cursor,
+            })
+
+        return await conditional(('list', limit, after_arg, before_arg), build)
+
+    @app.route('/api/v1/contacts/<int:contact_id>', methods=['GET'])
+    @token_required
+    async def get_contact(contact_id):
+        """Obtener un contacto"""
+        async def build():
+            contact = await contacts().get_by_id(contact_id, g.api_user_id)
+            if not contact:
+                return _error('Contacto no encontrado', 404)
+            return jsonify(_serialize(contact))
+
+        return await conditional(('id', contact_id), build)
+
+    @app.route('/api/v1/contacts', methods=['POST'])
+    @token_required
+    async def create_contact():
+        """Crear un contacto"""
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return _error('Se esperaba un objeto JSON', 400)
+        type_errors = _type_errors(data)
+        if type_errors:
+            return _error('Datos no válidos', 400, errors=type_errors)
+
+        contact = _contact_from_json(data, Contact(user_id=g.api_user_id))
+        success, errors = await contacts().save(contact)
+        if not success:
+            return _error('Datos no válidos', 422, errors=errors)
+
+        response = jsonify(_serialize(contact))
+        response.status_code = 201
+        response.headers['Location'] = url_for('get_contact', contact_id=contact.id)
+        return response
+
+    @app.route('/api/v1/contacts/<int:contact_id>', methods=['PUT', 'PATCH'])
+    @token_required
+    async def update_contact(contact_id):
+        """Actualizar un contacto (PATCH admite campos parciales)"""
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return _error('Se esperaba un objeto JSON', 400)
+        missing = _missing_fields(data) if request.method == 'PUT' else []
+        if missing:
+            return _error('PUT requiere todos los campos; usa PATCH para cambios parciales', 400, missing=missing)
+        if 'version' in data and (not isinstance(data['version'], int) or isinstance(data['version'], bool)):
+            return _error('version debe ser un entero', 400)
+        type_errors = _type_errors(data)
+        if type_errors:
+            return _error('Datos no válidos', 400, errors=type_errors)
+
+        contact = await contacts().get_by_id(contact_id, g.api_user_id)
+        if not contact:
+            return _error('Contacto no encontrado', 404)
+
+        # Con la versión que leyó el cliente, la escritura falla si otro la cambió entretanto
+        contact = _update_from_json(data, contact, replace=request.method == 'PUT')
+        try:
+            success, errors = await contacts().save(contact)
+        except ContactConflictError as e:
+            if e.current is None:
+                return _error('Contacto no encontrado', 404)
+            return _error('El contacto fue modificado; vuelve a leerlo', 409, current=_serialize(e.current))
+        if not success:
+            return _error('Datos no válidos', 422, errors=errors)
+        return jsonify(_serialize(contact))
+
+    @app.route('/api/v1/contacts/<int:contact_id>', methods=['DELETE'])
+    @token_required
+    async def delete_contact(contact_id):
+        """Eliminar un contacto"""
+        if not await contacts().delete(contact_id, g.api_user_id):
+            return _error('Contacto no encontrado', 404)
+        return '', 204
+
+    return app
+
+
+app = create_asgi_app()
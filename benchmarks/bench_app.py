@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carga de los flujos de autenticación y contactos.
+
+Levanta create_app() contra una base de datos local desechable (un archivo
+SQLite temporal o, con --backend mysql, una base ``contactos_bench_<pid>``
+en el servidor configurado; ambas se borran al terminar), siembra
+N usuarios × M contactos y ejecuta register/login/list/add/edit/delete con
+varios hilos, a través del cliente de pruebas de Flask y/o de HTTP real.
+Imprime throughput y p50/p95/p99 por ruta y, con --output, guarda los
+resultados en JSON para comparar entre commits.
+
+    python benchmarks/bench_app.py --users 20 --contacts 500 --threads 8 \\
+        --iterations 20 --driver both --output resultados.json
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PASSWORD = 'benchmark-password'
+
+
+class Recorder:
+    """Tiempos por ruta, seguro entre hilos"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route, seconds, ok):
+        with self._lock:
+            self.timings[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+    def summary(self, elapsed):
+        results = {}
+        for route, timings in sorted(self.timings.items()):
+            timings = sorted(timings)
+            pct = lambda q: timings[min(len(timings) - 1, int(q * len(timings)))] * 1000
+            results[route] = {
+                'requests': len(timings),
+                'errors': self.errors[route],
+                'throughput_rps': round(len(timings) / elapsed, 2),
+                'p50_ms': round(pct(0.50), 3),
+                'p95_ms': round(pct(0.95), 3),
+                'p99_ms': round(pct(0.99), 3),
+            }
+        return results
+
+
+class TestClientDriver:
+    """Peticiones con el cliente de pruebas de Flask (sin red)"""
+
+    def __init__(self, app, base_url=None):
+        self.client = app.test_client()
+
+    def get(self, path):
+        return self.client.get(path).status_code
+
+    def post(self, path, data):
+        return self.client.post(path, data=data).status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpDriver:
+    """Peticiones HTTP reales contra el servidor, con cookies por hilo"""
+
+    def __init__(self, app, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def _open(self, request):
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+    def get(self, path):
+        return self._open(urllib.request.Request(self.base_url + path))
+
+    def post(self, path, data):
+        body = urllib.parse.urlencode(data).encode('utf-8')
+        return self._open(urllib.request.Request(self.base_url + path, data=body, method='POST'))
+
+
+def timed(recorder, route, call, expected=(200, 302)):
+    start = time.perf_counter()
+    status = call()
+    recorder.record(route, time.perf_counter() - start, status in expected)
+    return status
+
+
+def seed(app, users, contacts_per_user):
+    """Crear usuarios y contactos; devuelve [(email, [ids de contactos])]"""
+    from models.database import get_db
+    from models.contact import Contact
+    from models.hashing import get_hasher
+
+    seeded = []
+    with app.app_context():
+        password_hash = get_hasher().hash(PASSWORD)
+        db = get_db()
+        cursor = db.cursor()
+        for u in range(users):
+            email = f'bench{u}@example.com'
+            cursor.execute('INSERT INTO usuarios (nombre, email, password_hash) VALUES (%s, %s, %s)',
+                           (f'Usuario {u}', email, password_hash))
+            user_id = cursor.lastrowid
+            batch = [Contact(nombre=f'Contacto {i:06d}', correo=f'c{i}@example.com',
+                             telefono=f'+34 600 {i:06d}', detalle='Sembrado')
+                     for i in range(contacts_per_user)]
+            for start in range(0, len(batch), 1000):
+                Contact.bulk_insert(user_id, batch[start:start + 1000])
+            cursor.execute('SELECT id FROM contactos WHERE user_id = %s ORDER BY id', (user_id,))
+            seeded.append((email, [row[0] for row in cursor.fetchall()]))
+        db.commit()
+        cursor.close()
+        # El proceso del benchmark no vuelve a calcular hashes
+        get_hasher().shutdown()
+    return seeded
+
+
+def virtual_user(driver, recorder, worker, email, contact_ids, iterations):
+    """Escenario de un usuario: registro, login y ciclo CRUD de contactos"""
+    timed(recorder, 'register', lambda: driver.post('/auth/register', {
+        'nombre': 'Nuevo', 'email': f'nuevo-{worker}-{time.time_ns()}@example.com',
+        'password': PASSWORD, 'confirm_password': PASSWORD}))
+    timed(recorder, 'login', lambda: driver.post('/auth/login', {'email': email, 'password': PASSWORD}))
+
+    editable = contact_ids[-1] if contact_ids else None
+    deletable = list(contact_ids[:-1])
+    for i in range(iterations):
+        timed(recorder, 'list', lambda: driver.get('/contactos/'))
+        timed(recorder, 'add', lambda: driver.post('/contactos/agregar', {
+            'nombre': f'Añadido {worker}-{i}', 'correo': f'a{worker}-{i}@example.com',
+            'telefono': '600000000', 'detalle': 'Benchmark'}))
+        if editable:
+            timed(recorder, 'edit_get', lambda: driver.get(f'/contactos/editar/{editable}'))
+            timed(recorder, 'edit_post', lambda: driver.post(f'/contactos/editar/{editable}', {
+                'nombre': f'Editado {i}', 'correo': 'editado@example.com',
+                'telefono': '600111222', 'detalle': f'Iteración {i}'}))
+        if deletable:
+            contact_id = deletable.pop()
+            timed(recorder, 'delete', lambda: driver.get(f'/contactos/eliminar/{contact_id}'))
+
+
+def run(app, driver_class, base_url, seeded, threads, iterations):
+    recorder = Recorder()
+    jobs = []
+    # Los hilos que comparten usuario se reparten sus contactos para editar/borrar
+    stride = -(-threads // len(seeded))
+    for worker in range(threads):
+        email, contact_ids = seeded[worker % len(seeded)]
+        share = contact_ids[worker // len(seeded)::stride]
+        jobs.append(threading.Thread(target=virtual_user, args=(
+            driver_class(app, base_url), recorder, worker, email, share, iterations)))
+
+    start = time.perf_counter()
+    for job in jobs:
+        job.start()
+    for job in jobs:
+        job.join()
+    elapsed = time.perf_counter() - start
+    return recorder.summary(elapsed), elapsed
+
+
+def start_server(app):
+    """Servidor WSGI multihilo en un puerto libre"""
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def print_results(name, results, elapsed):
+    total = sum(r['requests'] for r in results.values())
+    print(f"\n== {name}: {total} peticiones en {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+    print(f"{'ruta':<10} {'n':>6} {'err':>4} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, r in results.items():
+        print(f"{route:<10} {r['requests']:>6} {r['errors']:>4} {r['throughput_rps']:>9.1f} "
+              f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def drop_database(app):
+    from models.database import get_backend
+    backend = get_backend(app)
+    app.extensions['db_pool'].dispose()
+    if backend.name == 'mysql':
+        conn = backend.connect_server()
+        cursor = conn.cursor()
+        cursor.execute(f'DROP DATABASE IF EXISTS {backend.database}')
+        cursor.close()
+        conn.close()
+    else:
+        shutil.rmtree(os.path.dirname(os.path.abspath(backend.path)), ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10, help='usuarios sembrados (N)')
+    parser.add_argument('--contacts', type=int, default=200, help='contactos por usuario (M)')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=20, help='ciclos CRUD por hilo')
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--driver', choices=['testclient', 'http', 'both'], default='both')
+    parser.add_argument('--hash-method', default='pbkdf2:sha256:1000',
+                        help='coste del hash durante el benchmark (el real domina el login)')
+    parser.add_argument('--output', help='archivo JSON con los resultados')
+    args = parser.parse_args()
+
+    os.environ['DB_BACKEND'] = args.backend
+    os.environ['DB_AUTO_MIGRATE'] = 'True'  # la base de datos desechable empieza vacía
+    if args.backend == 'sqlite':
+        os.environ['SQLITE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='contactos_bench_'), 'bench.db')
+    else:
+        os.environ['MYSQL_DATABASE'] = f'contactos_bench_{os.getpid()}'
+    os.environ['PASSWORD_HASH_METHOD'] = args.hash_method
+
+    from app import create_app
+    app = create_app()
+    try:
+        start = time.perf_counter()
+        seeded = seed(app, args.users, args.contacts)
+        print(f"\nSembrados {args.users} usuarios × {args.contacts} contactos en {time.perf_counter() - start:.1f}s")
+
+        output = {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'params': vars(args),
+            'results': {},
+        }
+        drivers = {'testclient': TestClientDriver, 'http': HttpDriver}
+        names = list(drivers) if args.driver == 'both' else [args.driver]
+        for name in names:
+            server, base_url = start_server(app) if name == 'http' else (None, None)
+            try:
+                results, elapsed = run(app, drivers[name], base_url, seeded, args.threads, args.iterations)
+            finally:
+                if server:
+                    server.shutdown()
+            print_results(name, results, elapsed)
+            output['results'][name] = {'elapsed_s': round(elapsed, 3), 'routes': results}
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+            print(f"\nResultados guardados en {args.output}")
+    finally:
+        drop_database(app)
+
+
+if __name__ == '__main__':
+    main()
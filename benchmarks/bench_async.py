@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concurrencia: API de contactos síncrona (gunicorn, gthread)
+frente a la asíncrona (asgi.py sobre hypercorn), ambas con un solo proceso.
+
+Siembra una base de datos SQLite temporal, arranca cada servidor y abre C
+clientes concurrentes con conexión keep-alive que alternan listado paginado
+y lectura de contactos por la API con token Bearer. Con C muy por encima de
+los hilos del worker síncrono, las peticiones de éste esperan en cola
+mientras que el asíncrono las multiplexa en el bucle de eventos.
+
+    python benchmarks/bench_async.py [--concurrency 50,200] [--requests 20] \\
+        [--server-threads 8] [--output resultados.json]
+
+Requiere gunicorn, quart, hypercorn y aiosqlite.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_app import Recorder, git_commit, print_results, seed
+from bench_server import free_port, wait_for_port
+
+
+def server_command(name, port, threads):
+    if name == 'sync':
+        return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                '-b', f'127.0.0.1:{port}', '-w', '1', '--threads', str(threads), 'wsgi:app']
+    return [sys.executable, '-m', 'hypercorn', '-b', f'127.0.0.1:{port}', '-w', '1', 'asgi:app']
+
+
+def mint_tokens(app, seeded):
+    """Tokens de la API para los usuarios sembrados, sin pasar por el login"""
+    from itsdangerous import URLSafeTimedSerializer
+    from controllers.api_controller import TOKEN_SALT
+    from models.database import get_db
+
+    serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt=TOKEN_SALT)
+    tokens = []
+    with app.app_context():
+        cursor = get_db().cursor()
+        for email, contact_ids in seeded:
+            cursor.execute('SELECT id FROM usuarios WHERE email = %s', (email,))
+            tokens.append((serializer.dumps({'uid': cursor.fetchone()[0]}), contact_ids))
+        cursor.close()
+    return tokens
+
+
+class Client:
+    """Cliente HTTP/1.1 mínimo con keep-alive sobre asyncio"""
+
+    def __init__(self, port, token):
+        self.port = port
+        self.token = token
+        self.reader = self.writer = None
+
+    async def get(self, path):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.port)
+        self.writer.write((f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                           f'Authorization: Bearer {self.token}\r\n\r\n').encode('ascii'))
+        await self.writer.drain()
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+        headers = {k.lower(): v for k, v in headers.items()}
+        await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            with contextlib.suppress(OSError):
+                await self.writer.wait_closed()
+            self.reader = self.writer = None
+
+
+async def virtual_client(port, token, contact_ids, recorder, requests, page_size):
+    client = Client(port, token)
+    try:
+        for i in range(requests):
+            if i % 2 == 0:
+                route, path = 'list', f'/api/v1/contacts?limit={page_size}'
+            else:
+                route, path = 'get', f'/api/v1/contacts/{random.choice(contact_ids)}'
+            start = time.perf_counter()
+            try:
+                status = await client.get(path)
+            except (OSError, asyncio.IncompleteReadError):
+                await client.close()
+                status = None
+            recorder.record(route, time.perf_counter() - start, status == 200)
+    finally:
+        await client.close()
+
+
+async def load(port, tokens, concurrency, requests, page_size):
+    recorder = Recorder()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_client(port, *tokens[c % len(tokens)], recorder, requests, page_size)
+        for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return recorder.summary(elapsed), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--contacts', type=int, default=500)
+    parser.add_argument('--concurrency', default='50,200', help='clientes concurrentes (lista separada por comas)')
+    parser.add_argument('--requests', type=int, default=20, help='peticiones por cliente')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--server-threads', type=int, default=8, help='hilos del worker síncrono')
+    parser.add_argument('--pool-size', type=int, default=8, help='conexiones de cada pool')
+    parser.add_argument('--servers', default='sync,async')
+    parser.add_argument('--output', help='archivo JSON con los resultados')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='contactos_async_')
+    os.environ.update({
+        'DB_BACKEND': 'sqlite',
+        'SQLITE_PATH': os.path.join(tmpdir, 'bench.db'),
+        'DB_AUTO_MIGRATE': 'True',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'SECRET_KEY': os.environ.get('SECRET_KEY') or 'bench-async-secret',
+        # Medir el acceso a la base de datos, no la caché
+        'CONTACT_CACHE_BACKEND': 'none',
+        'USER_CACHE_BACKEND': 'none',
+        'DB_POOL_SIZE': str(args.pool_size),
+        'ASYNC_DB_POOL_SIZE': str(args.pool_size),
+    })
+
+    try:
+        from app import create_app
+        with contextlib.redirect_stdout(io.StringIO()):
+            app = create_app()
+        seeded = seed(app, args.users, args.contacts)
+        tokens = mint_tokens(app, seeded)
+        app.extensions['db_pool'].dispose()
+
+        output = {'commit': git_commit(), 'params': vars(args), 'results': {}}
+        for name in args.servers.split(','):
+            port = free_port()
+            process = subprocess.Popen(server_command(name, port, args.server_threads),
+                                       cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_for_port(port, process)
+                for concurrency in (int(c) for c in args.concurrency.split(',')):
+                    results, elapsed = asyncio.run(load(port, tokens, concurrency, args.requests, args.page_size))
+                    label = f'{name} c={concurrency}'
+                    print_results(label, results, elapsed)
+                    output['results'][label] = {'elapsed_s': round(elapsed, 3), 'routes': results}
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+            print(f"\nResultados guardados en {args.output}")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la detección de contactos duplicados (models/dedupe.py).
+
+Genera N contactos de un usuario (100.000 por defecto) con nombres, emails y
+teléfonos realistas e inyecta un porcentaje de duplicados con variaciones
+(acentos, orden del nombre, formato del teléfono, mayúsculas del email).
+Mide el tiempo de ``find_duplicate_groups`` leyendo en streaming de una
+base de datos temporal, los pares comparados frente a los n²/2 de la
+comparación exhaustiva, y la precisión y exhaustividad de los grupos
+respecto a los duplicados inyectados. Por último fusiona un grupo.
+
+    python benchmarks/bench_dedupe.py [--rows 100000] [--duplicates 0.05] \\
+        [--threshold 0.65] [--max-block 50] [--backend sqlite|mysql] [--output resultados.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_app import drop_database, git_commit
+
+FIRST_NAMES = ['José', 'María', 'Juan', 'Lucía', 'Ángel', 'Carmen', 'Javier', 'Sofía', 'Andrés',
+               'Valeria', 'Sebastián', 'Isabel', 'Raúl', 'Elena', 'Héctor', 'Inés', 'Víctor',
+               'Camila', 'Gonzalo', 'Ximena', 'Guillermo', 'Beatriz', 'Joaquín', 'Rocío']
+SURNAMES = ['García', 'Rodríguez', 'González', 'Fernández', 'López', 'Martínez', 'Sánchez',
+            'Pérez', 'Gómez', 'Martín', 'Jiménez', 'Ruiz', 'Hernández', 'Díaz', 'Moreno',
+            'Muñoz', 'Álvarez', 'Romero', 'Alonso', 'Gutiérrez', 'Navarro', 'Torres',
+            'Domínguez', 'Vázquez', 'Ramos', 'Gil', 'Ramírez', 'Serrano', 'Blanco', 'Molina',
+            'Castillo', 'Ortega', 'Delgado', 'Castro', 'Ortiz', 'Rubio', 'Marín', 'Sanz',
+            'Iglesias', 'Núñez', 'Medina', 'Garrido', 'Cortés', 'Castillo', 'Santos', 'Lozano',
+            'Guerrero', 'Cano', 'Prieto', 'Méndez', 'Cruz', 'Calvo', 'Gallego', 'Vidal',
+            'León', 'Herrera', 'Márquez', 'Peña', 'Cabrera', 'Flores', 'Campos', 'Vega']
+_UNACCENT = str.maketrans('áéíóúÁÉÍÓÚ', 'aeiouAEIOU')
+
+
+def generate(rows, duplicate_ratio, rng):
+    """Lista de (nombre, correo, teléfono) y pares (original, duplicado) por posición"""
+    originals = rows - int(rows * duplicate_ratio)
+    data = []
+    for i in range(originals):
+        first, surname, second = rng.choice(FIRST_NAMES), rng.choice(SURNAMES), rng.choice(SURNAMES)
+        nombre = f'{first} {surname} {second}'
+        correo = f'{first[:3]}.{surname}{i}@example.com'.translate(_UNACCENT).lower() if rng.random() < 0.8 else None
+        telefono = f'6{i:08d}' if rng.random() < 0.8 else None
+        data.append((nombre, correo, telefono))
+
+    pairs = []
+    for _ in range(rows - originals):
+        source = rng.randrange(originals)
+        nombre, correo, telefono = data[source]
+        first, surname, second = nombre.split()
+        variant = rng.randrange(4)
+        if variant == 0:
+            nombre = f'{surname}, {first}'.translate(_UNACCENT)
+        elif variant == 1:
+            nombre = f'{first.upper()} {surname}'
+        elif variant == 2:
+            nombre = f'{first} {surname.replace("z", "s")} {second}'
+        if correo and rng.random() < 0.5:
+            correo = correo.upper()
+        if telefono and rng.random() < 0.7:
+            telefono = f'+34 {telefono[:3]}-{telefono[3:5]}-{telefono[5:7]}-{telefono[7:]}'
+        if rng.random() < 0.2:
+            # Falta uno de los dos datos de contacto (solo con el nombre no basta
+            # para superar el umbral)
+            if rng.random() < 0.5:
+                correo = None
+            else:
+                telefono = None
+        pairs.append((source, len(data)))
+        data.append((nombre, correo, telefono))
+    return data, pairs
+
+
+def quality(groups, expected):
+    """Precisión y exhaustividad a nivel de pares"""
+    found = set()
+    for group in groups:
+        for i, a in enumerate(group):
+            for b in group[i + 1:]:
+                found.add((a, b))
+    hits = len(found & expected)
+    return {
+        'pairs_found': len(found),
+        'pairs_expected': len(expected),
+        'precision': round(hits / len(found), 4) if found else 1.0,
+        'recall': round(hits / len(expected), 4) if expected else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--duplicates', type=float, default=0.05, help='fracción de duplicados inyectados')
+    parser.add_argument('--threshold', type=float, default=0.65)
+    parser.add_argument('--max-block', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--backend', choices=('sqlite', 'mysql'), default='sqlite')
+    parser.add_argument('--output', help='archivo JSON con los resultados')
+    args = parser.parse_args()
+
+    os.environ.update({
+        'DB_BACKEND': args.backend,
+        'DB_AUTO_MIGRATE': 'True',
+        'CONTACT_CACHE_BACKEND': 'none',
+    })
+    if args.backend == 'sqlite':
+        os.environ['SQLITE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='contactos_dedupe_'), 'bench.db')
+    else:
+        os.environ['MYSQL_DATABASE'] = f'contactos_bench_dedupe_{os.getpid()}'
+
+    data, pairs = generate(args.rows, args.duplicates, random.Random(args.seed))
+
+    from app import create_app
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    try:
+        with app.app_context():
+            from models.contact import Contact
+            from models.database import get_db
+            from models import dedupe
+            db = get_db()
+            cursor = db.cursor()
+            cursor.execute('INSERT INTO usuarios (nombre, email, password_hash) VALUES (%s, %s, %s)',
+                           ('Dedupe', 'dedupe@example.com', 'x'))
+            user_id = cursor.lastrowid
+            db.commit()
+            for start in range(0, len(data), 1000):
+                Contact.bulk_insert(user_id, [Contact(nombre=n, correo=c, telefono=t)
+                                              for n, c, t in data[start:start + 1000]])
+            cursor.execute('SELECT id FROM contactos WHERE user_id = %s ORDER BY id', (user_id,))
+            ids = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+            expected = {tuple(sorted((ids[a], ids[b]))) for a, b in pairs}
+
+            stats = {}
+            start = time.perf_counter()
+            groups = dedupe.find_duplicate_groups(Contact.iter_by_user(user_id), threshold=args.threshold,
+                                                  max_block=args.max_block, stats=stats)
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            kept = dedupe.merge_contacts(user_id, groups[0][0], groups[0][1:]) if groups else None
+            merge_ms = (time.perf_counter() - start) * 1000
+    finally:
+        drop_database(app)
+
+    n = stats['contacts']
+    results = {
+        'seconds': round(elapsed, 3),
+        'contacts_per_second': round(n / elapsed),
+        'groups': len(groups),
+        'exhaustive_pairs': n * (n - 1) // 2,
+        **stats,
+        **quality(groups, expected),
+        'merge_ms': round(merge_ms, 1),
+        'merged_into': kept.id if kept else None,
+    }
+
+    print(f"\n== {n} contactos, {len(pairs)} duplicados inyectados ({args.backend})")
+    print(f"tiempo:              {results['seconds']:.2f} s ({results['contacts_per_second']} contactos/s)")
+    print(f"bloques:             {stats['blocks']} ({stats['skipped_blocks']} omitidos por tamaño)")
+    print(f"pares comparados:    {stats['compared']} de {results['exhaustive_pairs']} "
+          f"({stats['compared'] / max(results['exhaustive_pairs'], 1):.6%})")
+    print(f"grupos:              {results['groups']}")
+    print(f"precisión:           {results['precision']:.2%}")
+    print(f"exhaustividad:       {results['recall']:.2%}")
+    print(f"fusión de un grupo:  {results['merge_ms']:.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'commit': git_commit(), 'params': vars(args), 'results': results},
+                      f, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la importación masiva de contactos (por defecto 1M filas).
+
+Genera un CSV en un archivo temporal y lo procesa en streaming. Sin opciones
+mide lectura y validación por bloques; con --mysql importa de verdad en la
+base de datos configurada (para un usuario temporal que se borra al final).
+La memoria máxima del proceso debe mantenerse plana con cualquier tamaño.
+
+    python benchmarks/bench_import.py [--rows 1000000] [--chunk 1000] [--mysql]
+"""
+
+import argparse
+import csv
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import contact_io
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_csv(path, rows, seed=42):
+    """Escribir un CSV sintético; ~1% de filas inválidas para medir los errores"""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['nombre', 'correo', 'telefono', 'detalle'])
+        for i in range(rows):
+            nombre = '' if rng.random() < 0.005 else f'Contacto {i}'
+            correo = 'no-es-email' if rng.random() < 0.005 else f'contacto{i}@example.com'
+            writer.writerow([nombre, correo, f'+34 600 {i % 1000:03d} {i % 997:03d}', 'Importado'])
+
+
+def bench_parse(path, chunk_size):
+    valid_rows = errors = 0
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        for chunk in contact_io.iter_chunks(contact_io.iter_records(stream, 'csv'), chunk_size):
+            valid, chunk_errors = contact_io.validate_chunk(1, chunk)
+            valid_rows += len(valid)
+            errors += len(chunk_errors)
+    return valid_rows, errors
+
+
+def bench_mysql(path, chunk_size):
+    from app import create_app
+    from models.database import get_db
+
+    app = create_app()
+    with app.app_context():
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute("INSERT INTO usuarios (nombre, email, password_hash) VALUES (%s, %s, %s)",
+                       ('bench', f'bench-import-{os.getpid()}@example.com', 'x'))
+        user_id = cursor.lastrowid
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as stream:
+                report = contact_io.import_contacts(user_id, stream, 'csv', chunk_size=chunk_size)
+            return report['imported'], report['failed']
+        finally:
+            cursor.execute("DELETE FROM usuarios WHERE id = %s", (user_id,))
+            db.commit()
+            cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk', type=int, default=1000)
+    parser.add_argument('--mysql', action='store_true', help='insertar en la base de datos configurada')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'contactos.csv')
+        start = time.perf_counter()
+        write_csv(path, args.rows)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"CSV generado: {args.rows} filas, {size_mb:.1f} MB en {time.perf_counter() - start:.1f}s")
+
+        rss_before = max_rss_mb()
+        start = time.perf_counter()
+        if args.mysql:
+            ok, failed = bench_mysql(path, args.chunk)
+        else:
+            ok, failed = bench_parse(path, args.chunk)
+        elapsed = time.perf_counter() - start
+
+        print(f"{'importación' if args.mysql else 'lectura+validación'}: {ok} válidas, {failed} con errores")
+        print(f"tiempo={elapsed:.2f}s  filas/s={args.rows / elapsed:,.0f}  "
+              f"RSS máx={max_rss_mb():.1f} MB (antes {rss_before:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria al leer la lista completa de contactos de un usuario.
+
+Compara, sobre una base de datos temporal con N filas (100.000 por defecto):
+
+- dict: cursor con ``dictionary=True`` y un objeto con ``__dict__`` por fila
+  (la representación anterior)
+- slots: cursor de tuplas y una lista de Contact con ``__slots__``
+- lazy: cursor de tuplas y ContactRows, que crea cada Contact al recorrerla
+
+Para cada variante mide con tracemalloc la memoria retenida tras cargar y el
+pico al recorrer la lista leyendo todos los campos (lo que hace la plantilla).
+
+    python benchmarks/bench_memory.py [--rows 100000] [--backend sqlite|mysql] \\
+        [--output resultados.json]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_app import drop_database, git_commit, seed
+
+
+class DictContact:
+    """Contacto como era antes: atributos en un __dict__ por instancia"""
+
+    def __init__(self, id=None, user_id=None, nombre=None, correo=None, telefono=None, detalle=None,
+                 fecha_creacion=None, version=None, fecha_actualizacion=None):
+        self.id = id
+        self.user_id = user_id
+        self.nombre = nombre
+        self.correo = correo
+        self.telefono = telefono
+        self.detalle = detalle
+        self.fecha_creacion = fecha_creacion
+        self.version = version
+        self.fecha_actualizacion = fecha_actualizacion
+
+
+def fetch(user_id, dictionary):
+    from models.contact import Contact
+    from models.database import get_db
+    cursor = get_db().cursor(dictionary=dictionary)
+    cursor.execute(f'{Contact._SELECT} WHERE user_id = %s ORDER BY nombre', (user_id,))
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def load_dict(user_id):
+    return [DictContact(**data) for data in fetch(user_id, True)]
+
+
+def load_slots(user_id):
+    from models.contact import Contact
+    return [Contact(*row) for row in fetch(user_id, False)]
+
+
+def load_lazy(user_id):
+    from models.contact import ContactRows
+    return ContactRows(fetch(user_id, False))
+
+
+def render(contacts):
+    """Recorrer la lista leyendo los campos que muestra list.html"""
+    total = 0
+    for contact in contacts:
+        total += len(contact.nombre) + len(contact.correo or '') + len(contact.telefono or '')
+        total += contact.id + contact.fecha_creacion.day
+    return total
+
+
+def measure(loader, user_id):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    contacts = loader(user_id)
+    load_s = time.perf_counter() - start
+    retained, load_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    render(contacts)
+    render_s = time.perf_counter() - start
+    _, render_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del contacts
+    return {
+        'retained_mb': round(retained / 2**20, 2),
+        'load_peak_mb': round(load_peak / 2**20, 2),
+        'render_peak_mb': round(render_peak / 2**20, 2),
+        'load_ms': round(load_s * 1000, 1),
+        'render_ms': round(render_s * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--backend', choices=('sqlite', 'mysql'), default='sqlite')
+    parser.add_argument('--output', help='archivo JSON con los resultados')
+    args = parser.parse_args()
+
+    os.environ.update({
+        'DB_BACKEND': args.backend,
+        'DB_AUTO_MIGRATE': 'True',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'CONTACT_CACHE_BACKEND': 'none',
+    })
+    if args.backend == 'sqlite':
+        os.environ['SQLITE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='contactos_mem_'), 'bench.db')
+    else:
+        os.environ['MYSQL_DATABASE'] = f'contactos_bench_mem_{os.getpid()}'
+
+    from app import create_app
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    try:
+        seed(app, 1, args.rows)
+        results = {}
+        with app.app_context():
+            from models.database import get_db
+            cursor = get_db().cursor()
+            cursor.execute('SELECT id FROM usuarios')
+            (user_id,) = cursor.fetchone()
+            cursor.close()
+            for name, loader in (('dict', load_dict), ('slots', load_slots), ('lazy', load_lazy)):
+                results[name] = measure(loader, user_id)
+    finally:
+        drop_database(app)
+
+    print(f"\n== {args.rows} filas ({args.backend})")
+    print(f"{'variante':<8} {'retenida MB':>12} {'pico carga':>11} {'pico recorrido':>15} "
+          f"{'carga ms':>9} {'recorr. ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<8} {r['retained_mb']:>12.2f} {r['load_peak_mb']:>11.2f} {r['render_peak_mb']:>15.2f} "
+              f"{r['load_ms']:>9.1f} {r['render_ms']:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'commit': git_commit(), 'params': vars(args), 'results': results},
+                      f, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark del aprovisionamiento de usuarios: registro uno a uno frente a
+User.bulk_create (hashes en paralelo en el pool de hashing e inserciones
+con executemany por bloques).
+
+Usa una base de datos temporal (SQLite por defecto). Cuenta también las
+sentencias SQL de cada variante (idas y vueltas a la base de datos).
+
+    python benchmarks/bench_provision.py [--users 1000] [--chunk 500] \\
+        [--hash-method pbkdf2:sha256:50000] [--workers 4] [--backend sqlite|mysql]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_app import PASSWORD, drop_database
+
+
+def records(prefix, users):
+    return [{'nombre': f'Usuario {i}', 'email': f'{prefix}{i}@example.com', 'password': PASSWORD}
+            for i in range(users)]
+
+
+def bench_sequential(app, users):
+    from flask import g
+    from models.user import User
+    # Contexto de petición para que las métricas cuenten las sentencias SQL
+    with app.test_request_context():
+        for record in records('uno', users):
+            user, error = User.create(record['nombre'], record['email'], record['password'])
+            if error:
+                raise RuntimeError(error)
+        # Un duplicado: debe resolverse con el índice único, sin SELECT previo
+        _, error = User.create('Repetido', 'uno0@example.com', PASSWORD)
+        assert error == "El email ya está registrado"
+        return users, g.get('_sql_queries', 0)
+
+
+def bench_bulk(app, users, chunk):
+    from flask import g
+    from models.user import User
+    with app.test_request_context():
+        report = User.bulk_create(records('lote', users), chunk_size=chunk)
+        return report['created'], g.get('_sql_queries', 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--chunk', type=int, default=500)
+    parser.add_argument('--hash-method', default='pbkdf2:sha256:50000')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='procesos de hashing')
+    parser.add_argument('--backend', choices=('sqlite', 'mysql'), default='sqlite')
+    args = parser.parse_args()
+
+    os.environ.update({
+        'DB_BACKEND': args.backend,
+        'DB_AUTO_MIGRATE': 'True',
+        'PASSWORD_HASH_METHOD': args.hash_method,
+        'HASH_WORKERS': str(args.workers),
+        'METRICS_ENABLED': 'True',
+    })
+    if args.backend == 'sqlite':
+        os.environ['SQLITE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='contactos_prov_'), 'bench.db')
+    else:
+        os.environ['MYSQL_DATABASE'] = f'contactos_bench_prov_{os.getpid()}'
+
+    from app import create_app
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app()
+    try:
+        results = []
+        for name, call in (('uno a uno', lambda: bench_sequential(app, args.users)),
+                           ('en bloque', lambda: bench_bulk(app, args.users, args.chunk))):
+            start = time.perf_counter()
+            created, statements = call()
+            results.append((name, created, time.perf_counter() - start, statements))
+    finally:
+        with app.app_context():
+            from models.hashing import get_hasher
+            get_hasher().shutdown()
+        drop_database(app)
+
+    print(f"\n== {args.users} usuarios ({args.backend}, {args.hash_method}, {args.workers} procesos de hashing)")
+    print(f"{'variante':<10} {'creados':>8} {'segundos':>9} {'usuarios/s':>11} {'sentencias SQL':>15}")
+    for name, created, elapsed, statements in results:
+        print(f"{name:<10} {created:>8} {elapsed:>9.2f} {created / elapsed:>11.1f} {statements:>15}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la búsqueda de contactos con 100k contactos por usuario.
+
+Mide la construcción y las consultas del índice de trigramas en memoria y,
+con --mysql, las consultas FULLTEXT contra la base de datos configurada
+(se crea un usuario de prueba que se elimina al terminar).
+
+    python benchmarks/bench_search.py [--contacts 100000] [--queries 200] [--mysql]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.search import TrigramIndex
+
+NOMBRES = ['Ana', 'Luis', 'María', 'José', 'Carmen', 'Javier', 'Lucía', 'Pedro',
+           'Sofía', 'Diego', 'Elena', 'Pablo', 'Marta', 'Jorge', 'Laura', 'Andrés']
+APELLIDOS = ['García', 'Martínez', 'López', 'Sánchez', 'Pérez', 'Gómez', 'Ruiz',
+             'Hernández', 'Díaz', 'Moreno', 'Álvarez', 'Romero', 'Navarro', 'Torres']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'empresa.es', 'correo.org']
+
+
+def generate_contacts(n, seed=42):
+    """Generar contactos sintéticos (id, nombre, correo, telefono)"""
+    rng = random.Random(seed)
+    for i in range(1, n + 1):
+        nombre = f'{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}'
+        correo = f'{nombre.split()[0].lower()}.{i}@{rng.choice(DOMINIOS)}'
+        telefono = f'+34 6{rng.randint(10, 99)} {rng.randint(100, 999)} {rng.randint(100, 999)}'
+        yield i, nombre, correo, telefono
+
+
+def make_queries(contacts, n, seed=7):
+    """Consultas realistas: prefijos de nombre, apellidos completos y correos"""
+    rng = random.Random(seed)
+    sample = rng.sample(contacts, n)
+    queries = []
+    for i, (_, nombre, correo, telefono) in enumerate(sample):
+        kind = i % 3
+        if kind == 0:
+            queries.append(nombre.split()[0][:3])
+        elif kind == 1:
+            queries.append(' '.join(nombre.split()[1:]))
+        else:
+            queries.append(correo.split('@')[0])
+    return queries
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p = lambda q: timings[min(len(timings) - 1, int(q * len(timings)))] * 1000
+    print(f"{name:<22} n={len(timings):<5} media={statistics.mean(timings) * 1000:8.3f}ms "
+          f"p50={p(0.50):8.3f}ms p95={p(0.95):8.3f}ms p99={p(0.99):8.3f}ms")
+
+
+def bench_trigram(contacts, queries):
+    start = time.perf_counter()
+    index = TrigramIndex()
+    for doc_id, *fields in contacts:
+        index.add(doc_id, *fields)
+    print(f"Índice de trigramas: {len(index)} contactos en {time.perf_counter() - start:.2f}s")
+
+    timings = []
+    for query in queries:
+        t0 = time.perf_counter()
+        index.search(query, limit=20)
+        timings.append(time.perf_counter() - t0)
+    report('trigram', timings)
+
+
+def bench_mysql(contacts, queries):
+    from app import create_app
+    from models.database import get_db
+    from models.contact import Contact
+
+    app = create_app()
+    with app.app_context():
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute("INSERT INTO usuarios (nombre, email, password_hash) VALUES (%s, %s, %s)",
+                       ('bench', f'bench-search-{os.getpid()}@example.com', 'x'))
+        user_id = cursor.lastrowid
+        try:
+            start = time.perf_counter()
+            batch = []
+            for _, nombre, correo, telefono in contacts:
+                batch.append((user_id, nombre, correo, telefono))
+                if len(batch) == 5000:
+                    cursor.executemany("INSERT INTO contactos (user_id, nombre, correo, telefono) "
+                                       "VALUES (%s, %s, %s, %s)", batch)
+                    batch = []
+            if batch:
+                cursor.executemany("INSERT INTO contactos (user_id, nombre, correo, telefono) "
+                                   "VALUES (%s, %s, %s, %s)", batch)
+            db.commit()
+            print(f"MySQL: {len(contacts)} contactos insertados en {time.perf_counter() - start:.2f}s")
+
+            timings = []
+            for query in queries:
+                t0 = time.perf_counter()
+                Contact.search(user_id, query, limit=20)
+                timings.append(time.perf_counter() - t0)
+            report('mysql fulltext', timings)
+        finally:
+            cursor.execute("DELETE FROM usuarios WHERE id = %s", (user_id,))
+            db.commit()
+            cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--contacts', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--mysql', action='store_true', help='medir también FULLTEXT en MySQL')
+    args = parser.parse_args()
+
+    contacts = list(generate_contacts(args.contacts))
+    queries = make_queries(contacts, args.queries)
+
+    bench_trigram(contacts, queries)
+    if args.mysql:
+        bench_mysql(contacts, queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark del servidor de desarrollo de Flask frente a gunicorn.
+
+Siembra una base de datos SQLite temporal, arranca cada servidor en un
+proceso aparte (``app.run(threaded=True)`` y ``gunicorn -c gunicorn.conf.py
+wsgi:app``) y lanza contra ambos el mismo escenario HTTP de bench_app.py.
+
+    python benchmarks/bench_server.py [--threads 16] [--iterations 20] \\
+        [--workers 4] [--output resultados.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_app import HttpDriver, git_commit, print_results, run, seed
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El servidor terminó al arrancar (código {process.returncode})")
+        with contextlib.suppress(OSError), socket.create_connection(('127.0.0.1', port), timeout=0.5):
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f"El servidor no respondió en el puerto {port}")
+
+
+def server_command(name, port, workers, threads):
+    if name == 'flask':
+        code = f"from wsgi import app; app.run(host='127.0.0.1', port={port}, threaded=True)"
+        return [sys.executable, '-c', code]
+    return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+            '-b', f'127.0.0.1:{port}', '-w', str(workers), '--threads', str(threads), 'wsgi:app']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--contacts', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=16, help='hilos del cliente de carga')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='workers de gunicorn')
+    parser.add_argument('--server-threads', type=int, default=4, help='hilos por worker de gunicorn')
+    parser.add_argument('--servers', default='flask,gunicorn')
+    parser.add_argument('--output', help='archivo JSON con los resultados')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='contactos_server_')
+    os.environ.update({
+        'DB_BACKEND': 'sqlite',
+        'SQLITE_PATH': os.path.join(tmpdir, 'bench.db'),
+        'DB_AUTO_MIGRATE': 'True',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        # Estado compartido entre procesos: las cachés en memoria serían locales a cada worker
+        'CONTACT_CACHE_BACKEND': 'none',
+        'USER_CACHE_BACKEND': 'none',
+        'SESSION_BACKEND': 'cookie',
+    })
+
+    try:
+        from app import create_app
+        with contextlib.redirect_stdout(io.StringIO()):
+            app = create_app()
+        seeded = seed(app, args.users, args.contacts)
+        app.extensions['db_pool'].dispose()
+
+        output = {'commit': git_commit(), 'params': vars(args), 'results': {}}
+        for name in args.servers.split(','):
+            port = free_port()
+            process = subprocess.Popen(server_command(name, port, args.workers, args.server_threads),
+                                       cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_for_port(port, process)
+                results, elapsed = run(None, HttpDriver, f'http://127.0.0.1:{port}', seeded,
+                                       args.threads, args.iterations)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            print_results(name, results, elapsed)
+            output['results'][name] = {'elapsed_s': round(elapsed, 3), 'routes': results}
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+            print(f"\nResultados guardados en {args.output}")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark del coste de la sesión por petición según SESSION_BACKEND.
+
+Cada backend atiende una ruta mínima que solo lee la sesión (como las
+páginas de contactos), tras un login que la escribe una vez. Se compara con
+una ruta sin sesión para aislar el coste del almacenamiento.
+
+    python benchmarks/bench_session.py [--requests 5000] [--mysql]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, session
+from models.session_store import init_session
+
+
+def make_app(backend, tmpdir, extra_config=None):
+    app = Flask(__name__)
+    app.config.update(
+        SECRET_KEY='bench',
+        SESSION_BACKEND=backend,
+        SESSION_TYPE='filesystem',
+        SESSION_FILE_DIR=os.path.join(tmpdir, backend),
+        SESSION_PERMANENT=False,
+        PERMANENT_SESSION_LIFETIME=3600,
+    )
+    app.config.update(extra_config or {})
+    init_session(app)
+
+    @app.route('/login')
+    def login():
+        session['user_id'] = 1
+        session['user_name'] = 'Usuario de prueba'
+        return 'ok'
+
+    @app.route('/page')
+    def page():
+        return str(session.get('user_id'))
+
+    @app.route('/nosession')
+    def nosession():
+        return 'ok'
+
+    return app
+
+
+def measure(client, path, n):
+    timings = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        client.get(path)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--mysql', action='store_true', help="incluir el backend 'sql' (base de datos configurada)")
+    args = parser.parse_args()
+
+    backends = ['cookie', 'memory', 'filesystem']
+    if args.mysql:
+        backends.append('sql')
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for backend in backends:
+            extra = None
+            if backend == 'sql':
+                from config import Config
+                extra = {k: getattr(Config, k) for k in dir(Config) if k.startswith('MYSQL_')}
+            try:
+                app = make_app(backend, tmpdir, extra)
+            except ImportError as e:
+                print(f"{backend:<11} omitido ({e})")
+                continue
+            if backend == 'sql':
+                from models.database import close_db
+                app.teardown_appcontext(close_db)
+
+            client = app.test_client()
+            baseline = measure(client, '/nosession', args.requests)
+            client.get('/login')
+            with_session = measure(client, '/page', args.requests)
+            print(f"{backend:<11} mediana={with_session:8.1f}µs/petición  "
+                  f"coste de sesión={with_session - baseline:8.1f}µs")
+
+
+if __name__ == '__main__':
+    main()
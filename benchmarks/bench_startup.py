@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark del tiempo de arranque de la aplicación.
+
+Mide create_app() en procesos nuevos (lo que paga cada worker de gunicorn
+en un reinicio, incluida la importación de módulos) y dentro del mismo
+proceso. Con --ddl repite además el DDL del esquema inicial en cada arranque,
+como hacía init_db antes de las migraciones, para comparar.
+
+    python benchmarks/bench_startup.py [--runs 20] [--backend sqlite|mysql] [--ddl]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHILD = '''
+import time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+print("STARTUP", time.perf_counter() - start, app.config["STARTUP_TIME"])
+'''
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+    print(f"{name:<32} mediana {statistics.median(timings) * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms")
+
+
+def bench_processes(runs):
+    """Arranque en frío: importación + create_app en un intérprete nuevo"""
+    total, factory = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=os.environ,
+                                capture_output=True, text=True, check=True).stdout
+        total.append(time.perf_counter() - start)
+        line = next(l for l in output.splitlines() if l.startswith('STARTUP'))
+        factory.append(float(line.split()[2]))
+    report('proceso nuevo (total)', total)
+    report('proceso nuevo (create_app)', factory)
+
+
+def bench_in_process(runs, ddl):
+    from app import create_app
+    from models.database import get_backend
+    from models.schema import MIGRATIONS_DIR, discover_migrations, _load_migration
+
+    version, name, path = discover_migrations(MIGRATIONS_DIR)[0]
+    initial = _load_migration(version, name, path)
+
+    timings, ddl_timings = [], []
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            app = create_app()
+            timings.append(time.perf_counter() - start)
+            if ddl:
+                # Lo que se hacía antes en cada arranque: crear base de datos y tablas
+                backend = get_backend(app)
+                start = time.perf_counter()
+                backend.create_database()
+                conn = backend.connect()
+                cursor = conn.cursor()
+                initial.upgrade(cursor, backend)
+                cursor.close()
+                conn.close()
+                ddl_timings.append(timings[-1] + time.perf_counter() - start)
+    report('create_app (comprobar versión)', timings)
+    if ddl:
+        report('create_app + DDL (anterior)', ddl_timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--ddl', action='store_true', help='comparar con el DDL en cada arranque')
+    args = parser.parse_args()
+
+    tmpdir = None
+    os.environ['DB_BACKEND'] = args.backend
+    if args.backend == 'sqlite':
+        tmpdir = tempfile.mkdtemp(prefix='contactos_startup_')
+        os.environ['SQLITE_PATH'] = os.path.join(tmpdir, 'startup.db')
+    logging.disable(logging.INFO)
+
+    try:
+        from app import create_app
+        from models.schema import upgrade
+        # Crear el esquema una vez, fuera de la medición (antes avisa de que falta)
+        logging.disable(logging.ERROR)
+        with contextlib.redirect_stdout(io.StringIO()):
+            upgrade(create_app())
+        logging.disable(logging.INFO)
+
+        bench_processes(args.runs)
+        bench_in_process(args.runs, args.ddl)
+    finally:
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Comandos de línea de órdenes de la aplicación (``flask --app app <comando>``)
+"""
+
+import click
+from flask import current_app
+
+
+def register_commands(app):
+    """Registrar los comandos CLI en la aplicación"""
+    app.cli.add_command(contacts_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(assets_cli)
+
+
+@click.group('db')
+def db_cli():
+    """Migraciones del esquema de la base de datos"""
+
+
+@db_cli.command('upgrade')
+@click.option('--hasta', type=int, default=None, help='Aplicar solo hasta esta versión')
+def upgrade_command(hasta):
+    """Aplicar las migraciones pendientes"""
+    from models.schema import upgrade
+
+    applied = upgrade(current_app._get_current_object(), target=hasta)
+    if applied:
+        click.echo(f"✅ Migraciones aplicadas: {', '.join(f'{v:04d}' for v in applied)}")
+    else:
+        click.echo("✅ El esquema ya está al día")
+
+
+@db_cli.command('version')
+def version_command():
+    """Mostrar las migraciones aplicadas y pendientes"""
+    from models.database import get_backend
+    from models.schema import discover_migrations, applied_migrations
+
+    backend = get_backend()
+    conn = backend.connect()
+    cursor = conn.cursor()
+    try:
+        applied = {version: when for version, _, when in applied_migrations(cursor, backend)}
+    finally:
+        cursor.close()
+        conn.close()
+
+    for version, name, _ in discover_migrations():
+        state = f"aplicada {applied[version]}" if version in applied else "pendiente"
+        click.echo(f"{version:04d}_{name}: {state}")
+
+
+@click.group('assets')
+def assets_cli():
+    """Recursos estáticos"""
+
+
+def _kib(size):
+    return f"{size / 1024:.1f}" if size is not None else '-'
+
+
+@assets_cli.command('build')
+def build_assets_command():
+    """Generar static/dist: nombres con hash, .gz/.br y manifest.json"""
+    from models.assets import build_assets, get_dist_dir
+
+    app = current_app._get_current_object()
+    report = build_assets(app.static_folder, get_dist_dir(app))
+
+    click.echo(f"{'archivo':<28} {'KiB':>8} {'gzip':>8} {'br':>8} {'ahorro':>7}")
+    total = best_total = 0
+    for entry in report:
+        best = min(size for size in (entry['size'], entry['gzip'], entry['br']) if size is not None)
+        total += entry['size']
+        best_total += best
+        click.echo(f"{entry['file']:<28} {_kib(entry['size']):>8} {_kib(entry['gzip']):>8} "
+                   f"{_kib(entry['br']):>8} {1 - best / entry['size'] if entry['size'] else 0:>7.0%}")
+    click.echo(f"✅ {len(report)} recursos en {get_dist_dir(app)}: {_kib(total)} KiB -> "
+               f"{_kib(best_total)} KiB con la mejor compresión")
+
+
+@click.group('usuarios')
+def users_cli():
+    """Gestión de usuarios"""
+
+
+@users_cli.command('aprovisionar')
+@click.argument('archivo', type=click.Path(exists=True, dir_okay=False))
+@click.option('--lote', type=int, default=1000, help='Usuarios por transacción')
+def provision_command(archivo, lote):
+    """Crear los usuarios de ARCHIVO (CSV con columnas nombre, email, password)"""
+    import csv
+    from models.user import User
+    from models.hashing import get_hasher
+
+    with open(archivo, encoding='utf-8-sig', newline='') as stream:
+        report = User.bulk_create(csv.DictReader(stream), chunk_size=lote)
+    get_hasher().shutdown()
+
+    for index, messages in report['errors']:
+        # +2: cabecera y numeración desde 1
+        click.echo(f"Línea {index + 2}: {', '.join(messages)}", err=True)
+    click.echo(f"✅ {report['created']} de {report['total']} usuarios creados "
+               f"({report['failed']} con errores)")
+
+
+@click.group('contactos')
+def contacts_cli():
+    """Gestión de contactos"""
+
+
+@contacts_cli.command('importar')
+@click.argument('email')
+@click.argument('archivo', type=click.Path(exists=True, dir_okay=False))
+@click.option('--formato', type=click.Choice(['csv', 'vcf']), default=None,
+              help='Formato del archivo (por defecto según la extensión)')
+@click.option('--lote', type=int, default=None, help='Filas por transacción')
+def import_command(email, archivo, formato, lote):
+    """Importar contactos de ARCHIVO para el usuario EMAIL"""
+    from models.user import User
+    from models.contact_io import import_contacts
+
+    user = User.get_by_email(email)
+    if not user:
+        raise click.ClickException(f"No existe el usuario {email}")
+
+    formato = formato or ('vcf' if archivo.lower().endswith(('.vcf', '.vcard')) else 'csv')
+    lote = lote or current_app.config.get('IMPORT_CHUNK_SIZE', 1000)
+
+    with open(archivo, encoding='utf-8-sig', newline='') as stream:
+        report = import_contacts(user.id, stream, formato, chunk_size=lote)
+
+    for line, messages in report['errors']:
+        click.echo(f"Línea {line if line else '-'}: {', '.join(messages)}", err=True)
+    click.echo(f"✅ {report['imported']} de {report['total']} contactos importados "
+               f"({report['failed']} con errores)")
+
+
+@contacts_cli.command('normalizar')
+@click.option('--lote', type=int, default=1000, help='Filas por transacción')
+def normalize_command(lote):
+    """Rellenar (o recalcular) telefono_norm y correo_norm de los contactos existentes.
+
+    Volver a ejecutarlo tras cambiar la normalización o PHONE_COUNTRY_CODE:
+    solo se reescriben las filas cuyo valor cambia.
+    """
+    from models.contact import Contact
+
+    scanned = updated = 0
+    for rows, changed in Contact.backfill_normalized(batch_size=lote):
+        scanned += rows
+        updated += changed
+        click.echo(f"  {scanned} filas revisadas, {updated} actualizadas", err=True)
+    click.echo(f"✅ {updated} de {scanned} contactos normalizados")
@@ -7,7 +7,14 @@ class Config:
     _secret_key = os.environ.get('SECRET_KEY') or 'dev-secret-key-flask-2024-string-not-bytes'
     SECRET_KEY = str(_secret_key) if _secret_key else 'dev-secret-key-flask-2024-string-not-bytes'
     
-    # Configuración de Flask-Session
+    # Almacenamiento de sesiones:
+    # 'cookie' (firmada, sin estado), 'memory' (LRU en el proceso),
+    # 'sql' (tabla sesiones, varios nodos) o 'filesystem' (Flask-Session)
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cookie')
+    SESSION_MAX_ENTRIES = int(os.environ.get('SESSION_MAX_ENTRIES', 10000))  # Solo 'memory'
+    SESSION_SWEEP_INTERVAL = int(os.environ.get('SESSION_SWEEP_INTERVAL', 60))  # Barrido de caducadas (segundos)
+    
+    # Configuración de Flask-Session (solo SESSION_BACKEND = 'filesystem')
     SESSION_TYPE = 'filesystem'
     SESSION_PERMANENT = False
     SESSION_USE_SIGNER = False  # Deshabilitado temporalmente para evitar error de bytes
@@ -18,6 +25,19 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
     
+    # Motor de base de datos: 'mysql' (servidor) o 'sqlite' (archivo local, un solo nodo)
+    DB_BACKEND = os.environ.get('DB_BACKEND', 'mysql')
+    # Aplicar las migraciones pendientes al arrancar (solo desarrollo; en
+    # producción se ejecuta 'flask --app app db upgrade' antes de desplegar)
+    DB_AUTO_MIGRATE = os.environ.get('DB_AUTO_MIGRATE', 'False').lower() == 'true'
+    
+    # Configuración de SQLite (solo DB_BACKEND = 'sqlite')
+    SQLITE_PATH = os.environ.get('SQLITE_PATH', 'contactos.db')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # NORMAL es seguro con WAL
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', 20000))  # KiB de caché de páginas por conexión
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # Bytes
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # Milisegundos esperando el bloqueo
+    
     # Configuración de MySQL
     MYSQL_HOST = os.environ.get('MYSQL_HOST', 'localhost')
     MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
@@ -25,5 +45,109 @@ class Config:
     MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE', 'contacts_db')
     MYSQL_PORT = int(os.environ.get('MYSQL_PORT', 3306))
     
+    # Pool de conexiones
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))  # Conexiones que se mantienen abiertas
+    DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW', 10))  # Conexiones extra temporales
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))  # Segundos de espera por una conexión
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 3600))  # Reciclar conexiones más antiguas (segundos)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    
+    # Réplicas de lectura, separadas por comas ('host[:puerto]' en MySQL, archivo en
+    # SQLite); vacío = todo va al primario. Mismo usuario, base de datos y tamaño de pool
+    DB_REPLICAS = os.environ.get('DB_REPLICAS', '')
+    DB_REPLICA_RETRY_AFTER = int(os.environ.get('DB_REPLICA_RETRY_AFTER', 30))  # Segundos apartada tras un fallo
+    # Segundos de espera por una conexión de una réplica ocupada antes de probar la
+    # siguiente o el primario (0 = no esperar; una réplica ocupada no se aparta)
+    DB_REPLICA_ACQUIRE_TIMEOUT = float(os.environ.get('DB_REPLICA_ACQUIRE_TIMEOUT', 0))
+    # Segundos que un usuario (sesión o token de la API) lee del primario después de
+    # escribir (mayor que el retraso de las réplicas)
+    DB_READ_YOUR_WRITES_WINDOW = float(os.environ.get('DB_READ_YOUR_WRITES_WINDOW', 5))
+    
+    # Importación masiva: filas por transacción
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    # Exportación: filas leídas del servidor por cada fetchmany
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    
+    # Caché de lecturas de contactos: 'memory', 'redis' o 'none'. 'memory' es de cada
+    # proceso: con varios workers gunicorn.conf.py usa 'redis' por defecto y no arranca con 'memory'
+    CONTACT_CACHE_BACKEND = os.environ.get('CONTACT_CACHE_BACKEND', 'memory')
+    CONTACT_CACHE_TTL = int(os.environ.get('CONTACT_CACHE_TTL', 300))  # Segundos
+    # Segundos que dura cada versión de los contactos con 'memory' (0 = sin límite): lo
+    # que tarda en verse una escritura de otro proceso (comandos CLI, otra instancia)
+    CONTACT_CACHE_VERSION_TTL = int(os.environ.get('CONTACT_CACHE_VERSION_TTL', 30))
+    CONTACT_CACHE_MAX_ENTRIES = int(os.environ.get('CONTACT_CACHE_MAX_ENTRIES', 10000))
+    CONTACT_CACHE_MAX_BYTES = int(os.environ.get('CONTACT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    
+    # Caché del usuario autenticado: 'memory', 'redis' o 'none'
+    USER_CACHE_BACKEND = os.environ.get('USER_CACHE_BACKEND', 'memory')
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))  # Segundos
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 1000))
+    USER_CACHE_MAX_BYTES = int(os.environ.get('USER_CACHE_MAX_BYTES', 4 * 1024 * 1024))
+    
+    # Caché de fragmentos HTML (tabla de contactos renderizada): 'memory', 'redis' o 'none'.
+    # Se invalida con la versión de la caché de contactos, así que requiere que esté activa
+    FRAGMENT_CACHE_BACKEND = os.environ.get('FRAGMENT_CACHE_BACKEND', 'memory')
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 600))  # Segundos
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 2000))
+    FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    
+    # Contraseñas: método/coste de Werkzeug y pool de procesos para calcularlos
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    HASH_WORKERS = int(os.environ.get('HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2)))  # 0 = en el hilo
+    HASH_MAX_PENDING = int(os.environ.get('HASH_MAX_PENDING', 64))  # Operaciones en cola antes de rechazar
+    HASH_TIMEOUT = float(os.environ.get('HASH_TIMEOUT', 10))  # Segundos
+    
+    # Límite de intentos de login por ventana
+    LOGIN_THROTTLE_WINDOW = int(os.environ.get('LOGIN_THROTTLE_WINDOW', 300))  # Segundos
+    LOGIN_MAX_ATTEMPTS_PER_IP = int(os.environ.get('LOGIN_MAX_ATTEMPTS_PER_IP', 20))
+    LOGIN_MAX_ATTEMPTS_PER_EMAIL = int(os.environ.get('LOGIN_MAX_ATTEMPTS_PER_EMAIL', 5))
+    
+    # API REST
+    API_TOKEN_MAX_AGE = int(os.environ.get('API_TOKEN_MAX_AGE', 86400))  # Validez de los tokens (segundos)
+    API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 200))
+    API_MAX_BULK_SIZE = int(os.environ.get('API_MAX_BULK_SIZE', 1000))
+    # Aprovisionamiento de usuarios en bloque (POST /api/v1/users/bulk); vacío = desactivado
+    PROVISIONING_TOKEN = os.environ.get('PROVISIONING_TOKEN', '')
+    # Usuarios por petición: cada uno es un hash (~0,15 s con scrypt por proceso de hashing)
+    # y la petición debe acabar antes del timeout de gunicorn (30 s). Para más, use
+    # 'flask --app app usuarios aprovisionar'
+    PROVISIONING_MAX_USERS = int(os.environ.get('PROVISIONING_MAX_USERS', 100))
+    # Conexiones del pool asíncrono de asgi.py (aiomysql/aiosqlite), por proceso
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE', 20))
+    
+    # Métricas de rendimiento
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    SLOW_QUERY_THRESHOLD = float(os.environ.get('SLOW_QUERY_THRESHOLD', 0.2))  # Segundos
+    
+    # Recursos estáticos ('flask assets build'): subdirectorio de static/ y caché de los que llevan hash
+    ASSETS_DIST_DIR = os.environ.get('ASSETS_DIST_DIR', 'dist')
+    ASSETS_MAX_AGE = int(os.environ.get('ASSETS_MAX_AGE', 365 * 24 * 3600))  # Segundos
+    # Compresión gzip/br al vuelo de las respuestas de texto desde COMPRESS_MIN_SIZE bytes
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))  # Nivel de gzip (1-9)
+    
     # Configuración de la aplicación
+    CONTACTS_PER_PAGE = int(os.environ.get('CONTACTS_PER_PAGE', 50))
+    
+    # Búsqueda: 'fulltext' (índice FULLTEXT de MySQL) o 'trigram' (índice en memoria)
+    CONTACT_SEARCH_BACKEND = os.environ.get('CONTACT_SEARCH_BACKEND', 'fulltext')
+    SEARCH_RESULTS_PER_PAGE = int(os.environ.get('SEARCH_RESULTS_PER_PAGE', 20))
+    SEARCH_INDEX_MAX_USERS = int(os.environ.get('SEARCH_INDEX_MAX_USERS', 100))  # Índices en memoria
+    
+    # Detección de duplicados: puntuación mínima de un par y tamaño máximo de bloque comparado
+    DEDUPE_THRESHOLD = float(os.environ.get('DEDUPE_THRESHOLD', 0.65))
+    DEDUPE_MAX_BLOCK = int(os.environ.get('DEDUPE_MAX_BLOCK', 50))
+    DEDUPE_GROUPS_PER_PAGE = int(os.environ.get('DEDUPE_GROUPS_PER_PAGE', 20))
+    
+    # Búsqueda inversa por teléfono/email: valores como máximo por petición
+    LOOKUP_MAX_VALUES = int(os.environ.get('LOOKUP_MAX_VALUES', 1000))
+    # Prefijo del país por defecto al normalizar teléfonos (sin '+'). Tras cambiarlo,
+    # recalcular los guardados con 'flask --app app contactos normalizar'
+    PHONE_COUNTRY_CODE = os.environ.get('PHONE_COUNTRY_CODE', '34')
+    
+    # Acciones en lote sobre contactos: ids como máximo por petición e ids por sentencia
+    BATCH_MAX_CONTACTS = int(os.environ.get('BATCH_MAX_CONTACTS', 10000))
+    BATCH_CHUNK_SIZE = int(os.environ.get('BATCH_CHUNK_SIZE', 500))
     DEBUG = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
\ No newline at end of file
@@ -1,5 +1,6 @@
 # Este archivo hace que el directorio controllers sea un paquete Python
 from .auth_controller import bp as auth_bp
 from .contact_controller import bp as contact_bp
+from .api_controller import bp as api_bp
 
-__all__ = ['auth_bp', 'contact_bp']
\ No newline at end of file
+__all__ = ['auth_bp', 'contact_bp', 'api_bp']
\ No newline at end of file
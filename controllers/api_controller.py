@@ -0,0 +1,282 @@
+from flask import Blueprint, request, jsonify, current_app, g, url_for
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from werkzeug.wrappers import Response
+from models.contact import Contact, ContactConflictError
+from models.user import User
+from models.cache import current_contacts_version
+from models.hashing import HasherBusyError
+from models.rate_limit import login_allowed, record_login
+from functools import wraps
+import hashlib
+import hmac
+import json
+
+bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+CONTACT_FIELDS = ('nombre', 'correo', 'telefono', 'detalle')
+TOKEN_SALT = 'api-token'  # Compartido con la aplicación asíncrona (asgi.py)
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+# Los helpers sin contexto de Flask (_error, _serialize, _type_errors,
+# _missing_fields, _contact_from_json con contacto y _update_from_json) los usa
+# también la aplicación Quart (asgi.py)
+
+def _error(message, status, **extra):
+    # Respuesta de werkzeug y no jsonify(): la aceptan tanto Flask como Quart
+    return Response(json.dumps({'error': message, **extra}), status=status, mimetype='application/json')
+
+def _serialize(contact):
+    data = contact.to_dict()
+    for field in ('fecha_creacion', 'fecha_actualizacion'):
+        if data.get(field) is not None:
+            data[field] = data[field].isoformat()
+    return data
+
+def token_required(f):
+    """Decorador que exige un token Bearer válido (no usa la sesión)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth = request.headers.get('Authorization', '')
+        if not auth.startswith('Bearer '):
+            return _error('Token de acceso requerido', 401)
+        try:
+            payload = _serializer().loads(auth[7:], max_age=current_app.config.get('API_TOKEN_MAX_AGE', 86400))
+        except SignatureExpired:
+            return _error('Token expirado', 401)
+        except BadSignature:
+            return _error('Token inválido', 401)
+        g.api_user_id = payload['uid']
+        return f(*args, **kwargs)
+    
+    return decorated_function
+
+def contacts_etag(user_id, version, *parts):
+    """Valor del ETag de un recurso de contactos en una versión dada"""
+    key = ':'.join(str(p) for p in (user_id, version, *parts))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+def _weak_etag(*parts):
+    """ETag débil a partir de la versión de los contactos del usuario"""
+    version = current_contacts_version(g.api_user_id)
+    if version is None:
+        return None
+    return contacts_etag(g.api_user_id, version, *parts)
+
+def _conditional(etag, build):
+    """Responder 304 sin tocar los datos si el cliente ya tiene la versión actual"""
+    if etag and request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    response = build()
+    if response.status_code != 200:
+        return response
+    if etag:
+        response.set_etag(etag, weak=True)
+    else:
+        # Sin versión disponible: ETag a partir del cuerpo (ahorra al menos la transferencia)
+        response.add_etag(weak=True)
+        response.make_conditional(request)
+    return response
+
+def _type_errors(data):
+    """Errores de los campos de contacto de ``data`` que no son texto (o null)"""
+    return [f'{field} debe ser un texto' for field in CONTACT_FIELDS
+            if data.get(field) is not None and not isinstance(data[field], str)]
+
+def _missing_fields(data):
+    """Campos editables que faltan en ``data`` (un PUT debe traerlos todos)"""
+    return [field for field in Contact.EDITABLE if field not in data]
+
+def _contact_from_json(data, contact=None):
+    contact = contact or Contact(user_id=g.api_user_id)
+    for field in CONTACT_FIELDS:
+        if field in data:
+            value = data[field]
+            setattr(contact, field, value.strip() if isinstance(value, str) else value)
+    return contact
+
+def _update_from_json(data, contact, replace):
+    """Aplicar un PUT (``replace``: los campos que falten quedan vacíos) o un
+    PATCH a ``contact``, con la versión que leyó el cliente si la envía"""
+    # La versión se toma antes de reconstruir ``data`` para un PUT
+    contact.version = data.get('version', contact.version)
+    if replace:
+        data = {field: data.get(field, '') for field in CONTACT_FIELDS}
+    return _contact_from_json(data, contact)
+
+@bp.route('/tokens', methods=['POST'])
+def create_token():
+    """Obtener un token de acceso con email y contraseña"""
+    data = request.get_json(silent=True) or {}
+    email = (data.get('email') or '').strip()
+    password = data.get('password') or ''
+    
+    if not login_allowed(request.remote_addr, email):
+        return _error('Demasiados intentos', 429)
+    try:
+        user = User.authenticate(email, password) if email else None
+    except HasherBusyError:
+        return _error('Servidor ocupado', 503)
+    record_login(request.remote_addr, email, user is not None)
+    if not user:
+        return _error('Email o contraseña incorrectos', 401)
+    
+    token = _serializer().dumps({'uid': user.id})
+    return jsonify({'token': token, 'expires_in': current_app.config.get('API_TOKEN_MAX_AGE', 86400)}), 201
+
+@bp.route('/users/bulk', methods=['POST'])
+def bulk_create_users():
+    """Aprovisionar usuarios en bloque (requiere PROVISIONING_TOKEN).
+    
+    Los hashes se calculan dentro de la petición, así que se admiten pocos
+    usuarios por llamada (PROVISIONING_MAX_USERS); las cargas grandes van por
+    ``flask usuarios aprovisionar``.
+    """
+    expected = current_app.config.get('PROVISIONING_TOKEN')
+    if not expected:
+        return _error('Aprovisionamiento desactivado', 404)
+    auth = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(auth.encode('utf-8'), f'Bearer {expected}'.encode('utf-8')):
+        return _error('Token de aprovisionamiento inválido', 401)
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return _error('Se esperaba una lista de usuarios', 400)
+    limit = current_app.config.get('PROVISIONING_MAX_USERS', 100)
+    if len(data) > limit:
+        return _error(f'Demasiados usuarios en una sola petición (máximo {limit}); '
+                      f'use flask usuarios aprovisionar', 413)
+    
+    try:
+        report = User.bulk_create(data)
+    except HasherBusyError:
+        return _error('Servidor ocupado', 503)
+    errors = [{'index': index, 'errors': messages} for index, messages in report['errors']]
+    return jsonify({'created': report['created'], 'failed': report['failed'], 'errors': errors}), \
+        201 if report['created'] else 422
+
+@bp.route('/contacts', methods=['GET'])
+@token_required
+def list_contacts():
+    """Listar contactos paginados por cursor"""
+    limit = min(max(request.args.get('limit', 50, type=int), 1), current_app.config.get('API_MAX_PAGE_SIZE', 200))
+    after_arg, before_arg = request.args.get('after'), request.args.get('before')
+    
+    def build():
+        after = Contact.decode_cursor(after_arg)
+        before = Contact.decode_cursor(before_arg)
+        contacts, next_cursor, prev_cursor = Contact.get_page_by_user(
+            g.api_user_id, limit=limit, after=after, before=None if after else before)
+        return jsonify({
+            'items': [_serialize(c) for c in contacts],
+            'next': next_cursor,
+            'prev': prev_cursor,
+        })
+    
+    return _conditional(_weak_etag('list', limit, after_arg, before_arg), build)
+
+@bp.route('/contacts/<int:contact_id>', methods=['GET'])
+@token_required
+def get_contact(contact_id):
+    """Obtener un contacto"""
+    def build():
+        contact = Contact.get_by_id(contact_id, g.api_user_id)
+        if not contact:
+            return _error('Contacto no encontrado', 404)
+        return jsonify(_serialize(contact))
+    
+    return _conditional(_weak_etag('id', contact_id), build)
+
+@bp.route('/contacts', methods=['POST'])
+@token_required
+def create_contact():
+    """Crear un contacto"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return _error('Se esperaba un objeto JSON', 400)
+    type_errors = _type_errors(data)
+    if type_errors:
+        return _error('Datos no válidos', 400, errors=type_errors)
+    
+    contact = _contact_from_json(data)
+    success, errors = contact.save()
+    if not success:
+        return _error('Datos no válidos', 422, errors=errors)
+    
+    response = jsonify(_serialize(contact))
+    response.status_code = 201
+    response.headers['Location'] = url_for('api.get_contact', contact_id=contact.id)
+    return response
+
+@bp.route('/contacts/bulk', methods=['POST'])
+@token_required
+def bulk_create_contacts():
+    """Crear varios contactos en una sola transacción"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return _error('Se esperaba una lista de contactos', 400)
+    if len(data) > current_app.config.get('API_MAX_BULK_SIZE', 1000):
+        return _error('Demasiados contactos en una sola petición', 413)
+    
+    valid, errors = [], []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'errors': ['Se esperaba un objeto JSON']})
+            continue
+        contact_errors = _type_errors(item)
+        if contact_errors:
+            errors.append({'index': index, 'errors': contact_errors})
+            continue
+        contact = _contact_from_json(item)
+        contact_errors = contact.validate()
+        if contact_errors:
+            errors.append({'index': index, 'errors': contact_errors})
+        else:
+            valid.append(contact)
+    
+    created = Contact.bulk_insert(g.api_user_id, valid)
+    return jsonify({'created': created, 'errors': errors}), 201 if created else 422
+
+@bp.route('/contacts/<int:contact_id>', methods=['PUT', 'PATCH'])
+@token_required
+def update_contact(contact_id):
+    """Actualizar un contacto (PATCH admite campos parciales)"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return _error('Se esperaba un objeto JSON', 400)
+    missing = _missing_fields(data) if request.method == 'PUT' else []
+    if missing:
+        return _error('PUT requiere todos los campos; usa PATCH para cambios parciales', 400, missing=missing)
+    if 'version' in data and (not isinstance(data['version'], int) or isinstance(data['version'], bool)):
+        return _error('version debe ser un entero', 400)
+    type_errors = _type_errors(data)
+    if type_errors:
+        return _error('Datos no válidos', 400, errors=type_errors)
+    
+    contact = Contact.get_by_id(contact_id, g.api_user_id)
+    if not contact:
+        return _error('Contacto no encontrado', 404)
+    
+    # Con la versión que leyó el cliente, la escritura falla si otro la cambió entretanto
+    contact = _update_from_json(data, contact, replace=request.method == 'PUT')
+    try:
+        success, errors = contact.save()
+    except ContactConflictError as e:
+        if e.current is None:
+            return _error('Contacto no encontrado', 404)
+        return _error('El contacto fue modificado; vuelve a leerlo', 409, current=_serialize(e.current))
+    if not success:
+        return _error('Datos no válidos', 422, errors=errors)
+    return jsonify(_serialize(contact))
+
+@bp.route('/contacts/<int:contact_id>', methods=['DELETE'])
+@token_required
+def delete_contact(contact_id):
+    """Eliminar un contacto"""
+    contact = Contact(id=contact_id, user_id=g.api_user_id)
+    if not contact.delete():
+        return _error('Contacto no encontrado', 404)
+    return '', 204
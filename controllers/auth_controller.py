@@ -1,8 +1,18 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, g
 from models.user import User
+from models.hashing import HasherBusyError
+from models.rate_limit import login_allowed, record_login
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+@bp.before_app_request
+def load_current_user():
+    """Resolver el usuario autenticado una vez por petición (en g.user)"""
+    g.user = None
+    if request.endpoint == 'static' or 'user_id' not in session:
+        return
+    g.user = User.get_cached(session['user_id'])
+
 @bp.route('/register', methods=['GET', 'POST'])
 def register():
     """Registro de usuario"""
@@ -22,7 +32,11 @@ def register():
             return render_template('auth/register.html')
         
         # Crear usuario
-        user, error = User.create(nombre, email, password)
+        try:
+            user, error = User.create(nombre, email, password)
+        except HasherBusyError:
+            flash('El servidor está ocupado, inténtalo de nuevo en unos segundos', 'warning')
+            return render_template('auth/register.html'), 503
         
         if error:
             flash(error, 'danger')
@@ -44,9 +58,19 @@ def login():
             flash('Por favor ingresa email y contraseña', 'danger')
             return render_template('auth/login.html')
         
-        user = User.get_by_email(email)
+        # Limitar intentos antes de gastar CPU verificando la contraseña
+        if not login_allowed(request.remote_addr, email):
+            flash('Demasiados intentos. Espera unos minutos antes de volver a intentarlo', 'danger')
+            return render_template('auth/login.html'), 429
+        
+        try:
+            user = User.authenticate(email, password)
+        except HasherBusyError:
+            flash('El servidor está ocupado, inténtalo de nuevo en unos segundos', 'warning')
+            return render_template('auth/login.html'), 503
+        record_login(request.remote_addr, email, user is not None)
         
-        if user and user.check_password(password):
+        if user:
             session['user_id'] = user.id
             session['user_name'] = user.nombre
             flash(f'Bienvenido, {user.nombre}!', 'success')
@@ -62,12 +86,11 @@ def profile():
     if 'user_id' not in session:
         return redirect(url_for('auth.login'))
     
-    user = User.get_by_id(session['user_id'])
-    if not user:
+    if not g.user:
         session.clear()
         return redirect(url_for('auth.login'))
     
-    return render_template('auth/profile.html', user=user)
+    return render_template('auth/profile.html', user=g.user)
 
 @bp.route('/logout')
 def logout():
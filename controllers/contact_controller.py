@@ -1,5 +1,10 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
-from models.contact import Contact
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, session,
+                   current_app, Response, stream_with_context, jsonify)
+from markupsafe import Markup
+from models.contact import Contact, ContactConflictError
+from models.cache import cached_contacts_fragment
+from models import contact_io, dedupe
+import io
 
 bp = Blueprint('contact', __name__, url_prefix='/contactos')
 
@@ -16,13 +21,49 @@ def login_required(f):
     
     return decorated_function
 
-@bp.route('/')
+# endpoint='list': url_for('contact.list') sigue igual sin tapar el builtin list
+@bp.route('/', endpoint='list')
 @login_required
-def list():
-    """Listar contactos del usuario"""
+def list_contacts():
+    """Listar contactos del usuario (paginado por cursor).
+    
+    La tabla se cachea ya renderizada: mientras los contactos no cambien, las
+    visitas repetidas a la misma página no consultan ni renderizan la lista
+    (ver cached_contacts_fragment para las escrituras desde otros procesos).
+    """
     user_id = session['user_id']
-    contacts = Contact.get_all_by_user(user_id)
-    return render_template('contacts/list.html', contacts=contacts)
+    per_page = current_app.config.get('CONTACTS_PER_PAGE', 50)
+    after_arg, before_arg = request.args.get('after'), request.args.get('before')
+    
+    def render_table():
+        after = Contact.decode_cursor(after_arg)
+        before = Contact.decode_cursor(before_arg)
+        contacts, next_cursor, prev_cursor = Contact.get_page_by_user(
+            user_id, limit=per_page, after=after, before=None if after else before)
+        total = Contact.count_by_user(user_id)
+        return render_template('contacts/_table.html', contacts=contacts, total=total,
+                               next_cursor=next_cursor, prev_cursor=prev_cursor)
+    
+    table, hit = cached_contacts_fragment(
+        user_id, f'list:{per_page}:{after_arg}:{before_arg}', render_table)
+    response = current_app.make_response(render_template('contacts/list.html', table=Markup(table)))
+    if hit is not None:
+        response.headers['X-Fragment-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+@bp.route('/buscar')
+@login_required
+def search():
+    """Buscar contactos por nombre, correo o teléfono"""
+    user_id = session['user_id']
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = current_app.config.get('SEARCH_RESULTS_PER_PAGE', 20)
+    
+    contacts, has_more = Contact.search(user_id, query, limit=per_page,
+                                        offset=(page - 1) * per_page)
+    return render_template('contacts/search.html', contacts=contacts, query=query,
+                           page=page, has_more=has_more)
 
 @bp.route('/agregar', methods=['GET', 'POST'])
 @login_required
@@ -49,24 +90,89 @@ def add():
     
     return render_template('contacts/add.html')
 
+@bp.route('/importar', methods=['GET', 'POST'])
+@login_required
+def import_contacts():
+    """Importar contactos desde un archivo CSV o vCard"""
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('archivo')
+        if not upload or not upload.filename:
+            flash('Selecciona un archivo para importar', 'danger')
+            return render_template('contacts/import.html')
+        
+        fmt = 'vcf' if upload.filename.lower().endswith(('.vcf', '.vcard')) else 'csv'
+        # Leer el archivo subido en streaming, sin cargarlo entero en memoria
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', errors='strict', newline='')
+        report = contact_io.import_contacts(
+            session['user_id'], stream, fmt,
+            chunk_size=current_app.config.get('IMPORT_CHUNK_SIZE', 1000))
+        
+        if report['imported']:
+            flash(f"{report['imported']} contactos importados", 'success')
+        if report['failed'] or not report['total']:
+            flash('Algunas filas no se pudieron importar', 'warning')
+    
+    return render_template('contacts/import.html', report=report)
+
+@bp.route('/exportar')
+@login_required
+def export():
+    """Exportar todos los contactos en CSV, JSON Lines o vCard (en streaming)"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in contact_io.EXPORT_FORMATS:
+        flash('Formato de exportación no soportado', 'danger')
+        return redirect(url_for('contact.list'))
+    
+    mimetype, extension = contact_io.EXPORT_FORMATS[fmt]
+    chunks = contact_io.export_contacts(session['user_id'], fmt,
+                                        batch_size=current_app.config.get('EXPORT_BATCH_SIZE', 1000))
+    return Response(
+        stream_with_context(chunks),
+        mimetype=f'{mimetype}; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename=contactos.{extension}'},
+    )
+
 @bp.route('/editar/<int:contact_id>', methods=['GET', 'POST'])
 @login_required
 def edit(contact_id):
-    """Editar contacto existente"""
+    """Editar contacto existente.
+    
+    El formulario devuelve la versión y los valores que se mostraron, así que
+    el POST no vuelve a leer el contacto: un único UPDATE condicionado a la
+    versión con solo los campos cambiados. Si no se cambió nada no hay UPDATE
+    que lo confirme y se comprueba que el contacto existe (lectura cacheada).
+    """
     user_id = session['user_id']
-    contact = Contact.get_by_id(contact_id, user_id)
+    version = request.form.get('version', type=int) if request.method == 'POST' else None
     
-    if not contact:
-        flash('Contacto no encontrado', 'danger')
-        return redirect(url_for('contact.list'))
+    if version is not None:
+        # Valores mostrados en el formulario = valores de esa versión
+        contact = Contact(id=contact_id, user_id=user_id, version=version,
+                          **{field: request.form.get(f'original_{field}', '') for field in Contact.EDITABLE})
+    else:
+        contact = Contact.get_by_id(contact_id, user_id)
+        if not contact:
+            flash('Contacto no encontrado', 'danger')
+            return redirect(url_for('contact.list'))
     
     if request.method == 'POST':
-        contact.nombre = request.form.get('nombre', '').strip()
-        contact.correo = request.form.get('correo', '').strip()
-        contact.telefono = request.form.get('telefono', '').strip()
-        contact.detalle = request.form.get('detalle', '').strip()
+        for field in Contact.EDITABLE:
+            setattr(contact, field, request.form.get(field, '').strip())
         
-        success, errors = contact.save()
+        if version is not None and not contact.changed_fields() and not Contact.get_by_id(contact_id, user_id):
+            flash('Contacto no encontrado', 'danger')
+            return redirect(url_for('contact.list'))
+        
+        try:
+            success, errors = contact.save()
+        except ContactConflictError as e:
+            if e.current is None:
+                flash('Contacto no encontrado', 'danger')
+                return redirect(url_for('contact.list'))
+            flash('Otra sesión modificó este contacto mientras lo editabas; '
+                  'revisa los datos actuales y vuelve a guardar', 'warning')
+            return render_template('contacts/edit.html', contact=e.current), 409
         
         if success:
             flash('Contacto actualizado exitosamente', 'success')
@@ -81,12 +187,143 @@ def edit(contact_id):
 @login_required
 def delete(contact_id):
     """Eliminar contacto"""
-    user_id = session['user_id']
-    contact = Contact.get_by_id(contact_id, user_id)
-    
-    if contact and contact.delete():
+    # El DELETE ya filtra por usuario: no hace falta leer el contacto antes
+    if Contact(id=contact_id, user_id=session['user_id']).delete():
         flash('Contacto eliminado exitosamente', 'success')
     else:
         flash('No se pudo eliminar el contacto', 'danger')
     
-    return redirect(url_for('contact.list'))
\ No newline at end of file
+    return redirect(url_for('contact.list'))
+
+@bp.route('/lote', methods=['POST'])
+@login_required
+def batch():
+    """Eliminar o editar varios contactos a la vez.
+    
+    Desde la lista llegan los ``ids`` marcados, la ``accion`` y, al editar,
+    ``campo`` y ``valor``; por JSON ``{"accion", "ids", "valores"}`` y la
+    respuesta trae los recuentos. Una sentencia por cada bloque de ids.
+    """
+    user_id = session['user_id']
+    as_json = request.is_json
+    if as_json:
+        data = request.get_json(silent=True)
+        data = data if isinstance(data, dict) else {}
+        action, ids, values = data.get('accion'), data.get('ids'), data.get('valores')
+    else:
+        action, ids = request.form.get('accion'), request.form.getlist('ids')
+        field = request.form.get('campo')
+        values = {field: request.form.get('valor', '').strip()} if field else None
+    
+    def fail(message, status=400):
+        if as_json:
+            return jsonify({'error': message}), status
+        flash(message, 'danger')
+        return redirect(url_for('contact.list'))
+    
+    try:
+        ids = [int(contact_id) for contact_id in ids] if isinstance(ids, list) else None
+    except (TypeError, ValueError):
+        ids = None
+    if not ids:
+        return fail('Selecciona al menos un contacto')
+    if len(ids) > current_app.config.get('BATCH_MAX_CONTACTS', 10000):
+        return fail('Demasiados contactos en una sola acción', 413)
+    chunk_size = current_app.config.get('BATCH_CHUNK_SIZE', 500)
+    
+    if action == 'eliminar':
+        affected = Contact.delete_many(user_id, ids, chunk_size=chunk_size)
+        result, message = {'deleted': affected}, f'{affected} contactos eliminados'
+    elif action == 'editar':
+        if (not isinstance(values, dict) or not values or set(values) - set(Contact.EDITABLE)
+                or not all(value is None or isinstance(value, str) for value in values.values())):
+            return fail(f"Indica los campos a cambiar ({', '.join(Contact.EDITABLE)}) y sus valores")
+        errors = Contact.validate_fields(values)
+        if errors:
+            return fail(', '.join(errors))
+        affected = Contact.update_many(user_id, ids, values, chunk_size=chunk_size)
+        result, message = {'updated': affected}, f'{affected} contactos actualizados'
+    else:
+        return fail('Acción no válida')
+    
+    if as_json:
+        return jsonify({**result, 'requested': len(set(ids))})
+    flash(message, 'success')
+    return redirect(url_for('contact.list'))
+
+@bp.route('/duplicados')
+@login_required
+def duplicates():
+    """Grupos de contactos posiblemente duplicados"""
+    user_id = session['user_id']
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = current_app.config.get('DEDUPE_GROUPS_PER_PAGE', 20)
+    
+    groups = dedupe.find_duplicates(user_id)
+    start = (page - 1) * per_page
+    return render_template('contacts/duplicates.html',
+                           groups=dedupe.load_groups(user_id, groups[start:start + per_page]),
+                           total=len(groups), page=page, has_more=len(groups) > start + per_page)
+
+@bp.route('/duplicados/fusionar', methods=['POST'])
+@login_required
+def merge():
+    """Fusionar un grupo de duplicados en el contacto elegido"""
+    user_id = session['user_id']
+    try:
+        keep_id = int(request.form.get('conservar', ''))
+        merge_ids = [int(value) for value in request.form.getlist('fusionar')]
+    except ValueError:
+        flash('Selección no válida', 'danger')
+        return redirect(url_for('contact.duplicates'))
+    
+    merged = dedupe.merge_contacts(user_id, keep_id, merge_ids)
+    if merged is None:
+        flash('Contacto no encontrado', 'danger')
+    else:
+        flash(f'Contactos fusionados en «{merged.nombre}»', 'success')
+    return redirect(url_for('contact.duplicates', page=request.form.get('page', 1, type=int)))
+
+@bp.route('/lookup', methods=['GET', 'POST'])
+@login_required
+def lookup():
+    """Búsqueda inversa: qué contactos tienen estos teléfonos o emails.
+    
+    GET ``?telefono=...&correo=...`` (repetibles) o POST JSON
+    ``{"telefonos": [...], "correos": [...]}`` para muchos valores a la vez.
+    Cada campo se resuelve con una consulta sobre su índice normalizado.
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Se esperaba un objeto JSON con telefonos y/o correos'}), 400
+        queries = {'telefono': data.get('telefonos') or [], 'correo': data.get('correos') or []}
+        if not all(isinstance(values, list) and all(isinstance(v, str) for v in values)
+                   for values in queries.values()):
+            return jsonify({'error': 'telefonos y correos deben ser listas de textos'}), 400
+    else:
+        queries = {'telefono': request.args.getlist('telefono'), 'correo': request.args.getlist('correo')}
+    
+    total = sum(len(values) for values in queries.values())
+    if not total:
+        return jsonify({'error': 'Indique al menos un telefono o correo'}), 400
+    if total > current_app.config.get('LOOKUP_MAX_VALUES', 1000):
+        return jsonify({'error': 'Demasiados valores en una sola petición'}), 413
+    
+    user_id = session['user_id']
+    results = []
+    for field, values in queries.items():
+        if not values:
+            continue
+        found = Contact.lookup(user_id, field, values)
+        normalize = Contact.NORMALIZED[field][1]
+        for value in values:
+            key = normalize(value)
+            results.append({
+                'query': value,
+                'field': field,
+                'normalized': key,
+                'contacts': [{'id': c.id, 'nombre': c.nombre, 'correo': c.correo, 'telefono': c.telefono}
+                             for c in found.get(key, ())],
+            })
+    return jsonify({'results': results})
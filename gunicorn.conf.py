@@ -0,0 +1,94 @@
+"""
+Configuración de gunicorn para producción:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Todos los valores se pueden ajustar con variables de entorno GUNICORN_*.
+
+Recarga sin cortes: con ``preload_app`` el código se carga en el proceso
+maestro, así que ``kill -HUP`` solo recicla los workers con el mismo código.
+Para desplegar código nuevo use ``kill -USR2 <maestro>`` (arranca un maestro
+nuevo) y después ``kill -WINCH``/``-QUIT`` al antiguo, o GUNICORN_PRELOAD=False
+para que HUP recargue también el código.
+"""
+
+import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Procesos × hilos: los hilos cubren la espera de E/S (base de datos) y los
+# procesos aprovechan varias CPU a pesar del GIL
+workers = int(os.environ.get('GUNICORN_WORKERS', _cpus * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Cargar la aplicación una sola vez en el maestro: arranque más rápido y
+# memoria compartida (copy-on-write) entre workers
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))  # Segundos con la conexión HTTP abierta
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))  # Worker colgado: se reinicia
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))  # Para terminar peticiones en curso
+# Reciclar cada worker tras N peticiones (con variación para no reiniciarlos todos a la vez)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG') or None  # '-' para stdout
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+# Cada worker tiene su propio pool de conexiones y de hashing: dimensionarlos
+# por worker (se leen al importar config.py, después de este archivo)
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+os.environ.setdefault('HASH_WORKERS', '1')
+
+# Lo cacheado de los contactos (lecturas, fragmentos HTML, ETag de la API) se
+# invalida con los contadores de versión de la caché de contactos: en 'memory'
+# cada worker tendría los suyos y una escritura en uno no invalidaría lo de los
+# demás. Con varios workers la caché por defecto es Redis (CACHE_REDIS_URL);
+# 'memory' puesta a mano no arranca ('none' la desactiva a sabiendas)
+if workers > 1:
+    os.environ.setdefault('CONTACT_CACHE_BACKEND', 'redis')
+    if os.environ['CONTACT_CACHE_BACKEND'] == 'memory':
+        raise RuntimeError(
+            f"CONTACT_CACHE_BACKEND='memory' no se comparte entre los {workers} workers: "
+            f"use 'redis' (por defecto), 'none' o GUNICORN_WORKERS=1")
+    if os.environ['CONTACT_CACHE_BACKEND'] == 'redis':
+        try:
+            import redis  # noqa: F401
+        except ImportError:
+            raise RuntimeError("CONTACT_CACHE_BACKEND='redis' requiere: pip install redis "
+                               "(está en requirements.txt)")
+
+
+def on_starting(server):
+    """Avisar de lo que no se comparte entre workers"""
+    if workers > 1:
+        # variable -> (valor por defecto, alternativa compartida)
+        shared = {
+            'SESSION_BACKEND': ('cookie', "'sql' o 'cookie'"),
+            'USER_CACHE_BACKEND': ('memory', "'redis'"),
+        }
+        for name, (default, alternative) in shared.items():
+            if os.environ.get(name, default) == 'memory':
+                server.log.warning(f"{name}='memory' es local de cada worker: con {workers} "
+                                   f"workers use {alternative}")
+
+
+def when_ready(server):
+    """Cerrar en el maestro las conexiones abiertas al precargar la aplicación,
+    para que ningún worker herede un socket compartido"""
+    if preload_app:
+        from models.database import reset_pool
+        reset_pool(server.app.wsgi(), close=True)
+
+
+def post_fork(server, worker):
+    """Cada worker empieza con un pool de conexiones vacío y propio"""
+    if preload_app:
+        from models.database import reset_pool
+        reset_pool(server.app.wsgi())
+    server.log.info(f"Worker {worker.pid} con pool de conexiones propio")
@@ -0,0 +1,91 @@
+"""Esquema inicial: usuarios, contactos y sesiones.
+
+Usa IF NOT EXISTS y ``ensure_index`` para poder aplicarse también sobre
+bases de datos creadas antes de que existieran las migraciones.
+"""
+
+
+def upgrade(cursor, backend):
+    if backend.name == 'mysql':
+        _upgrade_mysql(cursor, backend)
+    else:
+        _upgrade_sqlite(cursor, backend)
+
+
+def _upgrade_mysql(cursor, backend):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            nombre VARCHAR(100) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS contactos (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            nombre VARCHAR(100) NOT NULL,
+            correo VARCHAR(100),
+            telefono VARCHAR(20),
+            detalle TEXT,
+            fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES usuarios(id) ON DELETE CASCADE,
+            INDEX idx_user_id (user_id),
+            INDEX idx_user_nombre_id (user_id, nombre, id),
+            FULLTEXT INDEX ft_contactos_busqueda (nombre, correo, telefono)
+        )
+    ''')
+
+    # Tabla de sesiones (SESSION_BACKEND = 'sql')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sesiones (
+            id VARCHAR(64) PRIMARY KEY,
+            datos MEDIUMBLOB NOT NULL,
+            expira DATETIME NOT NULL,
+            INDEX idx_expira (expira)
+        )
+    ''')
+
+    # Índices que no tenían las tablas creadas antes de las migraciones
+    backend.ensure_index(cursor, 'contactos', 'idx_user_nombre_id', '(user_id, nombre, id)')
+    backend.ensure_index(cursor, 'contactos', 'ft_contactos_busqueda',
+                         '(nombre, correo, telefono)', kind='FULLTEXT')
+
+
+def _upgrade_sqlite(cursor, backend):
+    # COLLATE NOCASE imita la intercalación *_ci de MySQL en orden y unicidad
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+            password_hash TEXT NOT NULL,
+            fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS contactos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL REFERENCES usuarios(id) ON DELETE CASCADE,
+            nombre TEXT NOT NULL COLLATE NOCASE,
+            correo TEXT,
+            telefono TEXT,
+            detalle TEXT,
+            fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # También cubre las búsquedas por user_id solo
+    backend.ensure_index(cursor, 'contactos', 'idx_user_nombre_id', '(user_id, nombre, id)')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sesiones (
+            id TEXT PRIMARY KEY,
+            datos BLOB NOT NULL,
+            expira DATETIME NOT NULL
+        )
+    ''')
+    backend.ensure_index(cursor, 'sesiones', 'idx_expira', '(expira)')
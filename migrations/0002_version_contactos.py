@@ -0,0 +1,20 @@
+"""Versión y fecha de actualización de los contactos.
+
+``version`` empieza en 1 y cada UPDATE la incrementa: las ediciones envían
+la versión que leyeron y solo se aplican si sigue siendo la misma
+(concurrencia optimista). ``fecha_actualizacion`` queda a NULL mientras el
+contacto no se haya modificado desde su creación.
+"""
+
+
+def upgrade(cursor, backend):
+    if backend.name == 'mysql':
+        cursor.execute('''
+            ALTER TABLE contactos
+                ADD COLUMN version INT NOT NULL DEFAULT 1,
+                ADD COLUMN fecha_actualizacion TIMESTAMP NULL DEFAULT NULL
+        ''')
+    else:
+        # SQLite solo admite una columna por ALTER TABLE
+        cursor.execute('ALTER TABLE contactos ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+        cursor.execute('ALTER TABLE contactos ADD COLUMN fecha_actualizacion TIMESTAMP')
@@ -0,0 +1,25 @@
+"""Teléfono y email normalizados de los contactos, con índices por usuario.
+
+``telefono_norm`` guarda los dígitos del teléfono sin el prefijo del país por
+defecto y ``correo_norm`` el email en minúsculas (ver
+``models.contact.normalize_phone``/``normalize_email``);
+los mantiene ``Contact`` al escribir y permiten la búsqueda inversa
+(``/contactos/lookup``) con una consulta sobre índice en vez de un LIKE.
+
+La migración solo añade las columnas vacías: las filas existentes se
+rellenan después, por bloques, con ``flask --app app contactos normalizar``.
+"""
+
+
+def upgrade(cursor, backend):
+    if backend.name == 'mysql':
+        cursor.execute('''
+            ALTER TABLE contactos
+                ADD COLUMN telefono_norm VARCHAR(20) NULL DEFAULT NULL,
+                ADD COLUMN correo_norm VARCHAR(100) NULL DEFAULT NULL
+        ''')
+    else:
+        cursor.execute('ALTER TABLE contactos ADD COLUMN telefono_norm TEXT')
+        cursor.execute('ALTER TABLE contactos ADD COLUMN correo_norm TEXT')
+    backend.ensure_index(cursor, 'contactos', 'idx_user_telefono_norm', '(user_id, telefono_norm)')
+    backend.ensure_index(cursor, 'contactos', 'idx_user_correo_norm', '(user_id, correo_norm)')
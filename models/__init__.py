@@ -1,6 +1,6 @@
 # Este archivo hace que el directorio models sea un paquete Python
-from .database import get_db, close_db, init_db
+from .database import get_db, get_read_db, close_db, init_db, get_pool, get_backend, pool_stats
 from .user import User
 from .contact import Contact
 
-__all__ = ['get_db', 'close_db', 'init_db', 'User', 'Contact']
\ No newline at end of file
+__all__ = ['get_db', 'get_read_db', 'close_db', 'init_db', 'get_pool', 'get_backend', 'pool_stats', 'User', 'Contact']
\ No newline at end of file
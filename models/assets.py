@@ -0,0 +1,156 @@
+"""
+Recursos estáticos con huella de contenido y precomprimidos.
+
+``flask --app app assets build`` copia los archivos de ``static/`` a
+``static/dist/`` con el hash del contenido en el nombre
+(``css/style.3f2a9c1e07b4.css``), junto a sus versiones ``.gz`` y ``.br``,
+y escribe ``manifest.json`` con la correspondencia. En las plantillas,
+``asset_url('css/style.css')`` da la URL con hash si hay manifiesto (si no,
+la misma que ``url_for('static', ...)``) y la ruta ``/assets/`` la sirve con
+caché inmutable y la variante comprimida que acepte el cliente. Detrás de
+nginx basta con ``gzip_static``/``brotli_static`` sobre ``static/dist``.
+
+Brotli es opcional (``pip install brotli``); sin él solo se genera gzip.
+"""
+
+from flask import current_app, request, send_from_directory, url_for
+from werkzeug.security import safe_join
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 12
+
+# Extensiones que merece la pena precomprimir (las imágenes y fuentes ya lo están)
+COMPRESSIBLE = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico', '.ttf')
+
+# Variantes servidas por orden de preferencia: (Content-Encoding, sufijo)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def brotli_module():
+    """Módulo brotli si está instalado, o None"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def hashed_name(filename, data):
+    """'css/style.css' -> 'css/style.<hash>.css'"""
+    root, extension = os.path.splitext(filename)
+    return f'{root}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{extension}'
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build_assets(static_dir, dist_dir):
+    """Generar ``dist_dir`` desde ``static_dir`` (se reconstruye entero).
+
+    Cada variante comprimida solo se escribe si ocupa menos que el original.
+    Devuelve el informe: una lista de diccionarios con el archivo, su nombre
+    con hash y los bytes del original, gzip y brotli (None si no se generó).
+    """
+    brotli = brotli_module()
+    if brotli is None:
+        logger.warning("brotli no está instalado: solo se genera gzip (pip install brotli)")
+
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+
+    manifest = {}
+    report = []
+    for directory, subdirs, files in os.walk(static_dir):
+        # No recorrer la propia salida si está dentro de static/
+        subdirs[:] = sorted(d for d in subdirs if os.path.join(directory, d) != dist_dir)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            filename = os.path.relpath(path, static_dir).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                data = f.read()
+            target = hashed_name(filename, data)
+            _write(os.path.join(dist_dir, target), data)
+            manifest[filename] = target
+
+            entry = {'file': filename, 'hashed': target, 'size': len(data), 'gzip': None, 'br': None}
+            if filename.lower().endswith(COMPRESSIBLE):
+                variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    variants['br'] = brotli.compress(data, quality=11)
+                for encoding, suffix in ENCODINGS:
+                    compressed = variants.get(encoding)
+                    if compressed is not None and len(compressed) < len(data):
+                        _write(os.path.join(dist_dir, target + suffix), compressed)
+                        entry[encoding] = len(compressed)
+            report.append(entry)
+
+    _write(os.path.join(dist_dir, MANIFEST),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return report
+
+
+def get_dist_dir(app=None):
+    """Directorio de los recursos generados (static/dist por defecto)"""
+    app = app or current_app
+    return os.path.join(app.static_folder, app.config.get('ASSETS_DIST_DIR', 'dist'))
+
+
+def get_manifest():
+    """Manifiesto de la aplicación actual ({} si no se han construido los
+    recursos). Se lee una vez por proceso: reiniciar tras ``assets build``."""
+    extensions = current_app.extensions
+    if 'assets' not in extensions:
+        try:
+            with open(os.path.join(get_dist_dir(), MANIFEST), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+        extensions.setdefault('assets', manifest)
+    return extensions['assets']
+
+
+def asset_url(filename, **values):
+    """Como ``url_for('static', filename=...)`` pero con la versión con hash si existe"""
+    hashed = get_manifest().get(filename)
+    if hashed is None:
+        return url_for('static', filename=filename, **values)
+    return url_for('assets', filename=hashed, **values)
+
+
+def serve_asset(filename):
+    """Servir un recurso con hash: caché inmutable y variante precomprimida"""
+    directory = get_dist_dir()
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in ENCODINGS:
+        candidate = safe_join(directory, filename + suffix)
+        if request.accept_encodings[name] and candidate and os.path.isfile(candidate):
+            encoding, filename = name, filename + suffix
+            break
+
+    max_age = current_app.config.get('ASSETS_MAX_AGE', 31536000)
+    response = send_from_directory(directory, filename, mimetype=mimetype, max_age=max_age)
+    # El nombre cambia con el contenido: el navegador no necesita revalidar nunca
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_assets(app):
+    """Registrar la ruta /assets/ y ``asset_url`` en las plantillas"""
+    app.add_url_rule('/assets/<path:filename>', 'assets', serve_asset)
+    app.jinja_env.globals['asset_url'] = asset_url
@@ -0,0 +1,100 @@
+from models.contact import Contact, ContactConflictError
+from models.cache import MISS, bump_version, contacts_key, contacts_version
+import asyncio
+
+
+class AsyncContactStore:
+    """Lecturas y escrituras de contactos para la aplicación asíncrona.
+
+    Usa las mismas sentencias, claves de caché y versiones que ``Contact``,
+    así que con una caché compartida (Redis) las escrituras de una aplicación
+    invalidan las lecturas cacheadas de la otra.
+
+    Las llamadas a una caché de red (``cache.blocking``, Redis) se hacen en
+    un hilo para no detener el bucle de eventos mientras responde.
+    """
+
+    def __init__(self, db, cache=None):
+        self.db = db
+        self.cache = cache
+
+    async def _cache_call(self, fn, *args):
+        if self.cache.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def _cached(self, user_id, name, loader):
+        if self.cache is None:
+            return await loader()
+        key = await self._cache_call(contacts_key, self.cache, user_id, name)
+        value = await self._cache_call(self.cache.get, key)
+        if value is MISS:
+            value = await loader()
+            await self._cache_call(self.cache.set, key, value)
+        return value
+
+    async def _bump(self, user_id):
+        if self.cache is not None:
+            await self._cache_call(bump_version, self.cache, user_id)
+
+    async def version(self, user_id):
+        """Versión de los contactos del usuario (None sin caché), para los ETag"""
+        if self.cache is None:
+            return None
+        return await self._cache_call(contacts_version, self.cache, user_id)
+
+    async def get_by_id(self, contact_id, user_id):
+        """Obtener contacto por ID (solo si pertenece al usuario)"""
+        async def load():
+            return await self.db.fetchone(
+                f'{Contact._SELECT} WHERE id = %s AND user_id = %s', (contact_id, user_id))
+
+        row = await self._cached(user_id, f'id:{contact_id}', load)
+        return Contact(*row) if row else None
+
+    async def get_page_by_user(self, user_id, limit=50, after=None, before=None):
+        """Página de contactos por clave (nombre, id), como Contact.get_page_by_user"""
+        async def load():
+            return await self.db.fetchall(*Contact._page_query(user_id, limit, after, before))
+
+        rows = await self._cached(user_id, f'page:{limit}:{after}:{before}', load)
+        return Contact._page_result(list(rows), limit, after, before)
+
+    async def count_by_user(self, user_id):
+        """Contar los contactos de un usuario"""
+        async def load():
+            row = await self.db.fetchone(
+                'SELECT COUNT(*) FROM contactos WHERE user_id = %s', (user_id,))
+            return row[0]
+
+        return await self._cached(user_id, 'count', load)
+
+    async def save(self, contact):
+        """Guardar contacto como Contact.save: solo los campos cambiados y con
+        ContactConflictError si la versión ya no es la leída"""
+        errors = contact.validate()
+        if errors:
+            return False, errors
+
+        if contact.id:
+            changes = contact.changed_fields()
+            if not changes:
+                return True, None
+            affected, _ = await self.db.execute(*contact._update_query(changes))
+            if not affected:
+                row = await self.db.fetchone(*contact._current_row_query())
+                raise ContactConflictError(Contact(*row) if row else None)
+            contact._updated()
+        else:
+            _, contact_id = await self.db.execute(*contact._insert_query())
+            contact._inserted(contact_id)
+        await self._bump(contact.user_id)
+        return True, None
+
+    async def delete(self, contact_id, user_id):
+        """Eliminar contacto; devuelve si existía"""
+        affected, _ = await self.db.execute(
+            'DELETE FROM contactos WHERE id = %s AND user_id = %s', (contact_id, user_id))
+        if affected:
+            await self._bump(user_id)
+        return affected > 0
@@ -0,0 +1,129 @@
+"""
+Acceso asíncrono a la base de datos para la aplicación ASGI (asgi.py).
+
+Cada motor tiene su propio pool de conexiones asíncronas, independiente del
+pool síncrono de la aplicación Flask:
+
+- MySQL: aiomysql (``pip install aiomysql``)
+- SQLite: aiosqlite (``pip install aiosqlite``)
+
+Las sentencias usan los mismos marcadores ``%s`` que el resto de modelos y
+las filas llegan como tuplas, igual que con los cursores síncronos.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMySQLDatabase:
+    """Pool de aiomysql con la configuración MYSQL_* de la aplicación"""
+
+    def __init__(self, config):
+        from models.backends.mysql_backend import _connection_params
+        self.params = _connection_params(config)
+        self.size = config.get('ASYNC_DB_POOL_SIZE', 20)
+        self.recycle = config.get('DB_POOL_RECYCLE', 3600)
+        self._pool = None
+
+    async def open(self):
+        try:
+            import aiomysql
+        except ImportError:
+            raise RuntimeError("La aplicación asíncrona con MySQL requiere: pip install aiomysql")
+        params = self.params
+        self._pool = await aiomysql.create_pool(
+            host=params['host'], port=params['port'], user=params['user'],
+            password=params['password'], db=params['database'], charset='utf8mb4',
+            autocommit=True, minsize=1, maxsize=self.size, pool_recycle=self.recycle)
+        logger.info(f"Pool asíncrono de MySQL abierto ({self.size} conexiones)")
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    async def _run(self, statement, params, fetch):
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(statement, params)
+                if fetch == 'one':
+                    return await cursor.fetchone()
+                if fetch == 'all':
+                    return await cursor.fetchall()
+                return cursor.rowcount, cursor.lastrowid
+
+    async def fetchone(self, statement, params=()):
+        return await self._run(statement, params, 'one')
+
+    async def fetchall(self, statement, params=()):
+        return await self._run(statement, params, 'all')
+
+    async def execute(self, statement, params=()):
+        """Ejecutar una escritura; devuelve (filas afectadas, último id)"""
+        return await self._run(statement, params, None)
+
+
+class AsyncSQLiteDatabase:
+    """Pool de conexiones aiosqlite sobre el mismo archivo que SQLiteBackend"""
+
+    def __init__(self, config):
+        from models.backends.sqlite_backend import SQLiteBackend
+        self.backend = SQLiteBackend(config)
+        self.size = config.get('ASYNC_DB_POOL_SIZE', 20)
+        self._idle = None
+        self._connections = []
+
+    async def open(self):
+        try:
+            import aiosqlite
+        except ImportError:
+            raise RuntimeError("La aplicación asíncrona con SQLite requiere: pip install aiosqlite")
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            conn = await aiosqlite.connect(self.backend.path, **self.backend.connect_kwargs())
+            for pragma in self.backend.pragmas():
+                await conn.execute(pragma)
+            self._connections.append(conn)
+            self._idle.put_nowait(conn)
+        logger.info(f"Pool asíncrono de SQLite abierto ({self.size} conexiones)")
+
+    async def close(self):
+        for conn in self._connections:
+            await conn.close()
+        self._connections = []
+
+    async def _run(self, statement, params, fetch):
+        from models.backends.sqlite_backend import _translate
+        conn = await self._idle.get()
+        try:
+            async with conn.execute(_translate(statement), params) as cursor:
+                if fetch == 'one':
+                    return await cursor.fetchone()
+                if fetch == 'all':
+                    return await cursor.fetchall()
+                return cursor.rowcount, cursor.lastrowid
+        finally:
+            self._idle.put_nowait(conn)
+
+    async def fetchone(self, statement, params=()):
+        return await self._run(statement, params, 'one')
+
+    async def fetchall(self, statement, params=()):
+        return await self._run(statement, params, 'all')
+
+    async def execute(self, statement, params=()):
+        """Ejecutar una escritura; devuelve (filas afectadas, último id)"""
+        return await self._run(statement, params, None)
+
+
+def create_async_database(config):
+    """Base de datos asíncrona del motor indicado en DB_BACKEND"""
+    backend = config.get('DB_BACKEND', 'mysql')
+    if backend == 'mysql':
+        return AsyncMySQLDatabase(config)
+    if backend == 'sqlite':
+        return AsyncSQLiteDatabase(config)
+    raise ValueError(f"DB_BACKEND no soportado: {backend}")
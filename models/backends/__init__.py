@@ -0,0 +1,23 @@
+"""Motores de almacenamiento: MySQL (servidor) y SQLite (embebido).
+
+Cada motor sabe abrir conexiones compatibles con la API que usan los
+modelos (cursores con ``dictionary=True``, marcadores ``%s``,
+``start_transaction``, ``ping``, ``IntegrityError``/``is_duplicate``) y
+las utilidades que usan las migraciones
+(``table_exists``, ``ensure_index``) en su dialecto. ``replica(dirección)``
+da el mismo motor apuntando a una réplica de lectura (DB_REPLICAS).
+"""
+
+DB_BACKENDS = ('mysql', 'sqlite')
+
+
+def create_backend(config):
+    """Crear el motor indicado en DB_BACKEND"""
+    name = config.get('DB_BACKEND', 'mysql')
+    if name == 'mysql':
+        from models.backends.mysql_backend import MySQLBackend
+        return MySQLBackend(config)
+    if name == 'sqlite':
+        from models.backends.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(config)
+    raise ValueError(f"DB_BACKEND no soportado: {name}")
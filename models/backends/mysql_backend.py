@@ -0,0 +1,105 @@
+import mysql.connector
+from mysql.connector import Error, errorcode
+import copy
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _connection_params(config):
+    """Parámetros de conexión a MySQL desde la configuración de Flask"""
+    # Usar configuración de Flask primero, luego variables de entorno, luego defaults
+    # Nota: Usar 'in' para password porque puede ser string vacío (válido para XAMPP)
+    return {
+        'host': config.get('MYSQL_HOST') or os.environ.get('MYSQL_HOST', 'localhost'),
+        'user': config.get('MYSQL_USER') or os.environ.get('MYSQL_USER', 'root'),
+        'password': config.get('MYSQL_PASSWORD') if 'MYSQL_PASSWORD' in config else os.environ.get('MYSQL_PASSWORD', ''),
+        'database': config.get('MYSQL_DATABASE') or os.environ.get('MYSQL_DATABASE', 'contacts_db'),
+        'port': config.get('MYSQL_PORT') or int(os.environ.get('MYSQL_PORT', 3306)),
+    }
+
+
+class MySQLBackend:
+    """Servidor MySQL mediante mysql-connector"""
+
+    name = 'mysql'
+    supports_fulltext = True
+    IntegrityError = mysql.connector.IntegrityError
+    for_update = ' FOR UPDATE'  # Bloqueo de filas leídas dentro de una transacción
+
+    def __init__(self, config):
+        self.params = _connection_params(config)
+        self.database = self.params['database']
+
+    def replica(self, address):
+        """Motor igual a este contra otro servidor ('host' o 'host:puerto')"""
+        host, _, port = address.partition(':')
+        replica = copy.copy(self)
+        replica.params = {**self.params, 'host': host, 'port': int(port) if port else self.params['port']}
+        return replica
+
+    def describe(self):
+        return f"MySQL {self.params['user']}@{self.params['host']}:{self.params['port']}/{self.database}"
+
+    def connect(self):
+        """Abrir una conexión nueva para el pool"""
+        params = self.params
+        try:
+            conn = mysql.connector.connect(autocommit=True, **params)
+            logger.info(f"Conexión a MySQL establecida exitosamente (database: {params['database']})")
+            return conn
+        except Error as e:
+            logger.error(f"Error conectando a MySQL: {e}")
+            # Información útil para debugging
+            logger.info(f"Intentando conectar con: host={params['host']}, user={params['user']}, database={params['database']}")
+
+            # Intentar conexión sin base de datos primero (para crearla)
+            try:
+                temp_db = self.connect_server()
+                logger.info("Conexión exitosa sin base de datos específica")
+                return temp_db
+            except Error as e2:
+                logger.error(f"No se pudo conectar a MySQL: {e2}")
+                raise
+
+    def connect_server(self):
+        """Conexión al servidor sin seleccionar base de datos"""
+        server_params = {k: v for k, v in self.params.items() if k != 'database'}
+        return mysql.connector.connect(autocommit=True, **server_params)
+
+    def create_database(self):
+        """Crear la base de datos si no existe"""
+        try:
+            temp_db = self.connect_server()
+            cursor = temp_db.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            cursor.close()
+            temp_db.close()
+            logger.info(f"Base de datos '{self.database}' creada/verificada")
+        except Error as e:
+            logger.error(f"Error creando base de datos: {e}")
+            raise
+
+    def is_duplicate(self, error):
+        """Indica si un IntegrityError es una clave única duplicada"""
+        return getattr(error, 'errno', None) == errorcode.ER_DUP_ENTRY
+
+    def table_exists(self, cursor, table):
+        cursor.execute('''
+            SELECT COUNT(*) FROM information_schema.tables
+            WHERE table_schema = %s AND table_name = %s
+        ''', (self.database, table))
+        (exists,) = cursor.fetchone()
+        return bool(exists)
+
+    def ensure_index(self, cursor, table, name, columns, kind=''):
+        """Crear un índice si todavía no existe en la tabla (kind: '', 'UNIQUE', 'FULLTEXT')"""
+        cursor.execute('''
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = %s AND table_name = %s AND index_name = %s
+        ''', (self.database, table, name))
+        (exists,) = cursor.fetchone()
+        if not exists:
+            cursor.execute(f"CREATE {kind} INDEX {name} ON {table} {columns}")
+            logger.info(f"Índice '{name}' creado en '{table}'")
@@ -0,0 +1,173 @@
+from datetime import datetime
+from functools import lru_cache
+import copy
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+def _convert_datetime(value):
+    return datetime.fromisoformat(value.decode('ascii'))
+
+
+# Las columnas TIMESTAMP/DATETIME se devuelven como datetime, igual que en MySQL
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('TIMESTAMP', _convert_datetime)
+sqlite3.register_converter('DATETIME', _convert_datetime)
+
+
+@lru_cache(maxsize=512)
+def _translate(statement):
+    """Pasar los marcadores de mysql-connector (%s) a los de sqlite3 (?)"""
+    return statement.replace('%s', '?')
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteCursor:
+    """Cursor de sqlite3 con la interfaz que usan los modelos"""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        if dictionary:
+            cursor.row_factory = _dict_row
+
+    def execute(self, statement, params=()):
+        return self._cursor.execute(_translate(statement), params or ())
+
+    def executemany(self, statement, seq_params):
+        return self._cursor.executemany(_translate(statement), seq_params)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class SQLiteConnection:
+    """Conexión sqlite3 compatible con la API de mysql-connector que usa la
+    aplicación: autocommit, ``start_transaction``, ``ping`` y cursores con
+    ``dictionary=True``"""
+
+    def __init__(self, connection):
+        self._conn = connection
+
+    def cursor(self, dictionary=False, buffered=None, **kwargs):
+        # sqlite3 ya lee las filas bajo demanda: ``buffered`` no aplica
+        return SQLiteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    def start_transaction(self):
+        # IMMEDIATE toma el bloqueo de escritura al empezar y evita que la
+        # transacción falle a mitad al intentar pasar de lectura a escritura
+        self._conn.execute('BEGIN IMMEDIATE')
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        if self._conn.in_transaction:
+            self._conn.execute('COMMIT')
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute('ROLLBACK')
+
+    def ping(self, reconnect=False):
+        self._conn.execute('SELECT 1').fetchone()
+
+    def close(self):
+        try:
+            # Actualizar estadísticas del planificador si hace falta (barato)
+            self._conn.execute('PRAGMA optimize')
+        except sqlite3.Error:
+            pass
+        self._conn.close()
+
+
+class SQLiteBackend:
+    """Base de datos SQLite embebida en el proceso (un solo nodo).
+
+    Usa WAL para que las lecturas no bloqueen a las escrituras y viceversa,
+    ``synchronous=NORMAL`` (seguro con WAL) y caché y mmap configurables.
+    No tiene índice FULLTEXT: la búsqueda usa el índice de trigramas.
+    """
+
+    name = 'sqlite'
+    supports_fulltext = False
+    IntegrityError = sqlite3.IntegrityError
+    for_update = ''  # start_transaction (BEGIN IMMEDIATE) ya bloquea la base de datos entera
+
+    def __init__(self, config):
+        self.path = config.get('SQLITE_PATH') or os.environ.get('SQLITE_PATH', 'contactos.db')
+        if self.path == ':memory:' or 'mode=memory' in self.path:
+            # Cada conexión del pool vería una base de datos distinta
+            raise ValueError("SQLITE_PATH debe ser un archivo (use un tmpfs para pruebas en memoria)")
+        self.busy_timeout = int(config.get('SQLITE_BUSY_TIMEOUT', 5000))
+        self.synchronous = config.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+        self.cache_size = int(config.get('SQLITE_CACHE_SIZE', 20000))
+        self.mmap_size = int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+    def replica(self, address):
+        """Motor igual a este sobre otro archivo (copia de solo lectura para pruebas)"""
+        replica = copy.copy(self)
+        replica.path = address
+        return replica
+
+    def describe(self):
+        return f"SQLite {os.path.abspath(self.path)}"
+
+    def connect_kwargs(self):
+        """Argumentos de sqlite3.connect (también los usa el driver asíncrono)"""
+        return {
+            'timeout': self.busy_timeout / 1000,
+            'detect_types': sqlite3.PARSE_DECLTYPES,
+            'isolation_level': None,     # autocommit, como las conexiones MySQL
+            'check_same_thread': False,  # el pool la entrega a distintos hilos (de uno en uno)
+        }
+
+    def pragmas(self):
+        """Ajustes que se aplican a cada conexión nueva"""
+        return [
+            'PRAGMA journal_mode = WAL',
+            f'PRAGMA synchronous = {self.synchronous}',
+            'PRAGMA foreign_keys = ON',
+            f'PRAGMA busy_timeout = {self.busy_timeout}',
+            f'PRAGMA cache_size = -{self.cache_size}',  # KiB
+            'PRAGMA temp_store = MEMORY',
+            f'PRAGMA mmap_size = {self.mmap_size}',
+        ]
+
+    def connect(self):
+        """Abrir una conexión nueva para el pool"""
+        conn = sqlite3.connect(self.path, **self.connect_kwargs())
+        for pragma in self.pragmas():
+            conn.execute(pragma)
+        return SQLiteConnection(conn)
+
+    def create_database(self):
+        """Crear el directorio del archivo si no existe"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        logger.info(f"Base de datos SQLite en '{self.path}'")
+
+    def is_duplicate(self, error):
+        """Indica si un IntegrityError es una clave única duplicada"""
+        return getattr(error, 'sqlite_errorcode', None) in (
+            sqlite3.SQLITE_CONSTRAINT_UNIQUE, sqlite3.SQLITE_CONSTRAINT_PRIMARYKEY)
+
+    def table_exists(self, cursor, table):
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+        (exists,) = cursor.fetchone()
+        return bool(exists)
+
+    def ensure_index(self, cursor, table, name, columns, kind=''):
+        """Crear un índice si no existe; FULLTEXT no existe en SQLite y se omite"""
+        if kind.upper() == 'FULLTEXT':
+            return
+        cursor.execute(f"CREATE {kind} INDEX IF NOT EXISTS {name} ON {table} {columns}")
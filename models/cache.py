@@ -0,0 +1,325 @@
+from collections import OrderedDict
+from datetime import date, datetime
+from flask import current_app
+import pickle
+import sys
+import threading
+import time
+
+# Valor devuelto por get() cuando la clave no está (None es un valor cacheable)
+MISS = object()
+
+# Forma de los valores cacheados de contactos (filas en tupla y fragmentos
+# HTML). Subirlo al cambiar las columnas o el marcado de los fragmentos:
+# Redis conserva las entradas con la forma anterior
+CONTACTS_FORMAT = 4
+
+
+def _sizeof(value):
+    """Tamaño aproximado en bytes de un valor y su contenido"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(item) for item in value)
+    elif not isinstance(value, (str, bytes, int, float, bool, datetime, date, type(None))):
+        size += sum(_sizeof(v) for v in getattr(value, '__dict__', {}).values())
+        size += sum(_sizeof(getattr(value, slot, None)) for slot in getattr(value, '__slots__', ()))
+    return size
+
+
+class MemoryCache:
+    """Caché LRU en memoria del proceso, con TTL y límite de memoria.
+
+    Sus contadores (las versiones de contactos) también son del proceso: una
+    escritura hecha desde otro proceso no los cambia. ``counter_ttl`` acota
+    cuánto tarda en notarse: al caducar, el contador vuelve a empezar en un
+    valor nuevo y lo cacheado con el anterior deja de usarse.
+    """
+
+    # Operaciones en memoria: no hace falta sacarlas del bucle de eventos (asgi.py)
+    blocking = False
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, default_ttl=300, counter_ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.counter_ttl = counter_ttl
+        self._data = OrderedDict()  # clave -> (valor, expira, tamaño)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, count=True):
+        """Obtener un valor o MISS; ``count=False`` no afecta a los contadores"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += count
+                return MISS
+            value, expires, _ = entry
+            if expires is not None and expires < time.monotonic():
+                self._pop(key)
+                self.expirations += 1
+                self.misses += count
+                return MISS
+            self._data.move_to_end(key)
+            self.hits += count
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else None
+        size = _sizeof(key) + _sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (value, expires, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._pop(oldest)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def incr(self, key, initial):
+        """Incrementar un contador; si no existe (o caducó) empieza en ``initial``.
+        
+        La caducidad cuenta desde que se crea el contador, no desde el último
+        incremento: un proceso que escribe a menudo también acaba viendo las
+        escrituras de los demás.
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._data.get(key)
+            if entry is not None and entry[1] is not None and entry[1] < now:
+                entry = None
+            value = (entry[0] if entry else initial) + 1
+            if entry:
+                expires = entry[1]
+            else:
+                expires = now + self.counter_ttl if self.counter_ttl else None
+            self._pop(key)
+            size = _sizeof(key) + _sizeof(value)
+            self._data[key] = (value, expires, size)
+            self._bytes += size
+            return value
+
+    def get_counter(self, key):
+        """Valor de un contador creado con incr() (sin afectar a los contadores)"""
+        return self.get(key, count=False)
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class RedisCache:
+    """Caché compartida entre procesos y nodos sobre Redis.
+
+    Redis se encarga de la expiración y de la expulsión por memoria
+    (``maxmemory`` con política ``allkeys-lru``).
+    """
+
+    # Cada operación espera la red: el código asíncrono la ejecuta en un hilo
+    blocking = True
+
+    def __init__(self, url, default_ttl=300, prefix='contactos_app:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("El backend de caché 'redis' requiere: pip install redis")
+        self._client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, count=True):
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            self.misses += count
+            return MISS
+        self.hits += count
+        return pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self._client.set(self.prefix + key, pickle.dumps(value), ex=ttl or None)
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def incr(self, key, initial):
+        self._client.set(self.prefix + key, initial, nx=True)
+        return self._client.incr(self.prefix + key)
+
+    def get_counter(self, key):
+        raw = self._client.get(self.prefix + key)
+        return MISS if raw is None else int(raw)
+
+    def clear(self):
+        for key in self._client.scan_iter(self.prefix + '*'):
+            self._client.delete(key)
+
+    def stats(self):
+        info = self._client.info('stats')
+        return {
+            'backend': 'redis',
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': info.get('evicted_keys', 0),
+        }
+
+
+def create_cache(config, prefix='CONTACT_CACHE'):
+    """Crear la caché indicada en la configuración (None si está desactivada)"""
+    backend = config.get(f'{prefix}_BACKEND', 'memory')
+    ttl = config.get(f'{prefix}_TTL', 300)
+    if backend == 'none':
+        return None
+    if backend == 'redis':
+        return RedisCache(config.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'), default_ttl=ttl)
+    return MemoryCache(
+        max_entries=config.get(f'{prefix}_MAX_ENTRIES', 10000),
+        max_bytes=config.get(f'{prefix}_MAX_BYTES', 64 * 1024 * 1024),
+        default_ttl=ttl,
+        counter_ttl=config.get(f'{prefix}_VERSION_TTL'),
+    )
+
+
+def get_contact_cache():
+    """Caché de contactos de la aplicación actual (None si está desactivada)"""
+    extensions = current_app.extensions
+    if 'contact_cache' not in extensions:
+        extensions.setdefault('contact_cache', create_cache(current_app.config))
+    return extensions['contact_cache']
+
+
+def get_fragment_cache():
+    """Caché de fragmentos HTML ya renderizados (None si está desactivada)"""
+    extensions = current_app.extensions
+    if 'fragment_cache' not in extensions:
+        extensions.setdefault('fragment_cache', create_cache(current_app.config, prefix='FRAGMENT_CACHE'))
+    return extensions['fragment_cache']
+
+
+def get_user_cache():
+    """Caché pequeña de usuarios por id (None si está desactivada)"""
+    extensions = current_app.extensions
+    if 'user_cache' not in extensions:
+        extensions.setdefault('user_cache', create_cache(current_app.config, prefix='USER_CACHE'))
+    return extensions['user_cache']
+
+
+def contacts_version(cache, user_id):
+    """Versión actual de los contactos de un usuario.
+
+    Se inicializa con la hora en nanosegundos para que un contador perdido
+    (reinicio o expulsión) nunca vuelva a un valor ya usado.
+    """
+    key = f'contactos:version:{user_id}'
+    version = cache.get_counter(key)
+    if version is MISS:
+        version = cache.incr(key, time.time_ns())
+    return version
+
+
+def current_contacts_version(user_id):
+    """Versión de los contactos del usuario, o None si la caché está desactivada"""
+    cache = get_contact_cache()
+    return contacts_version(cache, user_id) if cache is not None else None
+
+
+def bump_version(cache, user_id):
+    """Pasar a una versión nueva los contactos del usuario en ``cache``; la devuelve"""
+    return cache.incr(f'contactos:version:{user_id}', time.time_ns())
+
+
+def contacts_key(cache, user_id, name):
+    """Clave de caché de un resultado sobre la versión actual de los contactos"""
+    return f'contactos:{user_id}:{contacts_version(cache, user_id)}:f{CONTACTS_FORMAT}:{name}'
+
+
+def bump_contacts_version(user_id):
+    """Invalidar todas las entradas cacheadas de los contactos de un usuario.
+    Devuelve la versión nueva (None si la caché está desactivada)"""
+    cache = get_contact_cache()
+    if cache is not None:
+        return bump_version(cache, user_id)
+    return None
+
+
+def cached_contacts(user_id, name, loader):
+    """Leer a través de la caché un resultado sobre los contactos de un usuario.
+
+    La clave incluye la versión del usuario, así que tras cualquier escritura
+    las entradas antiguas dejan de usarse y acaban expulsadas por LRU/TTL.
+    Con réplicas, tras una escritura reciente (ver database.mark_write) no se
+    lee la caché: otra petición pudo guardar bajo la versión nueva filas de
+    una réplica atrasada. Se lee del primario y se sobrescribe la entrada.
+    """
+    from models.database import reads_after_write
+
+    cache = get_contact_cache()
+    if cache is None:
+        return loader()
+    key = contacts_key(cache, user_id, name)
+    value = MISS if reads_after_write() else cache.get(key)
+    if value is MISS:
+        value = loader()
+        cache.set(key, value)
+    return value
+
+
+def cached_contacts_fragment(user_id, name, render):
+    """Leer a través de la caché de fragmentos un HTML que depende de los
+    contactos de un usuario; devuelve (html, acierto).
+
+    La clave lleva la versión de los contactos (de la caché de contactos), así
+    que Contact.save/delete invalidan también los fragmentos. Las escrituras
+    de otro proceso solo los invalidan al momento si esa caché es compartida
+    (Redis); con 'memory' se notan cuando caduca la versión
+    (CONTACT_CACHE_VERSION_TTL). Sin caché de contactos no hay versión con la
+    que invalidar y se renderiza siempre (acierto None). Tras una escritura
+    reciente con réplicas se renderiza y se guarda, como en cached_contacts.
+    """
+    from models.database import reads_after_write
+
+    versions = get_contact_cache()
+    fragments = get_fragment_cache()
+    if versions is None or fragments is None:
+        return render(), None
+    key = contacts_key(versions, user_id, f'html:{name}')
+    html = MISS if reads_after_write() else fragments.get(key)
+    if html is MISS:
+        html = str(render())
+        fragments.set(key, html)
+        return html, False
+    return html, True
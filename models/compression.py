@@ -0,0 +1,101 @@
+"""
+Compresión al vuelo de las respuestas grandes (HTML, JSON, CSV...).
+
+Solo se comprimen respuestas con el cuerpo en memoria, de un tipo de texto y
+de al menos COMPRESS_MIN_SIZE bytes (por debajo, las cabeceras y la CPU
+cuestan más de lo que se ahorra), si el cliente acepta gzip o br (este con
+``pip install brotli``). Las respuestas en streaming (exportaciones) y los
+archivos servidos con send_file se dejan como están.
+"""
+
+from flask import current_app, request
+from models.assets import brotli_module
+import gzip
+import threading
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/javascript', 'text/vcard',
+    'application/json', 'application/javascript', 'application/x-ndjson', 'image/svg+xml',
+}
+
+# Calidad de brotli al vuelo: las más altas son demasiado lentas por petición
+BROTLI_QUALITY = 5
+
+
+class CompressionStats:
+    """Bytes antes y después de comprimir, para el informe de ahorro"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, original, compressed):
+        with self._lock:
+            self.responses += 1
+            self.bytes_in += original
+            self.bytes_out += compressed
+
+    def stats(self):
+        with self._lock:
+            saved = self.bytes_in - self.bytes_out
+            return {
+                'responses': self.responses,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'bytes_saved': saved,
+                'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            }
+
+
+def get_compression_stats():
+    """Estadísticas de la aplicación actual (None si la compresión está desactivada)"""
+    return current_app.extensions.get('compression')
+
+
+def _choose_encoding(brotli):
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def init_compression(app):
+    """Comprimir en after_request las respuestas que lo merecen"""
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+    level = app.config.get('COMPRESS_LEVEL', 6)
+    brotli = brotli_module()
+    stats = app.extensions.setdefault('compression', CompressionStats())
+
+    @app.after_request
+    def compress_response(response):
+        if (response.mimetype not in COMPRESSIBLE_TYPES or response.direct_passthrough
+                or response.is_streamed or 'Content-Encoding' in response.headers
+                or response.status_code < 200 or response.status_code in (204, 206, 304)):
+            return response
+        # La misma URL puede llegar comprimida o no según el cliente
+        response.vary.add('Accept-Encoding')
+        encoding = _choose_encoding(brotli)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(data, compresslevel=level)
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # Los bytes ya no son los del ETag fuerte: pasa a débil
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        stats.record(len(data), len(compressed))
+        return response
@@ -1,9 +1,79 @@
-from models.database import get_db
+from models.database import get_db, get_read_db, get_pool, mark_write
+from models.metrics import instrument, unwrap
 from models.user import User
+from models import search
+from models.cache import cached_contacts, bump_contacts_version, current_contacts_version
+from collections.abc import Sequence
+from flask import current_app, has_app_context
+import base64
+import json
+import os
 import re
 
+# Prefijo del país de los teléfonos escritos sin él (PHONE_COUNTRY_CODE)
+DEFAULT_PHONE_COUNTRY_CODE = '34'
+
+
+def normalize_email(email):
+    """Email en minúsculas y sin espacios ('' si no hay)"""
+    return (email or '').strip().lower()
+
+
+def phone_country_code():
+    """Prefijo del país por defecto, de la configuración de la aplicación
+    (o del entorno fuera de ella, p. ej. en asgi.py)"""
+    if has_app_context():
+        return current_app.config.get('PHONE_COUNTRY_CODE', DEFAULT_PHONE_COUNTRY_CODE)
+    return os.environ.get('PHONE_COUNTRY_CODE', DEFAULT_PHONE_COUNTRY_CODE)
+
+
+def normalize_phone(phone, country_code=None):
+    """Todos los dígitos del teléfono en forma comparable.
+    
+    Los números internacionales ('+' o '00') del país por defecto pierden el
+    prefijo y los de otros países lo conservan; a los nacionales se les quita
+    el '0' troncal. Así '+34 600-12-34-56', '0034600123456' y '600123456'
+    coinciden, pero '+1 212 555 1234' y '+1 312 555 1234' no.
+    """
+    phone = (phone or '').strip()
+    digits = re.sub(r'\D', '', phone)
+    if phone.startswith('+'):
+        international = digits
+    elif digits.startswith('00'):
+        international = digits[2:]
+    else:
+        international = None
+    if international is not None:
+        country_code = country_code or phone_country_code()
+        if not country_code or not international.startswith(country_code):
+            return international
+        # Del país por defecto: se compara como nacional ('+44 (0)20...' = '020...')
+        digits = international[len(country_code):]
+    return digits[1:] if digits.startswith('0') else digits
+
+
+class ContactConflictError(Exception):
+    """El contacto cambió o se eliminó desde que se leyó su versión"""
+    
+    def __init__(self, current=None):
+        super().__init__("El contacto fue modificado por otra petición")
+        self.current = current  # Contacto tal como está ahora, o None si ya no existe
+
+
 class Contact:
-    def __init__(self, id=None, user_id=None, nombre=None, correo=None, telefono=None, detalle=None, fecha_creacion=None):
+    # Orden de las columnas en _SELECT: una fila en tupla se convierte con Contact(*fila)
+    COLUMNS = ('id', 'user_id', 'nombre', 'correo', 'telefono', 'detalle', 'fecha_creacion',
+               'version', 'fecha_actualizacion')
+    # Campos que edita el usuario (los únicos que puede escribir un UPDATE)
+    EDITABLE = ('nombre', 'correo', 'telefono', 'detalle')
+    # Columnas derivadas que se mantienen al escribir (búsqueda inversa por índice)
+    NORMALIZED = {'telefono': ('telefono_norm', normalize_phone), 'correo': ('correo_norm', normalize_email)}
+    # Sin __dict__ por instancia; _loaded guarda los valores editables leídos
+    __slots__ = COLUMNS + ('_loaded',)
+    _SELECT = f"SELECT {', '.join(COLUMNS)} FROM contactos"
+    
+    def __init__(self, id=None, user_id=None, nombre=None, correo=None, telefono=None, detalle=None,
+                 fecha_creacion=None, version=None, fecha_actualizacion=None):
         self.id = id
         self.user_id = user_id
         self.nombre = nombre
@@ -11,6 +81,31 @@ class Contact:
         self.telefono = telefono
         self.detalle = detalle
         self.fecha_creacion = fecha_creacion
+        self.version = version
+        self.fecha_actualizacion = fecha_actualizacion
+        self._loaded = (nombre, correo, telefono, detalle) if id is not None else None
+    
+    def mark_loaded(self):
+        """Tomar los valores actuales como los guardados (sin cambios pendientes)"""
+        self._loaded = (self.nombre, self.correo, self.telefono, self.detalle)
+    
+    def loaded_values(self):
+        """Valores editables tal como se leyeron (o los actuales si no se leyó)"""
+        if self._loaded is None:
+            return {field: getattr(self, field) for field in self.EDITABLE}
+        return dict(zip(self.EDITABLE, self._loaded))
+    
+    def changed_fields(self):
+        """Campos editables modificados desde que se leyó el contacto.
+        
+        Vacío y None cuentan como el mismo valor (el formulario envía cadenas
+        vacías para los campos opcionales que la API guarda como NULL).
+        """
+        if self._loaded is None:
+            return {field: getattr(self, field) for field in self.EDITABLE}
+        return {field: getattr(self, field)
+                for field, old in zip(self.EDITABLE, self._loaded)
+                if getattr(self, field) != old and (getattr(self, field) or old)}
     
     @staticmethod
     def validate_email(email):
@@ -20,80 +115,562 @@ class Contact:
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         return re.match(pattern, email) is not None
     
-    def validate(self):
-        """Validar datos del contacto"""
+    @staticmethod
+    def validate_fields(values):
+        """Validar los campos editables presentes en ``values``"""
         errors = []
         
-        if not self.nombre or not self.nombre.strip():
+        if 'nombre' in values and not (values['nombre'] or '').strip():
             errors.append("El nombre es obligatorio")
         
-        if self.correo and not self.validate_email(self.correo):
+        if values.get('correo') and not Contact.validate_email(values['correo']):
             errors.append("El email no tiene un formato válido")
         
         return errors
     
+    def validate(self):
+        """Validar datos del contacto"""
+        return self.validate_fields({field: getattr(self, field) for field in self.EDITABLE})
+    
     @staticmethod
     def get_by_id(contact_id, user_id):
         """Obtener contacto por ID (solo si pertenece al usuario)"""
-        db = get_db()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute('''
-            SELECT * FROM contactos 
-            WHERE id = %s AND user_id = %s
-        ''', (contact_id, user_id))
-        contact_data = cursor.fetchone()
-        cursor.close()
+        def load():
+            db = get_read_db()
+            cursor = db.cursor()
+            cursor.execute(f'''
+                {Contact._SELECT}
+                WHERE id = %s AND user_id = %s
+            ''', (contact_id, user_id))
+            row = cursor.fetchone()
+            cursor.close()
+            return row
         
-        if contact_data:
-            return Contact(**contact_data)
+        row = cached_contacts(user_id, f'id:{contact_id}', load)
+        if row:
+            return Contact(*row)
         return None
     
     @staticmethod
     def get_all_by_user(user_id):
-        """Obtener todos los contactos de un usuario"""
-        db = get_db()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute('''
-            SELECT * FROM contactos 
+        """Obtener todos los contactos de un usuario (secuencia perezosa)"""
+        def load():
+            db = get_read_db()
+            cursor = db.cursor()
+            cursor.execute(f'''
+                {Contact._SELECT}
+                WHERE user_id = %s 
+                ORDER BY nombre
+            ''', (user_id,))
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        
+        return ContactRows(cached_contacts(user_id, 'all', load))
+    
+    @staticmethod
+    def iter_by_user(user_id, batch_size=1000):
+        """Recorrer todos los contactos de un usuario sin cargarlos en memoria.
+        
+        Usa una conexión propia del pool y un cursor sin buffer (del lado del
+        servidor) leyendo de ``batch_size`` en ``batch_size`` filas, así que
+        puede consumirse después de terminar la vista (respuestas en streaming).
+        """
+        pool = get_pool()
+        conn = instrument(pool.acquire())
+        exhausted = False
+        try:
+            cursor = conn.cursor(buffered=False)
+            cursor.execute(f'''
+                {Contact._SELECT}
+                WHERE user_id = %s 
+                ORDER BY nombre, id
+            ''', (user_id,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield Contact(*row)
+            exhausted = True
+            cursor.close()
+        finally:
+            # Si se abandona a medias quedan filas sin leer: descartar la conexión
+            pool.release(unwrap(conn), discard=not exhausted)
+    
+    @staticmethod
+    def encode_cursor(nombre, contact_id):
+        """Codificar la posición (nombre, id) como cursor opaco para la URL"""
+        raw = json.dumps([nombre, contact_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def decode_cursor(cursor_value):
+        """Decodificar un cursor; devuelve None si no es válido"""
+        if not cursor_value:
+            return None
+        try:
+            padding = '=' * (-len(cursor_value) % 4)
+            nombre, contact_id = json.loads(base64.urlsafe_b64decode(cursor_value + padding))
+            return str(nombre), int(contact_id)
+        except (ValueError, TypeError):
+            return None
+    
+    @staticmethod
+    def get_page_by_user(user_id, limit=50, after=None, before=None):
+        """Obtener una página de contactos paginando por clave (nombre, id).
+        
+        ``after`` y ``before`` son tuplas (nombre, id) de la última/primera
+        fila de la página anterior. Cada página es un recorrido por rango del
+        índice (user_id, nombre, id), sin OFFSET. Devuelve
+        (contactos, cursor_siguiente, cursor_anterior); los contactos son
+        una secuencia perezosa (ContactRows).
+        """
+        def load():
+            db = get_read_db()
+            cursor = db.cursor()
+            cursor.execute(*Contact._page_query(user_id, limit, after, before))
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        
+        rows = cached_contacts(user_id, f'page:{limit}:{after}:{before}', load)
+        return Contact._page_result(rows, limit, after, before)
+    
+    @staticmethod
+    def _page_query(user_id, limit, after, before):
+        """Sentencia y parámetros de una página por clave (pide una fila de más)"""
+        if before:
+            # Retroceder: leer en orden inverso y dar la vuelta al resultado
+            return f'''
+                {Contact._SELECT}
+                WHERE user_id = %s AND (nombre < %s OR (nombre = %s AND id < %s))
+                ORDER BY nombre DESC, id DESC
+                LIMIT %s
+            ''', (user_id, before[0], before[0], before[1], limit + 1)
+        if after:
+            return f'''
+                {Contact._SELECT}
+                WHERE user_id = %s AND (nombre > %s OR (nombre = %s AND id > %s))
+                ORDER BY nombre, id
+                LIMIT %s
+            ''', (user_id, after[0], after[0], after[1], limit + 1)
+        return f'''
+            {Contact._SELECT}
             WHERE user_id = %s 
-            ORDER BY nombre
-        ''', (user_id,))
-        contacts_data = cursor.fetchall()
+            ORDER BY nombre, id
+            LIMIT %s
+        ''', (user_id, limit + 1)
+    
+    @staticmethod
+    def _page_result(rows, limit, after, before):
+        """Contactos y cursores de la página a partir de las filas leídas"""
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if before:
+            rows.reverse()
+        contacts = ContactRows(rows)
+        
+        if not rows:
+            return contacts, None, None
+        
+        first, last = contacts[0], contacts[-1]
+        if before:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, after is not None
+        next_cursor = Contact.encode_cursor(last.nombre, last.id) if has_next else None
+        prev_cursor = Contact.encode_cursor(first.nombre, first.id) if has_prev else None
+        return contacts, next_cursor, prev_cursor
+    
+    @staticmethod
+    def count_by_user(user_id):
+        """Contar los contactos de un usuario (solo recorre el índice)"""
+        def load():
+            db = get_read_db()
+            cursor = db.cursor()
+            cursor.execute('SELECT COUNT(*) FROM contactos WHERE user_id = %s', (user_id,))
+            (total,) = cursor.fetchone()
+            cursor.close()
+            return total
+        
+        return cached_contacts(user_id, 'count', load)
+    
+    @staticmethod
+    def _fulltext_query(query):
+        """Convertir el texto del usuario en una consulta booleana de FULLTEXT
+        en la que todas las palabras son obligatorias y admiten prefijo.
+        Las palabras de menos de 3 letras no están en el índice y se ignoran."""
+        words = [word for word in re.split(r'\W+', query) if len(word) >= 3]
+        return ' '.join(f'+{word}*' for word in words)
+    
+    @staticmethod
+    def _search_fields(user_id):
+        """Campos indexables de los contactos de un usuario (para el índice en memoria)"""
+        db = get_read_db()
+        cursor = db.cursor()
+        cursor.execute(
+            'SELECT id, nombre, correo, telefono FROM contactos WHERE user_id = %s',
+            (user_id,))
+        rows = cursor.fetchall()
         cursor.close()
+        return rows
+    
+    @staticmethod
+    def _search_version(user_id):
+        """Versión de los contactos con la que se construye el índice en memoria.
         
-        contacts = []
-        for data in contacts_data:
-            contacts.append(Contact(**data))
-        return contacts
+        Es la de la caché de contactos; sin caché, una huella de la tabla
+        (cualquier alta, baja o edición cambia el número de filas, el id
+        máximo o la suma de versiones).
+        """
+        version = current_contacts_version(user_id)
+        if version is not None:
+            return version
+        db = get_read_db()
+        cursor = db.cursor()
+        cursor.execute(
+            'SELECT COUNT(*), MAX(id), SUM(version) FROM contactos WHERE user_id = %s',
+            (user_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        return tuple(row)
+    
+    @staticmethod
+    def _update_search_index(user_id, version, change):
+        """Aplicar una escritura propia al índice en memoria si ya está construido
+        (``version`` es la que devolvió bump_contacts_version)"""
+        if search.use_trigram_index():
+            search.get_trigram_registry().apply(user_id, version, change)
+    
+    @staticmethod
+    def _get_many_by_ids(user_id, contact_ids):
+        """Obtener varios contactos del usuario conservando el orden de los ids"""
+        if not contact_ids:
+            return []
+        db = get_read_db()
+        cursor = db.cursor()
+        placeholders = ', '.join(['%s'] * len(contact_ids))
+        cursor.execute(f'''
+            {Contact._SELECT}
+            WHERE user_id = %s AND id IN ({placeholders})
+        ''', (user_id, *contact_ids))
+        rows = {row[0]: Contact(*row) for row in cursor.fetchall()}
+        cursor.close()
+        return [rows[contact_id] for contact_id in contact_ids if contact_id in rows]
+    
+    @staticmethod
+    def lookup(user_id, field, values, chunk_size=500):
+        """Búsqueda inversa exacta por teléfono o email normalizado.
+        
+        ``field`` es 'telefono' o 'correo'. Cada bloque de ``chunk_size``
+        valores es una sola consulta sobre el índice (user_id, <campo>_norm).
+        Devuelve {valor normalizado: [contactos]} solo con los que existen.
+        """
+        column, normalize = Contact.NORMALIZED[field]
+        keys = sorted({key for key in map(normalize, values) if key})
+        found = {}
+        db = get_read_db()
+        cursor = db.cursor()
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            # La columna normalizada va tras las del contacto y se descarta al convertir
+            cursor.execute(f'''
+                SELECT {', '.join(Contact.COLUMNS)}, {column}
+                FROM contactos
+                WHERE user_id = %s AND {column} IN ({placeholders})
+                ORDER BY nombre, id
+            ''', (user_id, *chunk))
+            for row in cursor.fetchall():
+                found.setdefault(row[-1], []).append(Contact(*row[:-1]))
+        cursor.close()
+        return found
+    
+    @staticmethod
+    def normalized_values(values):
+        """Columnas normalizadas de un diccionario de campos: {columna: valor o None}"""
+        return {column: normalize(values[field]) or None
+                for field, (column, normalize) in Contact.NORMALIZED.items() if field in values}
+    
+    @staticmethod
+    def backfill_normalized(batch_size=1000):
+        """Rellenar las columnas normalizadas de las filas existentes.
+        
+        Recorre la tabla por bloques de id (sin OFFSET) y en cada bloque
+        escribe con un executemany solo las filas cuyo valor difiere, en su
+        propia transacción; se puede interrumpir y relanzar. Genera el
+        número de filas revisadas y actualizadas tras cada bloque.
+        """
+        db = get_db()
+        cursor = db.cursor()
+        last_id = 0
+        try:
+            while True:
+                cursor.execute('''
+                    SELECT id, telefono, correo, telefono_norm, correo_norm
+                    FROM contactos WHERE id > %s ORDER BY id LIMIT %s
+                ''', (last_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                updates = []
+                for contact_id, telefono, correo, telefono_norm, correo_norm in rows:
+                    values = (normalize_phone(telefono) or None, normalize_email(correo) or None)
+                    if values != (telefono_norm, correo_norm):
+                        updates.append((*values, contact_id))
+                if updates:
+                    db.start_transaction()
+                    cursor.executemany(
+                        'UPDATE contactos SET telefono_norm = %s, correo_norm = %s WHERE id = %s', updates)
+                    db.commit()
+                yield len(rows), len(updates)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def search(user_id, query, limit=20, offset=0):
+        """Buscar contactos del usuario por nombre, correo o teléfono.
+        
+        Usa el índice FULLTEXT de MySQL, o el índice de trigramas en memoria
+        si CONTACT_SEARCH_BACKEND es 'trigram' o el motor no tiene FULLTEXT. Devuelve
+        (contactos ordenados por relevancia, hay_más_resultados).
+        """
+        query = (query or '').strip()
+        if not query:
+            return [], False
+        
+        if search.use_trigram_index():
+            version = Contact._search_version(user_id)
+            index = search.get_trigram_registry().get(user_id, Contact._search_fields, version)
+            ids = index.search(query, limit=limit + 1, offset=offset)
+            return Contact._get_many_by_ids(user_id, ids[:limit]), len(ids) > limit
+        
+        db = get_read_db()
+        cursor = db.cursor()
+        boolean_query = Contact._fulltext_query(query)
+        if not boolean_query:
+            # Consultas muy cortas: prefijo del nombre sobre el índice (user_id, nombre, id)
+            cursor.execute(f'''
+                {Contact._SELECT}
+                WHERE user_id = %s AND nombre LIKE %s ESCAPE '!'
+                ORDER BY nombre, id
+                LIMIT %s OFFSET %s
+            ''', (user_id, re.sub(r'([!%_])', r'!\1', query) + '%', limit + 1, offset))
+            rows = cursor.fetchall()
+            cursor.close()
+            return [Contact(*row) for row in rows[:limit]], len(rows) > limit
+        
+        # La relevancia va tras las columnas del contacto y se descarta al convertir
+        cursor.execute(f'''
+            SELECT {', '.join(Contact.COLUMNS)},
+                   MATCH(nombre, correo, telefono) AGAINST (%s IN BOOLEAN MODE) AS relevancia
+            FROM contactos
+            WHERE user_id = %s AND MATCH(nombre, correo, telefono) AGAINST (%s IN BOOLEAN MODE)
+            ORDER BY relevancia DESC, nombre, id
+            LIMIT %s OFFSET %s
+        ''', (boolean_query, user_id, boolean_query, limit + 1, offset))
+        rows = cursor.fetchall()
+        cursor.close()
+        
+        return [Contact(*row[:-1]) for row in rows[:limit]], len(rows) > limit
+    
+    def _update_query(self, changes):
+        """UPDATE de los campos cambiados; si se conoce la versión, solo se
+        aplica si sigue siendo la misma (concurrencia optimista)"""
+        changes = {**changes, **Contact.normalized_values(changes)}
+        assignments = ', '.join(f'{field} = %s' for field in changes)
+        statement = f'''
+            UPDATE contactos
+            SET {assignments}, version = version + 1, fecha_actualizacion = CURRENT_TIMESTAMP
+            WHERE id = %s AND user_id = %s'''
+        params = [*changes.values(), self.id, self.user_id]
+        if self.version is not None:
+            statement += ' AND version = %s'
+            params.append(self.version)
+        return statement, tuple(params)
+    
+    def _updated(self):
+        """Reflejar en el objeto un UPDATE aplicado"""
+        if self.version is not None:
+            self.version += 1
+        self.fecha_actualizacion = None  # La fija la base de datos; se verá al releer
+        self.mark_loaded()
+    
+    _INSERT = '''
+        INSERT INTO contactos (user_id, nombre, correo, telefono, detalle, telefono_norm, correo_norm)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    '''
+    
+    def _insert_params(self, user_id):
+        return (user_id, self.nombre, self.correo, self.telefono, self.detalle,
+                normalize_phone(self.telefono) or None, normalize_email(self.correo) or None)
+    
+    def _insert_query(self):
+        return Contact._INSERT, self._insert_params(self.user_id)
+    
+    def _inserted(self, contact_id):
+        self.id = contact_id
+        self.version = 1
+        self.mark_loaded()
+    
+    def _current_row_query(self):
+        return f'{Contact._SELECT} WHERE id = %s AND user_id = %s', (self.id, self.user_id)
     
     def save(self):
-        """Guardar contacto (crear o actualizar)"""
+        """Guardar contacto (crear o actualizar).
+        
+        Al actualizar solo se escriben los campos cambiados y, si no cambió
+        nada, no se toca la base de datos. Si el contacto tiene versión y
+        otra petición lo modificó (o eliminó) entretanto, lanza
+        ContactConflictError sin escribir nada.
+        """
         errors = self.validate()
         if errors:
             return False, errors
         
-        db = get_db()
-        cursor = db.cursor()
-        
         if self.id:
-            # Actualizar contacto existente
-            cursor.execute('''
-                UPDATE contactos 
-                SET nombre = %s, correo = %s, telefono = %s, detalle = %s
-                WHERE id = %s AND user_id = %s
-            ''', (self.nombre, self.correo, self.telefono, self.detalle, self.id, self.user_id))
+            changes = self.changed_fields()
+            if not changes:
+                return True, None
+            db = get_db()
+            cursor = db.cursor()
+            cursor.execute(*self._update_query(changes))
+            if cursor.rowcount == 0:
+                # Solo en el caso raro de conflicto: leer el estado actual
+                cursor.execute(*self._current_row_query())
+                row = cursor.fetchone()
+                cursor.close()
+                raise ContactConflictError(Contact(*row) if row else None)
+            db.commit()
+            cursor.close()
+            self._updated()
         else:
-            # Crear nuevo contacto
-            cursor.execute('''
-                INSERT INTO contactos (user_id, nombre, correo, telefono, detalle)
-                VALUES (%s, %s, %s, %s, %s)
-            ''', (self.user_id, self.nombre, self.correo, self.telefono, self.detalle))
-            self.id = cursor.lastrowid
+            db = get_db()
+            cursor = db.cursor()
+            cursor.execute(*self._insert_query())
+            self._inserted(cursor.lastrowid)
+            db.commit()
+            cursor.close()
+        mark_write(self.user_id)
+        version = bump_contacts_version(self.user_id)
         
-        db.commit()
-        cursor.close()
+        # Mantener al día el índice en memoria si ya está construido
+        Contact._update_search_index(
+            self.user_id, version, lambda index: index.add(self.id, self.nombre, self.correo, self.telefono))
         return True, None
     
+    @staticmethod
+    def bulk_insert(user_id, contacts):
+        """Insertar varios contactos ya validados con un solo executemany
+        dentro de una transacción. Devuelve el número de filas insertadas."""
+        if not contacts:
+            return 0
+        
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            db.start_transaction()
+            cursor.executemany(Contact._INSERT, [c._insert_params(user_id) for c in contacts])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+        
+        mark_write(user_id)
+        bump_contacts_version(user_id)
+        if search.use_trigram_index():
+            search.get_trigram_registry().discard(user_id)
+        return len(contacts)
+    
+    @staticmethod
+    def _in_chunks(contact_ids, chunk_size):
+        """Ids únicos en bloques, con los marcadores del IN de cada bloque"""
+        ids = sorted({int(contact_id) for contact_id in contact_ids})
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            yield chunk, ', '.join(['%s'] * len(chunk))
+    
+    @staticmethod
+    def delete_many(user_id, contact_ids, chunk_size=500):
+        """Eliminar varios contactos del usuario en una transacción, con un
+        DELETE ... IN por cada bloque de ``chunk_size`` ids. Los ids que no
+        son del usuario se ignoran. Devuelve el número de filas eliminadas."""
+        db = get_db()
+        cursor = db.cursor()
+        affected = 0
+        try:
+            db.start_transaction()
+            for chunk, placeholders in Contact._in_chunks(contact_ids, chunk_size):
+                cursor.execute(f'DELETE FROM contactos WHERE user_id = %s AND id IN ({placeholders})',
+                               (user_id, *chunk))
+                affected += cursor.rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+        
+        if affected:
+            mark_write(user_id)
+            version = bump_contacts_version(user_id)
+            
+            def remove(index):
+                for contact_id in contact_ids:
+                    index.remove(int(contact_id))
+            Contact._update_search_index(user_id, version, remove)
+        return affected
+    
+    @staticmethod
+    def update_many(user_id, contact_ids, values, chunk_size=500):
+        """Dar los mismos valores a varios contactos del usuario en una
+        transacción, con un UPDATE ... IN por bloque (cada fila sube de versión).
+        
+        ``values`` son campos editables ya validados (ver validate_fields).
+        Devuelve el número de filas actualizadas.
+        """
+        unknown = set(values) - set(Contact.EDITABLE)
+        if unknown or not values:
+            raise ValueError(f"Campos no editables: {', '.join(sorted(unknown)) or '(ninguno)'}")
+        changes = {**values, **Contact.normalized_values(values)}
+        assignments = ', '.join(f'{field} = %s' for field in changes)
+        
+        db = get_db()
+        cursor = db.cursor()
+        affected = 0
+        try:
+            db.start_transaction()
+            for chunk, placeholders in Contact._in_chunks(contact_ids, chunk_size):
+                cursor.execute(f'''
+                    UPDATE contactos
+                    SET {assignments}, version = version + 1, fecha_actualizacion = CURRENT_TIMESTAMP
+                    WHERE user_id = %s AND id IN ({placeholders})
+                ''', (*changes.values(), user_id, *chunk))
+                affected += cursor.rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+        
+        if affected:
+            mark_write(user_id)
+            version = bump_contacts_version(user_id)
+            if search.use_trigram_index() and set(values) & {'nombre', 'correo', 'telefono'}:
+                search.get_trigram_registry().discard(user_id)
+            else:
+                # Sin cambios en los campos indexados: el índice solo pasa a la versión nueva
+                Contact._update_search_index(user_id, version, lambda index: None)
+        return affected
+    
     def delete(self):
         """Eliminar contacto"""
         db = get_db()
@@ -103,6 +680,10 @@ class Contact:
         db.commit()
         affected_rows = cursor.rowcount
         cursor.close()
+        if affected_rows:
+            mark_write(self.user_id)
+            version = bump_contacts_version(self.user_id)
+            Contact._update_search_index(self.user_id, version, lambda index: index.remove(self.id))
         return affected_rows > 0
     
     def to_dict(self):
@@ -114,5 +695,34 @@ class Contact:
             'correo': self.correo,
             'telefono': self.telefono,
             'detalle': self.detalle,
-            'fecha_creacion': self.fecha_creacion
-        }
\ No newline at end of file
+            'fecha_creacion': self.fecha_creacion,
+            'version': self.version,
+            'fecha_actualizacion': self.fecha_actualizacion
+        }
+    
+    def __repr__(self):
+        return f'<Contact {self.id} {self.nombre!r}>'
+
+
+class ContactRows(Sequence):
+    """Secuencia de contactos sobre las filas (tuplas) tal como llegan del cursor.
+    
+    Cada Contact se crea al acceder a él, así que recorrer la lista en la
+    plantilla mantiene vivo un solo objeto cada vez y las filas cacheadas se
+    comparten sin copiarlas.
+    """
+    __slots__ = ('_rows',)
+    
+    def __init__(self, rows):
+        self._rows = rows
+    
+    def __len__(self):
+        return len(self._rows)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ContactRows(self._rows[index])
+        return Contact(*self._rows[index])
+    
+    def __iter__(self):
+        return (Contact(*row) for row in self._rows)
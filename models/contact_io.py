@@ -0,0 +1,235 @@
+from models.contact import Contact
+import csv
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Nombres de columna aceptados en los CSV para cada campo del contacto
+CSV_ALIASES = {
+    'nombre': ('nombre', 'name', 'full name', 'nombre completo'),
+    'correo': ('correo', 'email', 'e-mail', 'mail'),
+    'telefono': ('telefono', 'teléfono', 'phone', 'tel', 'movil', 'móvil'),
+    'detalle': ('detalle', 'detalles', 'notes', 'nota', 'notas'),
+}
+
+IMPORT_FORMATS = ('csv', 'vcf')
+
+# Formato de exportación -> (tipo MIME, extensión)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'vcf': ('text/vcard', 'vcf'),
+}
+EXPORT_FIELDS = ('nombre', 'correo', 'telefono', 'detalle', 'fecha_creacion')
+
+
+def iter_csv_records(stream):
+    """Leer un CSV fila a fila; genera (número de línea, campos del contacto)"""
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if not header:
+        return
+    header = [h.strip().lower() for h in header]
+    positions = {}
+    for field, aliases in CSV_ALIASES.items():
+        for i, name in enumerate(header):
+            if name in aliases:
+                positions[field] = i
+                break
+
+    for row in reader:
+        if not any(row):
+            continue
+        yield reader.line_num, {
+            field: row[i].strip() if i < len(row) else ''
+            for field, i in positions.items()
+        }
+
+
+def _unfold_lines(stream):
+    """Unir las líneas plegadas de vCard (las que empiezan por espacio o tab)"""
+    pending, pending_line = None, 0
+    for line_number, line in enumerate(stream, 1):
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending_line, pending
+        pending, pending_line = line, line_number
+    if pending is not None:
+        yield pending_line, pending
+
+
+def _vcard_unescape(value):
+    return (value.replace('\\n', '\n').replace('\\N', '\n')
+            .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def iter_vcard_records(stream):
+    """Leer un archivo vCard tarjeta a tarjeta; genera (línea de BEGIN, campos)"""
+    record, start = None, 0
+    for line_number, line in _unfold_lines(stream):
+        if ':' not in line:
+            continue
+        name, value = line.split(':', 1)
+        prop = name.split(';', 1)[0].split('.')[-1].upper()
+
+        if prop == 'BEGIN' and value.strip().upper() == 'VCARD':
+            record, start = {}, line_number
+        elif prop == 'END' and record is not None:
+            yield start, record
+            record = None
+        elif record is not None:
+            value = _vcard_unescape(value.strip())
+            if prop == 'FN':
+                record['nombre'] = value
+            elif prop == 'N' and 'nombre' not in record:
+                # N:Apellidos;Nombre;...
+                parts = [p for p in value.split(';')[:2] if p]
+                record['nombre'] = ' '.join(reversed(parts))
+            elif prop == 'EMAIL' and 'correo' not in record:
+                record['correo'] = value
+            elif prop == 'TEL' and 'telefono' not in record:
+                record['telefono'] = value
+            elif prop == 'NOTE':
+                record['detalle'] = value
+
+
+def iter_records(stream, fmt):
+    """Lector de registros según el formato ('csv' o 'vcf')"""
+    if fmt == 'csv':
+        return iter_csv_records(stream)
+    if fmt == 'vcf':
+        return iter_vcard_records(stream)
+    raise ValueError(f"Formato de importación no soportado: {fmt}")
+
+
+def iter_chunks(records, chunk_size):
+    """Agrupar registros en bloques de ``chunk_size`` sin cargar el resto"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_chunk(user_id, chunk):
+    """Validar un bloque; devuelve (contactos válidos, [(línea, errores)])"""
+    valid, errors = [], []
+    for line_number, fields in chunk:
+        contact = Contact(
+            user_id=user_id,
+            nombre=fields.get('nombre', ''),
+            correo=fields.get('correo', ''),
+            telefono=fields.get('telefono', ''),
+            detalle=fields.get('detalle', ''),
+        )
+        contact_errors = contact.validate()
+        if contact_errors:
+            errors.append((line_number, contact_errors))
+        else:
+            valid.append(contact)
+    return valid, errors
+
+
+def import_contacts(user_id, stream, fmt, chunk_size=1000, max_errors=1000):
+    """Importar contactos desde un archivo de texto en streaming.
+
+    Cada bloque de ``chunk_size`` filas se valida y se inserta con un único
+    ``executemany`` dentro de su propia transacción, así que la memoria no
+    depende del tamaño del archivo. Se guardan como mucho ``max_errors``
+    errores por fila. Devuelve un diccionario con el resumen.
+    """
+    report = {'total': 0, 'imported': 0, 'failed': 0, 'errors': []}
+
+    try:
+        for chunk in iter_chunks(iter_records(stream, fmt), chunk_size):
+            report['total'] += len(chunk)
+            valid, errors = validate_chunk(user_id, chunk)
+            report['failed'] += len(errors)
+
+            if valid:
+                try:
+                    report['imported'] += Contact.bulk_insert(user_id, valid)
+                except Exception as e:
+                    logger.error(f"Error insertando bloque de contactos: {e}")
+                    report['failed'] += len(valid)
+                    errors.append((chunk[0][0], [f"No se pudo guardar el bloque que empieza en esta línea: {e}"]))
+
+            room = max_errors - len(report['errors'])
+            report['errors'].extend(errors[:max(room, 0)])
+    except (csv.Error, UnicodeDecodeError) as e:
+        report['errors'].append((None, [f"Archivo no válido: {e}"]))
+
+    return report
+
+
+def _batched(contacts, rows_per_chunk):
+    """Agrupar contactos para emitir bloques de texto en lugar de línea a línea"""
+    batch = []
+    for contact in contacts:
+        batch.append(contact.to_dict())
+        if len(batch) >= rows_per_chunk:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _export_csv(contacts, rows_per_chunk):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in _batched(contacts, rows_per_chunk):
+        for data in batch:
+            writer.writerow([data[field] if data[field] is not None else '' for field in EXPORT_FIELDS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _export_jsonl(contacts, rows_per_chunk):
+    for batch in _batched(contacts, rows_per_chunk):
+        yield ''.join(json.dumps(data, ensure_ascii=False, default=str) + '\n' for data in batch)
+
+
+def _vcard_escape(value):
+    return (str(value).replace('\\', '\\\\').replace('\n', '\\n')
+            .replace(',', '\\,').replace(';', '\\;'))
+
+
+def _export_vcard(contacts, rows_per_chunk):
+    for batch in _batched(contacts, rows_per_chunk):
+        cards = []
+        for data in batch:
+            lines = ['BEGIN:VCARD', 'VERSION:3.0', f"FN:{_vcard_escape(data['nombre'])}"]
+            if data['correo']:
+                lines.append(f"EMAIL:{_vcard_escape(data['correo'])}")
+            if data['telefono']:
+                lines.append(f"TEL:{_vcard_escape(data['telefono'])}")
+            if data['detalle']:
+                lines.append(f"NOTE:{_vcard_escape(data['detalle'])}")
+            lines.append('END:VCARD')
+            cards.append('\r\n'.join(lines) + '\r\n')
+        yield ''.join(cards)
+
+
+def export_contacts(user_id, fmt, batch_size=1000):
+    """Generador con el texto exportado de todos los contactos del usuario.
+
+    Lee con un cursor del servidor en bloques de ``batch_size`` filas y emite
+    un trozo de texto por bloque: la memoria es constante y el primer byte
+    sale en cuanto llega el primer bloque.
+    """
+    writers = {'csv': _export_csv, 'jsonl': _export_jsonl, 'vcf': _export_vcard}
+    if fmt not in writers:
+        raise ValueError(f"Formato de exportación no soportado: {fmt}")
+    return writers[fmt](Contact.iter_by_user(user_id, batch_size=batch_size), batch_size)
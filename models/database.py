@@ -1,125 +1,228 @@
-import mysql.connector
-from mysql.connector import Error
-from flask import g, current_app
+from flask import g, current_app, session, has_request_context
+from models.backends import create_backend
+from models.cache import MISS, get_contact_cache
+from models.pool import ConnectionPool, ReplicaSet
+from models.metrics import instrument, unwrap
 import logging
-import os
+import math
+import threading
+import time
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_pool_lock = threading.Lock()
+
+# Clave (de sesión y, con el id del usuario, de la caché de contactos) con el
+# instante de la última escritura, para leer lo escrito
+WRITE_MARKER = '_db_write'
+
+def get_backend(app=None):
+    """Motor de almacenamiento de la aplicación (DB_BACKEND: 'mysql' o 'sqlite')"""
+    app = app or current_app._get_current_object()
+    backend = app.extensions.get('db_backend')
+    if backend is None:
+        backend = app.extensions.setdefault('db_backend', create_backend(app.config))
+    return backend
+
+def _create_pool(app, factory):
+    return ConnectionPool(
+        factory,
+        size=app.config.get('DB_POOL_SIZE', 5),
+        max_overflow=app.config.get('DB_POOL_MAX_OVERFLOW', 10),
+        timeout=app.config.get('DB_POOL_TIMEOUT', 30),
+        recycle=app.config.get('DB_POOL_RECYCLE', 3600),
+        pre_ping=app.config.get('DB_POOL_PRE_PING', True),
+    )
+
+def get_pool(app=None):
+    """Obtener (o crear) el pool de conexiones de la aplicación"""
+    app = app or current_app._get_current_object()
+    pool = app.extensions.get('db_pool')
+    if pool is None:
+        with _pool_lock:
+            pool = app.extensions.get('db_pool')
+            if pool is None:
+                # DB_CONNECTION_FACTORY permite usar una base de datos local de pruebas
+                factory = app.config.get('DB_CONNECTION_FACTORY') or get_backend(app).connect
+                pool = _create_pool(app, factory)
+                app.extensions['db_pool'] = pool
+    return pool
+
+def _replica_addresses(config):
+    replicas = config.get('DB_REPLICAS') or []
+    if isinstance(replicas, str):
+        replicas = replicas.split(',')
+    return [address.strip() for address in replicas if address.strip()]
+
+def get_replicas(app=None):
+    """Réplicas de lectura de la aplicación, o None si no hay (DB_REPLICAS vacío)"""
+    app = app or current_app._get_current_object()
+    if 'db_replicas' not in app.extensions:
+        with _pool_lock:
+            if 'db_replicas' not in app.extensions:
+                # DB_REPLICA_CONNECTION_FACTORIES: bases de datos locales en lugar de las réplicas
+                factories = app.config.get('DB_REPLICA_CONNECTION_FACTORIES')
+                if factories:
+                    names = [f'replica-{i}' for i in range(len(factories))]
+                else:
+                    names = _replica_addresses(app.config)
+                    factories = [get_backend(app).replica(address).connect for address in names]
+                app.extensions['db_replicas'] = ReplicaSet(
+                    names, [_create_pool(app, factory) for factory in factories],
+                    retry_after=app.config.get('DB_REPLICA_RETRY_AFTER', 30),
+                    acquire_timeout=app.config.get('DB_REPLICA_ACQUIRE_TIMEOUT', 0),
+                ) if factories else None
+    return app.extensions['db_replicas']
+
+def reset_pool(app, close=False):
+    """Olvidar el pool de la aplicación; se creará otro en el primer uso.
+    
+    Tras un fork el hijo no debe usar ni cerrar las conexiones heredadas (el
+    socket es el mismo que el del padre): se descartan las referencias y el
+    hijo abre las suyas. En el propio proceso (``close=True``) se cierran.
+    """
+    with _pool_lock:
+        pool = app.extensions.pop('db_pool', None)
+        replicas = app.extensions.pop('db_replicas', None)
+    if close:
+        for pool in (pool, replicas):
+            if pool is not None:
+                pool.dispose()
+
 def get_db():
     """Obtener conexión a la base de datos"""
     if 'db' not in g:
-        try:
-            # Usar configuración de Flask primero, luego variables de entorno, luego defaults
-            # Nota: Usar 'in' para password porque puede ser string vacío (válido para XAMPP)
-            host = current_app.config.get('MYSQL_HOST') or os.environ.get('MYSQL_HOST', 'localhost')
-            user = current_app.config.get('MYSQL_USER') or os.environ.get('MYSQL_USER', 'root')
-            password = current_app.config.get('MYSQL_PASSWORD') if 'MYSQL_PASSWORD' in current_app.config else os.environ.get('MYSQL_PASSWORD', '')
-            database = current_app.config.get('MYSQL_DATABASE') or os.environ.get('MYSQL_DATABASE', 'contacts_db')
-            port = current_app.config.get('MYSQL_PORT') or int(os.environ.get('MYSQL_PORT', 3306))
-        
-            
-            g.db = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                database=database,
-                port=port,
-                autocommit=True
-            )
-            logger.info(f"Conexión a MySQL establecida exitosamente (database: {database})")
-        except Error as e:
-            logger.error(f"Error conectando a MySQL: {e}")
-            # Información útil para debugging
-            logger.info(f"Intentando conectar con: host={host}, user={user}, database={database}")
-            
-            # Intentar conexión sin base de datos primero (para crearla)
-            try:
-                temp_db = mysql.connector.connect(
-                    host=host,
-                    user=user,
-                    password=password,
-                    port=port
-                )
-                logger.info("Conexión exitosa sin base de datos específica")
-                g.db = temp_db
-            except Error as e2:
-                logger.error(f"No se pudo conectar a MySQL: {e2}")
-                raise
+        # Se toma del pool en el primer uso y se devuelve en close_db
+        g.db = instrument(get_pool().acquire())
     return g.db
 
+def _current_user_id():
+    """Usuario de la petición: el del token de la API o el de la sesión"""
+    if not has_request_context():
+        return None
+    return g.get('api_user_id') or session.get('user_id')
+
+def mark_write(user_id=None):
+    """Anotar que se ha escrito en el primario (los datos de ``user_id``, por
+    defecto el usuario de la petición).
+    
+    El resto de la petición lee del primario. Con réplicas, también las
+    peticiones de ese usuario durante DB_READ_YOUR_WRITES_WINDOW segundos,
+    así que ve siempre lo que acaba de escribir aunque las réplicas vayan con
+    retraso. La marca se guarda en la caché de contactos (entre workers y
+    nodos con Redis; la ven también los clientes de la API, que no tienen
+    sesión) y, en el navegador, en la sesión. Las respuestas de la API no
+    llevan cookie.
+    """
+    g._db_wrote = True
+    if get_replicas() is None:
+        return
+    now = time.time()
+    user_id = user_id if user_id is not None else _current_user_id()
+    cache = get_contact_cache()
+    if user_id is not None and cache is not None:
+        window = current_app.config.get('DB_READ_YOUR_WRITES_WINDOW', 5)
+        cache.set(f'{WRITE_MARKER}:{user_id}', now, ttl=math.ceil(window))
+    if has_request_context() and 'user_id' in session:
+        session[WRITE_MARKER] = now
+
+def _recent_write():
+    """El usuario de la petición escribió hace menos de DB_READ_YOUR_WRITES_WINDOW"""
+    window = current_app.config.get('DB_READ_YOUR_WRITES_WINDOW', 5)
+    user_id = _current_user_id()
+    cache = get_contact_cache()
+    if user_id is not None and cache is not None:
+        written = cache.get(f'{WRITE_MARKER}:{user_id}', count=False)
+        if written is not MISS and time.time() - written < window:
+            return True
+    written = session.get(WRITE_MARKER)
+    if written is None:
+        return False
+    if time.time() - written < window:
+        return True
+    session.pop(WRITE_MARKER, None)
+    return False
+
+def _reads_from_primary():
+    if g.get('_db_wrote'):
+        return True
+    if not has_request_context():
+        return False
+    # Una sola consulta de la marca por petición
+    if '_db_recent_write' not in g:
+        g._db_recent_write = _recent_write()
+    return g._db_recent_write
+
+def reads_after_write():
+    """Indica si hay réplicas y esta petición lee del primario por una
+    escritura reciente: entonces lo cacheado puede venir de una réplica
+    atrasada y las cachés de contactos leen del primario (ver cached_contacts)"""
+    return get_replicas() is not None and _reads_from_primary()
+
+def get_read_db():
+    """Conexión para lecturas: una réplica (round-robin entre las sanas) si
+    las hay y el usuario no ha escrito hace poco; si no, la del primario"""
+    if get_replicas() is None:
+        return get_db()
+    # Tras escribir, incluso en la misma petición, se lee del primario
+    if _reads_from_primary():
+        return get_db()
+    if 'read_db' in g:
+        return g.read_db
+    index, conn = get_replicas().acquire()
+    if conn is None:
+        # Ninguna réplica disponible: el primario también sirve lecturas
+        return get_db()
+    g._read_replica = index
+    g.read_db = instrument(conn)
+    return g.read_db
+
 def close_db(e=None):
-    """Cerrar conexión a la base de datos"""
+    """Devolver las conexiones a sus pools al terminar el contexto de la aplicación"""
     db = g.pop('db', None)
     if db is not None:
-        db.close()
-        logger.info("Conexión a MySQL cerrada")
+        get_pool().release(unwrap(db))
+    read_db = g.pop('read_db', None)
+    if read_db is not None:
+        get_replicas().release(g.pop('_read_replica'), unwrap(read_db))
+
+def pool_stats():
+    """Estadísticas del pool de la aplicación actual"""
+    return get_pool().stats()
+
+def replica_stats():
+    """Estado de las réplicas de lectura ([] si no hay)"""
+    replicas = get_replicas()
+    return replicas.stats() if replicas is not None else []
 
 def init_db(app):
-    """Inicializar la base de datos"""
-    with app.app_context():
-        # Obtener nombre de la base de datos de la configuración
-        database = app.config.get('MYSQL_DATABASE') or os.environ.get('MYSQL_DATABASE', 'contacts_db')
-        
-        # Conectar sin especificar base de datos primero
-        host = app.config.get('MYSQL_HOST') or os.environ.get('MYSQL_HOST', 'localhost')
-        user = app.config.get('MYSQL_USER') or os.environ.get('MYSQL_USER', 'root')
-        password = app.config.get('MYSQL_PASSWORD') if 'MYSQL_PASSWORD' in app.config else os.environ.get('MYSQL_PASSWORD', '')
-        port = app.config.get('MYSQL_PORT') or int(os.environ.get('MYSQL_PORT', 3306))
-        
-        # Crear base de datos si no existe
-        try:
-            temp_db = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password,
-                port=port
-            )
-            cursor = temp_db.cursor()
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
-            temp_db.commit()
-            cursor.close()
-            temp_db.close()
-            logger.info(f"Base de datos '{database}' creada/verificada")
-        except Error as e:
-            logger.error(f"Error creando base de datos: {e}")
-            raise
-        
-        # Ahora obtener la conexión con la base de datos
-        db = get_db()
-        cursor = db.cursor()
-        
-        # Seleccionar la base de datos
-        cursor.execute(f"USE {database}")
-        
-        # Crear tabla de usuarios si no existe
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS usuarios (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                nombre VARCHAR(100) NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
-                password_hash VARCHAR(255) NOT NULL,
-                fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Crear tabla de contactos si no existe
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS contactos (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL,
-                nombre VARCHAR(100) NOT NULL,
-                correo VARCHAR(100),
-                telefono VARCHAR(20),
-                detalle TEXT,
-                fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES usuarios(id) ON DELETE CASCADE,
-                INDEX idx_user_id (user_id)
-            )
-        ''')
+    """Inicializar la base de datos.
+    
+    No crea tablas: el esquema se crea y actualiza con ``flask db upgrade``.
+    Al arrancar solo se comprueba que la versión del esquema es la esperada;
+    si no lo es, la aplicación responde 503 hasta que se migre (los comandos
+    CLI, incluido ``db upgrade``, siguen funcionando). Devuelve la versión o
+    None si el esquema está desactualizado.
+    """
+    from models.schema import check_schema, SchemaVersionError
+    
+    # Devolver siempre la conexión al pool al terminar cada petición
+    app.teardown_appcontext(close_db)
+    
+    try:
+        version = check_schema(app)
+    except SchemaVersionError as e:
+        logger.error(str(e))
+        message = str(e)
+        # Para lo que corre antes de los before_request (p. ej. abrir la sesión SQL)
+        app.extensions['schema_outdated'] = message
         
-        db.commit()
-        cursor.close()
-        logger.info("Tablas creadas/existentes verificadas")
\ No newline at end of file
+        @app.before_request
+        def schema_outdated():
+            return message, 503
+        return None
+    
+    logger.info(f"Esquema de la base de datos en la versión {version}")
+    return version
@@ -0,0 +1,274 @@
+"""
+Detección y fusión de contactos duplicados.
+
+Comparar todos los contactos de un usuario entre sí es O(n²). En su lugar,
+en una sola pasada en streaming se calculan para cada contacto unas claves
+de bloqueo (email normalizado, dígitos del teléfono y clave fonética del
+nombre) y solo se puntúan los pares que comparten alguna clave. Los pares
+por encima del umbral se agrupan (unión-búsqueda) en grupos de duplicados.
+La puntuación combina la similitud del nombre con la coincidencia exacta o
+aproximada (una errata, otro dominio) del email y del teléfono.
+"""
+
+from difflib import SequenceMatcher
+from models.contact import Contact, normalize_email, normalize_phone, phone_country_code
+from models.database import get_db, get_backend, mark_write
+from models.cache import cached_contacts, bump_contacts_version
+from models.search import normalize_text
+from models import search
+from flask import current_app
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Pesos de la puntuación de un par (se recorta a 1). Con el umbral por defecto
+# (DEDUPE_THRESHOLD = 0.65) el nombre solo no basta, pero el nombre idéntico y
+# un email o teléfono casi iguales (una errata, otro dominio) sí
+NAME_WEIGHT = 0.5
+EMAIL_WEIGHT = 0.3
+PHONE_WEIGHT = 0.3
+# Email o teléfono casi iguales: puntúan menos que la coincidencia exacta
+NEAR_EMAIL_WEIGHT = 0.2
+NEAR_PHONE_WEIGHT = 0.2
+
+DEFAULT_THRESHOLD = 0.65
+
+# Reglas fonéticas para el español, en orden
+_PHONETIC_RULES = [
+    (re.compile(r'qu'), 'k'),
+    (re.compile(r'c(?=[ei])'), 's'),
+    (re.compile(r'g(?=[ei])'), 'j'),
+    (re.compile(r'gu(?=[ei])'), 'g'),
+    (re.compile(r'll'), 'y'),
+    (re.compile(r'ch'), 'x'),
+    (re.compile(r'c'), 'k'),
+    (re.compile(r'z'), 's'),
+    (re.compile(r'[vw]'), 'b'),
+    (re.compile(r'h'), ''),
+    (re.compile(r'y$'), 'i'),
+    (re.compile(r'(.)\1+'), r'\1'),
+]
+
+
+def phonetic(word):
+    """Código fonético aproximado de una palabra (sin acentos, en minúsculas)"""
+    for pattern, replacement in _PHONETIC_RULES:
+        word = pattern.sub(replacement, word)
+    # Las vocales (salvo la inicial) son lo que más varía entre escrituras
+    return word[:1] + re.sub(r'[aeiou]', '', word[1:])
+
+
+def name_key(nombre):
+    """Clave fonética de las dos primeras palabras del nombre, sin orden
+    ('Pérez, Juan' y 'Juan Peres García' comparten clave)"""
+    words = [w for w in re.findall(r'[a-zñ]+', normalize_text(nombre)) if len(w) > 1]
+    return ' '.join(sorted(phonetic(w) for w in words[:2]))
+
+
+def _comparable_name(nombre):
+    return ' '.join(sorted(normalize_text(nombre).split()))
+
+
+def one_edit_apart(a, b):
+    """Las cadenas difieren en una sola edición: sustituir, añadir o quitar
+    un carácter, o intercambiar dos contiguos"""
+    if a == b or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i, (x, y) in enumerate(zip(a, b)) if x != y]
+        return len(diff) == 1 or (len(diff) == 2 and diff[1] == diff[0] + 1
+                                  and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]])
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+def near_email(a, b):
+    """Emails casi iguales: una errata o el mismo usuario en otro dominio"""
+    return one_edit_apart(a, b) or a.partition('@')[0] == b.partition('@')[0]
+
+
+def score(a, b):
+    """Puntuación entre 0 y 1 de que dos registros (nombre, email, teléfono)
+    normalizados sean la misma persona. Las coincidencias aproximadas no se
+    suman entre sí: cuenta como mucho una"""
+    value = NAME_WEIGHT * SequenceMatcher(None, a[0], b[0]).ratio()
+    near = 0
+    for x, y, weight, near_weight, is_near in ((a[1], b[1], EMAIL_WEIGHT, NEAR_EMAIL_WEIGHT, near_email),
+                                               (a[2], b[2], PHONE_WEIGHT, NEAR_PHONE_WEIGHT, one_edit_apart)):
+        if not x or not y:
+            continue
+        if x == y:
+            value += weight
+        elif is_near(x, y):
+            near = max(near, near_weight)
+    return min(value + near, 1.0)
+
+
+def blocking_keys(record):
+    """Claves de bloqueo de un registro normalizado"""
+    name, email, phone, key = record
+    keys = []
+    if email:
+        keys.append(('e', email))
+    if phone:
+        keys.append(('t', phone))
+    if key:
+        keys.append(('n', key))
+    return keys
+
+
+class _DisjointSet:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        parent = self.parent.setdefault(item, item)
+        if parent != item:
+            parent = self.parent[item] = self.find(parent)
+        return parent
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def find_duplicate_groups(contacts, threshold=DEFAULT_THRESHOLD, max_block=50, stats=None):
+    """Agrupar duplicados de un iterable de contactos (se recorre una vez).
+
+    Los bloques con más de ``max_block`` contactos (p. ej. un teléfono de
+    relleno compartido por cientos) no se comparan por pares. Devuelve una
+    lista de grupos, cada uno una lista ordenada de ids con al menos dos.
+    """
+    records = {}
+    blocks = {}
+    country_code = phone_country_code()
+    for contact in contacts:
+        record = (_comparable_name(contact.nombre), normalize_email(contact.correo),
+                  normalize_phone(contact.telefono, country_code), name_key(contact.nombre))
+        records[contact.id] = record[:3]
+        for key in blocking_keys(record):
+            blocks.setdefault(key, []).append(contact.id)
+
+    groups = _DisjointSet()
+    compared = set()
+    skipped = 0
+    for key, ids in blocks.items():
+        if len(ids) < 2:
+            continue
+        if len(ids) > max_block:
+            skipped += 1
+            continue
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                if (a, b) in compared:
+                    continue
+                compared.add((a, b))
+                if score(records[a], records[b]) >= threshold:
+                    groups.union(a, b)
+
+    if skipped:
+        logger.info(f"Deduplicación: {skipped} bloques de más de {max_block} contactos omitidos")
+    if stats is not None:
+        stats.update(contacts=len(records), blocks=len(blocks), compared=len(compared),
+                     skipped_blocks=skipped)
+
+    members = {}
+    for contact_id in groups.parent:
+        members.setdefault(groups.find(contact_id), []).append(contact_id)
+    return sorted((sorted(ids) for ids in members.values() if len(ids) > 1),
+                  key=lambda ids: (-len(ids), ids[0]))
+
+
+def find_duplicates(user_id):
+    """Grupos de ids duplicados de un usuario (cacheados hasta el siguiente cambio)"""
+    config = current_app.config
+
+    def load():
+        return find_duplicate_groups(
+            Contact.iter_by_user(user_id),
+            threshold=config.get('DEDUPE_THRESHOLD', DEFAULT_THRESHOLD),
+            max_block=config.get('DEDUPE_MAX_BLOCK', 50))
+
+    return cached_contacts(user_id, 'duplicados', load)
+
+
+def merge_values(keep, others):
+    """Campos del contacto fusionado: los del que se conserva, completando los
+    vacíos con los de los demás; los detalles distintos se concatenan"""
+    merged = {field: getattr(keep, field) for field in Contact.EDITABLE}
+    for other in others:
+        for field in ('correo', 'telefono'):
+            if not merged[field] and getattr(other, field):
+                merged[field] = getattr(other, field)
+    details = []
+    for contact in (keep, *others):
+        detail = (contact.detalle or '').strip()
+        if detail and detail not in details:
+            details.append(detail)
+    merged['detalle'] = '\n'.join(details)
+    return merged
+
+
+def merge_contacts(user_id, keep_id, merge_ids):
+    """Fusionar ``merge_ids`` en ``keep_id`` en una sola transacción.
+
+    Bloquea las filas, actualiza el contacto conservado (nueva versión) y
+    elimina el resto. Solo afecta a contactos del usuario. Devuelve el
+    contacto resultante o None si ``keep_id`` no existe.
+    """
+    merge_ids = sorted({int(i) for i in merge_ids} - {int(keep_id)})
+    ids = [int(keep_id), *merge_ids]
+    backend = get_backend()
+    db = get_db()
+    cursor = db.cursor()
+    try:
+        db.start_transaction()
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(f'''
+            {Contact._SELECT}
+            WHERE user_id = %s AND id IN ({placeholders}){backend.for_update}
+        ''', (user_id, *ids))
+        rows = {row[0]: Contact(*row) for row in cursor.fetchall()}
+        keep = rows.get(int(keep_id))
+        if keep is None:
+            db.rollback()
+            return None
+        others = [rows[i] for i in merge_ids if i in rows]
+        if others:
+            merged = merge_values(keep, others)
+            for field, value in merged.items():
+                setattr(keep, field, value)
+            changes = keep.changed_fields()
+            if changes:
+                cursor.execute(*keep._update_query(changes))
+                keep._updated()
+            placeholders = ', '.join(['%s'] * len(others))
+            cursor.execute(f'DELETE FROM contactos WHERE user_id = %s AND id IN ({placeholders})',
+                           (user_id, *(other.id for other in others)))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    if others:
+        mark_write(user_id)
+        bump_contacts_version(user_id)
+        if search.use_trigram_index():
+            search.get_trigram_registry().discard(user_id)
+    return keep
+
+
+def load_groups(user_id, groups):
+    """Contactos de cada grupo de ids (los ya eliminados se omiten)"""
+    ids = [contact_id for group in groups for contact_id in group]
+    contacts = {contact.id: contact for contact in Contact._get_many_by_ids(user_id, ids)}
+    loaded = ([contacts[i] for i in group if i in contacts] for group in groups)
+    return [group for group in loaded if len(group) > 1]
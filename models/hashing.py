@@ -0,0 +1,140 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app
+import logging
+import multiprocessing
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class HasherBusyError(Exception):
+    """La cola de hashing está llena o la operación tardó demasiado"""
+
+
+class PasswordHasher:
+    """Hashing de contraseñas en un pool de procesos con cola acotada.
+
+    PBKDF2/scrypt son intensivos en CPU: ejecutarlos en procesos aparte
+    evita que una ráfaga de logins bloquee los hilos que sirven páginas.
+    Con ``workers=0`` se ejecuta en el propio hilo (desarrollo/pruebas).
+    """
+
+    def __init__(self, method='scrypt:32768:8:1', workers=1, max_pending=64, timeout=10):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._prefix = None
+
+    def _get_executor(self):
+        # El pool se crea en cada proceso (p. ej. tras el fork de gunicorn). Sus
+        # procesos no salen de un fork del worker, que tiene hilos y conexiones
+        # abiertas, sino de un servidor de forks limpio (o de un intérprete nuevo)
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context(method))
+                self._pid = os.getpid()
+            return self._executor
+
+    def _submit(self, fn, *args, wait=False):
+        """Encolar una operación ocupando un hueco de la cola; con ``wait``
+        espera hasta ``timeout`` segundos a que quede uno libre"""
+        acquired = (self._slots.acquire(timeout=self.timeout) if wait
+                    else self._slots.acquire(blocking=False))
+        if not acquired:
+            raise HasherBusyError("Demasiadas operaciones de contraseña en cola")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # El hueco se libera cuando la tarea termina de verdad: cancel() no
+        # detiene una que ya se está ejecutando y seguiría ocupando un proceso
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HasherBusyError("La operación de contraseña tardó demasiado")
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        return self._result(self._submit(fn, *args))
+
+    def hash(self, password):
+        """Generar el hash con el método y coste configurados"""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Verificar una contraseña contra su hash"""
+        return self._run(check_password_hash, password_hash, password)
+
+    def map_hash(self, passwords):
+        """Generar varios hashes en paralelo (aprovisionamiento masivo).
+
+        Cada hash pasa por la cola como los de hash()/verify(), con el mismo
+        ``timeout``, y nunca hay más de dos por proceso del pool en curso: el
+        resto de huecos queda para los logins. HasherBusyError si no queda
+        hueco en ``timeout`` segundos o un hash tarda más.
+        """
+        if not self.workers:
+            return [generate_password_hash(p, self.method) for p in passwords]
+        in_flight = deque()
+        hashes = []
+        try:
+            for password in passwords:
+                if len(in_flight) >= self.workers * 2:
+                    hashes.append(self._result(in_flight.popleft()))
+                in_flight.append(self._submit(generate_password_hash, password, self.method, wait=True))
+            while in_flight:
+                hashes.append(self._result(in_flight.popleft()))
+        finally:
+            for future in in_flight:
+                future.cancel()
+        return hashes
+
+    def _method_prefix(self):
+        """Prefijo completo de los hashes que genera el método configurado.
+        
+        Werkzeug completa los parámetros que faltan ('scrypt' se guarda como
+        'scrypt:32768:8:1'), así que se obtiene una vez con un hash de prueba.
+        """
+        if self._prefix is None:
+            self._prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return self._prefix
+
+    def needs_rehash(self, password_hash):
+        """Indica si el hash se generó con otro método o coste"""
+        return password_hash.split('$', 1)[0] != self._method_prefix()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def get_hasher():
+    """Hasher de contraseñas de la aplicación actual"""
+    extensions = current_app.extensions
+    if 'password_hasher' not in extensions:
+        config = current_app.config
+        extensions.setdefault('password_hasher', PasswordHasher(
+            method=config.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1'),
+            workers=config.get('HASH_WORKERS', 1),
+            max_pending=config.get('HASH_MAX_PENDING', 64),
+            timeout=config.get('HASH_TIMEOUT', 10),
+        ))
+    return extensions['password_hasher']
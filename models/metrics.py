@@ -0,0 +1,231 @@
+from flask import g, request, has_request_context, current_app
+import bisect
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histograma acumulado al estilo Prometheus"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Métricas de peticiones y SQL agregadas por endpoint"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.requests = {}      # (endpoint, método) -> Histogram
+        self.responses = {}     # (endpoint, método, status) -> total
+        self.sql = {}           # endpoint -> [consultas, segundos]
+        self.slow_queries = 0
+
+    def observe_request(self, endpoint, method, status, duration, queries, sql_time):
+        with self._lock:
+            histogram = self.requests.get((endpoint, method))
+            if histogram is None:
+                histogram = self.requests[(endpoint, method)] = Histogram(self.buckets)
+            histogram.observe(duration)
+            key = (endpoint, method, status)
+            self.responses[key] = self.responses.get(key, 0) + 1
+            totals = self.sql.setdefault(endpoint, [0, 0.0])
+            totals[0] += queries
+            totals[1] += sql_time
+
+    def render(self, gauges=()):
+        """Exposición en formato de texto de Prometheus"""
+        lines = []
+        with self._lock:
+            lines += ['# HELP http_request_duration_seconds Latencia de las peticiones por endpoint',
+                      '# TYPE http_request_duration_seconds histogram']
+            for (endpoint, method), histogram in sorted(self.requests.items()):
+                labels = f'endpoint="{endpoint}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {histogram.count}')
+
+            lines += ['# HELP http_responses_total Respuestas por endpoint y código',
+                      '# TYPE http_responses_total counter']
+            for (endpoint, method, status), total in sorted(self.responses.items()):
+                lines.append(f'http_responses_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {total}')
+
+            lines += ['# HELP db_queries_total Sentencias SQL ejecutadas por endpoint',
+                      '# TYPE db_queries_total counter']
+            lines += [f'db_queries_total{{endpoint="{e}"}} {q}' for e, (q, _) in sorted(self.sql.items())]
+            lines += ['# HELP db_query_seconds_total Tiempo total en SQL por endpoint',
+                      '# TYPE db_query_seconds_total counter']
+            lines += [f'db_query_seconds_total{{endpoint="{e}"}} {t:.6f}' for e, (_, t) in sorted(self.sql.items())]
+            lines += ['# HELP db_slow_queries_total Sentencias por encima del umbral de lentitud',
+                      '# TYPE db_slow_queries_total counter',
+                      f'db_slow_queries_total {self.slow_queries}']
+
+        for name, help_text, values in gauges:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+            for labels, value in values:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _compact_sql(statement):
+    return re.sub(r'\s+', ' ', statement).strip()
+
+
+def _record_query(statement, params, duration):
+    """Acumular la sentencia en la petición actual y registrar las lentas"""
+    if has_request_context():
+        g._sql_queries = g.get('_sql_queries', 0) + 1
+        g._sql_time = g.get('_sql_time', 0.0) + duration
+
+    threshold = current_app.config.get('SLOW_QUERY_THRESHOLD', 0.2)
+    if duration >= threshold:
+        registry = get_registry()
+        with registry._lock:
+            registry.slow_queries += 1
+        # Los parámetros pueden llevar datos personales: solo se registra cuántos hay
+        count = len(params) if params else 0
+        logger.warning(f"Consulta lenta ({duration * 1000:.1f} ms): {_compact_sql(statement)} "
+                       f"[{count} parámetros redactados]")
+
+
+class InstrumentedCursor:
+    """Cursor que mide cada execute/executemany"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, statement, params=()):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(statement, params)
+        finally:
+            _record_query(statement, params, time.perf_counter() - start)
+
+    def executemany(self, statement, seq_params):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(statement, seq_params)
+        finally:
+            _record_query(statement, None, time.perf_counter() - start)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Conexión cuyos cursores miden las sentencias ejecutadas"""
+
+    def __init__(self, connection):
+        self.raw = connection
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self.raw.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+def instrument(connection):
+    """Envolver la conexión si las métricas están activadas"""
+    if current_app.config.get('METRICS_ENABLED', True):
+        return InstrumentedConnection(connection)
+    return connection
+
+
+def unwrap(connection):
+    """Conexión original (para devolverla al pool)"""
+    return connection.raw if isinstance(connection, InstrumentedConnection) else connection
+
+
+def get_registry():
+    """Registro de métricas de la aplicación actual"""
+    extensions = current_app.extensions
+    if 'metrics' not in extensions:
+        extensions.setdefault('metrics', MetricsRegistry())
+    return extensions['metrics']
+
+
+def _collect_gauges():
+    """Estado del pool de conexiones, de las cachés y de la compresión como gauges"""
+    from models.database import pool_stats, replica_stats
+    from models.cache import get_contact_cache, get_user_cache, get_fragment_cache
+
+    gauges = []
+    pool = pool_stats()
+    for key in ('open', 'in_use', 'idle'):
+        gauges.append((f'db_pool_{key}', f'Conexiones del pool ({key})', [({}, pool[key])]))
+    for key in ('checkouts', 'waits', 'wait_time', 'timeouts', 'recycled'):
+        gauges.append((f'db_pool_{key}', f'Acumulado del pool ({key})', [({}, pool[key])]))
+    replicas = replica_stats()
+    for key in ('healthy', 'reads', 'failures', 'in_use'):
+        gauges.append((f'db_replica_{key}', f'Réplicas de lectura ({key})',
+                       [({'replica': replica['name']}, int(replica[key])) for replica in replicas]))
+
+    caches = {'contactos': get_contact_cache(), 'usuarios': get_user_cache(),
+              'fragmentos': get_fragment_cache()}
+    for key in ('hits', 'misses', 'evictions'):
+        values = [({'cache': name}, cache.stats().get(key, 0))
+                  for name, cache in caches.items() if cache is not None]
+        gauges.append((f'cache_{key}', f'Caché: {key}', values))
+
+    from models.compression import get_compression_stats
+    compression = get_compression_stats()
+    if compression is not None:
+        stats = compression.stats()
+        for key in ('responses', 'bytes_in', 'bytes_out'):
+            gauges.append((f'compression_{key}', f'Compresión de respuestas ({key})', [({}, stats[key])]))
+    return gauges
+
+
+def init_metrics(app):
+    """Medir cada petición: histograma por endpoint, SQL y cabecera Server-Timing"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_timer():
+        g._request_start = time.perf_counter()
+        g._sql_queries = 0
+        g._sql_time = 0.0
+
+    @app.after_request
+    def record_request(response):
+        start = g.get('_request_start')
+        if start is None:
+            return response
+        duration = time.perf_counter() - start
+        queries, sql_time = g.get('_sql_queries', 0), g.get('_sql_time', 0.0)
+
+        get_registry().observe_request(request.endpoint or 'desconocido', request.method,
+                                       response.status_code, duration, queries, sql_time)
+        response.headers.add('Server-Timing', f'app;dur={duration * 1000:.1f}')
+        response.headers.add('Server-Timing', f'db;dur={sql_time * 1000:.1f};desc="{queries} consultas"')
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        body = get_registry().render(_collect_gauges())
+        return body, 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
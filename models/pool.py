@@ -0,0 +1,261 @@
+import threading
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """No hay conexiones libres en el pool dentro del tiempo de espera"""
+
+
+class ConnectionPool:
+    """Pool de conexiones reutilizables.
+
+    El pool no depende de MySQL: recibe una función ``factory`` que crea
+    conexiones nuevas, de modo que puede probarse con cualquier base de datos
+    local que exponga ``close()`` y ``cursor()`` (por ejemplo ``sqlite3``).
+    """
+
+    def __init__(self, factory, size=5, max_overflow=10, timeout=30,
+                 recycle=3600, pre_ping=True):
+        self._factory = factory
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = deque()
+        # Instante de creación de cada conexión, para reciclarlas
+        self._created_at = {}
+        self._cond = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+
+        # Estadísticas para monitoreo
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+
+    def _create(self):
+        conn = self._factory()
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error cerrando conexión descartada: {e}")
+
+    def _is_alive(self, conn):
+        """Comprobar que la conexión sigue viva antes de entregarla"""
+        try:
+            if hasattr(conn, 'ping'):
+                conn.ping(reconnect=False)
+            else:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1')
+                cursor.fetchall()
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _is_stale(self, conn):
+        if not self.recycle:
+            return False
+        created = self._created_at.get(id(conn), 0)
+        return time.monotonic() - created > self.recycle
+
+    def acquire(self, timeout=None):
+        """Obtener una conexión del pool (bloquea hasta ``timeout`` segundos,
+        por defecto los del pool; 0 = no esperar)"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._open < self.size + self.max_overflow:
+                    # Reservar el hueco antes de conectar fuera del lock
+                    self._open += 1
+                    self._in_use += 1
+                    conn = None
+                    break
+
+                waited = True
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._waits += 1
+                    self._wait_time += time.monotonic() - start
+                    raise PoolTimeoutError(
+                        f"No hay conexiones disponibles tras {timeout}s "
+                        f"({self._in_use} en uso)")
+                self._cond.wait(remaining)
+
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._wait_time += time.monotonic() - start
+
+        try:
+            if conn is not None and (self._is_stale(conn) or
+                                     (self.pre_ping and not self._is_alive(conn))):
+                self._discard(conn)
+                with self._cond:
+                    self._recycled += 1
+                conn = None
+            if conn is None:
+                conn = self._create()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return conn
+
+    def release(self, conn, discard=False):
+        """Devolver una conexión al pool"""
+        if not discard:
+            try:
+                # Descartar cualquier transacción que haya quedado abierta
+                if getattr(conn, 'in_transaction', True):
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or len(self._idle) >= self.size:
+                # Las conexiones de desbordamiento no se conservan
+                self._open -= 1
+                close = True
+            else:
+                self._idle.append(conn)
+                close = False
+            self._cond.notify()
+
+        if close:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager que garantiza la devolución de la conexión"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def dispose(self):
+        """Cerrar todas las conexiones libres (p. ej. tras un fork)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Estadísticas del pool para monitoreo"""
+        with self._cond:
+            return {
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'open': self._open,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time': round(self._wait_time, 6),
+                'timeouts': self._timeouts,
+                'recycled': self._recycled,
+            }
+
+
+class ReplicaSet:
+    """Pools de las réplicas de lectura con reparto round-robin.
+
+    Una réplica que falla al entregar conexión (no conecta o no responde al
+    ping) se aparta durante ``retry_after`` segundos y la petición prueba con
+    la siguiente. Una réplica sana pero con el pool agotado no se aparta: se
+    espera como mucho ``acquire_timeout`` segundos (0 = nada) y se pasa a la
+    siguiente; si todas están ocupadas, la lectura va al primario. Como
+    ConnectionPool, no depende del motor: cada réplica es un pool sobre su
+    propia ``factory``.
+    """
+
+    def __init__(self, names, pools, retry_after=30, acquire_timeout=0):
+        self.names = list(names)
+        self.pools = list(pools)
+        self.retry_after = retry_after
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until = [0.0] * len(self.pools)
+        self._failures = [0] * len(self.pools)
+        self._busy = [0] * len(self.pools)
+        self._reads = [0] * len(self.pools)
+
+    def acquire(self):
+        """Conexión de la siguiente réplica sana y libre: (índice, conexión),
+        o (None, None) si ninguna está disponible"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.pools)
+        now = time.monotonic()
+        for offset in range(len(self.pools)):
+            index = (start + offset) % len(self.pools)
+            if self._down_until[index] > now:
+                continue
+            try:
+                conn = self.pools[index].acquire(timeout=self.acquire_timeout)
+            except PoolTimeoutError:
+                # Ocupada, no caída: sigue en el reparto
+                with self._lock:
+                    self._busy[index] += 1
+                continue
+            except Exception as e:
+                with self._lock:
+                    self._down_until[index] = time.monotonic() + self.retry_after
+                    self._failures[index] += 1
+                logger.warning(f"Réplica '{self.names[index]}' apartada {self.retry_after}s: {e}")
+                continue
+            with self._lock:
+                self._reads[index] += 1
+            return index, conn
+        return None, None
+
+    def release(self, index, conn, discard=False):
+        self.pools[index].release(conn, discard=discard)
+
+    def dispose(self):
+        for pool in self.pools:
+            pool.dispose()
+
+    def stats(self):
+        """Estado de cada réplica para monitoreo"""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                'name': name,
+                'healthy': self._down_until[index] <= now,
+                'reads': self._reads[index],
+                'failures': self._failures[index],
+                'busy': self._busy[index],
+                **pool.stats(),
+            } for index, (name, pool) in enumerate(zip(self.names, self.pools))]
@@ -0,0 +1,83 @@
+from collections import OrderedDict, deque
+from flask import current_app
+import threading
+import time
+
+
+class SlidingWindowLimiter:
+    """Limitador de intentos por clave en una ventana deslizante (en memoria).
+
+    Guarda como mucho ``max_keys`` claves; las menos recientes se olvidan.
+    """
+
+    def __init__(self, max_attempts, window, max_keys=100000):
+        self.max_attempts = max_attempts
+        self.window = window
+        self.max_keys = max_keys
+        self._hits = OrderedDict()  # clave -> deque de instantes
+        self._lock = threading.Lock()
+        self.blocked = 0
+
+    def _recent(self, key, now):
+        hits = self._hits.get(key)
+        if hits is None:
+            return None
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+            return None
+        return hits
+
+    def is_blocked(self, key):
+        """Indica si la clave ha agotado sus intentos en la ventana"""
+        with self._lock:
+            hits = self._recent(key, time.monotonic())
+            blocked = hits is not None and len(hits) >= self.max_attempts
+            self.blocked += blocked
+            return blocked
+
+    def hit(self, key):
+        """Registrar un intento fallido"""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._recent(key, now)
+            if hits is None:
+                hits = self._hits[key] = deque(maxlen=self.max_attempts)
+            hits.append(now)
+            self._hits.move_to_end(key)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+
+def get_login_limiters():
+    """Limitadores de intentos de login (por IP y por email) de la aplicación"""
+    extensions = current_app.extensions
+    if 'login_limiters' not in extensions:
+        config = current_app.config
+        window = config.get('LOGIN_THROTTLE_WINDOW', 300)
+        extensions.setdefault('login_limiters', (
+            SlidingWindowLimiter(config.get('LOGIN_MAX_ATTEMPTS_PER_IP', 20), window),
+            SlidingWindowLimiter(config.get('LOGIN_MAX_ATTEMPTS_PER_EMAIL', 5), window),
+        ))
+    return extensions['login_limiters']
+
+
+def login_allowed(ip, email):
+    """Comprobar antes de verificar la contraseña (y gastar CPU en ello)"""
+    by_ip, by_email = get_login_limiters()
+    return not by_ip.is_blocked(ip) and not by_email.is_blocked(email.lower())
+
+
+def record_login(ip, email, success):
+    """Registrar el resultado de un intento de login"""
+    by_ip, by_email = get_login_limiters()
+    if success:
+        by_email.reset(email.lower())
+    else:
+        by_ip.hit(ip)
+        by_email.hit(email.lower())
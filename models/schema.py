@@ -0,0 +1,136 @@
+"""
+Migraciones versionadas del esquema.
+
+Cada archivo de ``migrations/`` se llama ``NNNN_descripcion.py`` y define
+``upgrade(cursor, backend)``. Las versiones aplicadas se guardan en la tabla
+``schema_version``. Las migraciones se ejecutan fuera del arranque con
+``flask --app app db upgrade``; al arrancar solo se comprueba la versión.
+"""
+
+from models.database import get_backend
+import importlib.util
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+_MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+class SchemaVersionError(RuntimeError):
+    """El esquema de la base de datos no coincide con el que espera el código"""
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Migraciones disponibles ordenadas: [(versión, nombre, ruta)]"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise SchemaVersionError(f"Hay migraciones con el mismo número en {directory}")
+    return migrations
+
+
+def latest_version(directory=MIGRATIONS_DIR):
+    """Versión de la última migración disponible (0 si no hay ninguna)"""
+    migrations = discover_migrations(directory)
+    return migrations[-1][0] if migrations else 0
+
+
+def _load_migration(version, name, path):
+    spec = importlib.util.spec_from_file_location(f'migrations.m{version:04d}_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def current_version(cursor, backend):
+    """Versión aplicada en la base de datos (0 si nunca se migró)"""
+    if not backend.table_exists(cursor, 'schema_version'):
+        return 0
+    cursor.execute('SELECT MAX(version) FROM schema_version')
+    (version,) = cursor.fetchone()
+    return version or 0
+
+
+def applied_migrations(cursor, backend):
+    """Migraciones aplicadas: [(versión, nombre, fecha)]"""
+    if not backend.table_exists(cursor, 'schema_version'):
+        return []
+    cursor.execute('SELECT version, nombre, aplicada FROM schema_version ORDER BY version')
+    return cursor.fetchall()
+
+
+def upgrade(app, target=None, directory=MIGRATIONS_DIR):
+    """Aplicar en orden las migraciones pendientes hasta ``target`` (o todas).
+
+    Usa una conexión propia, fuera del pool. Cada migración se registra en
+    ``schema_version`` en cuanto termina, así que si una falla las anteriores
+    quedan aplicadas y se puede volver a ejecutar tras corregirla.
+    Devuelve la lista de versiones aplicadas.
+    """
+    backend = get_backend(app)
+    backend.create_database()
+
+    conn = backend.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                nombre VARCHAR(255) NOT NULL,
+                aplicada TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        version = current_version(cursor, backend)
+
+        applied = []
+        for number, name, path in discover_migrations(directory):
+            if number <= version or (target is not None and number > target):
+                continue
+            logger.info(f"Aplicando migración {number:04d}_{name}")
+            _load_migration(number, name, path).upgrade(cursor, backend)
+            cursor.execute('INSERT INTO schema_version (version, nombre) VALUES (%s, %s)', (number, name))
+            conn.commit()
+            applied.append(number)
+        return applied
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def check_schema(app, directory=MIGRATIONS_DIR):
+    """Comprobación barata al arrancar: una consulta a ``schema_version``.
+
+    Si DB_AUTO_MIGRATE está activado aplica las migraciones pendientes (útil
+    en desarrollo y benchmarks); si no, lanza SchemaVersionError.
+    Devuelve la versión del esquema.
+    """
+    backend = get_backend(app)
+    expected = latest_version(directory)
+
+    conn = backend.connect()
+    cursor = conn.cursor()
+    try:
+        version = current_version(cursor, backend)
+    finally:
+        cursor.close()
+        conn.close()
+
+    if version < expected:
+        if app.config.get('DB_AUTO_MIGRATE', False):
+            upgrade(app, directory=directory)
+            return expected
+        raise SchemaVersionError(
+            f"El esquema está en la versión {version} y el código espera la {expected}: "
+            f"ejecute 'flask --app app db upgrade'")
+    if version > expected:
+        logger.warning(f"El esquema ({version}) es más nuevo que el código ({expected})")
+    return version
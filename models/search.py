@@ -0,0 +1,170 @@
+from collections import Counter, OrderedDict
+from flask import current_app
+import threading
+import unicodedata
+
+
+def normalize_text(text):
+    """Pasar a minúsculas y quitar acentos para comparar texto"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def trigrams(text):
+    """Trigramas de cada palabra, con relleno para que las consultas cortas
+    coincidan con el inicio de las palabras"""
+    grams = set()
+    for word in normalize_text(text).split():
+        padded = f'  {word} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class TrigramIndex:
+    """Índice invertido de trigramas en memoria para los contactos de un usuario.
+
+    Se usa como alternativa al índice FULLTEXT de MySQL cuando la base de
+    datos no lo ofrece (por ejemplo con el motor SQLite).
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._docs = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, *fields):
+        """Indexar (o reindexar) un documento"""
+        grams = set()
+        for field in fields:
+            grams |= trigrams(field)
+        with self._lock:
+            self._remove(doc_id)
+            self._docs[doc_id] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id):
+        """Quitar un documento del índice"""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        for gram in self._docs.pop(doc_id, ()):
+            docs = self._postings.get(gram)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del self._postings[gram]
+
+    def search(self, query, limit=20, offset=0, min_similarity=0.6):
+        """Buscar documentos; devuelve los ids ordenados por relevancia.
+
+        La relevancia es la fracción de trigramas de la consulta presentes en
+        el documento; se descartan los que no llegan a ``min_similarity``.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            # Recorrer primero las listas más cortas
+            postings = sorted((self._postings.get(g, ()) for g in query_grams), key=len)
+            counts = Counter()
+            for docs in postings:
+                counts.update(docs)
+
+        needed = min_similarity * len(query_grams)
+        matches = [(n, doc_id) for doc_id, n in counts.items() if n >= needed]
+        matches.sort(key=lambda m: (-m[0], m[1]))
+        return [doc_id for _, doc_id in matches[offset:offset + limit]]
+
+
+class TrigramIndexRegistry:
+    """Índices de trigramas por usuario, construidos bajo demanda y
+    limitados a los ``max_users`` usados más recientemente.
+
+    Cada índice guarda la versión de los contactos con la que se construyó:
+    si otro proceso (otro worker, la aplicación asíncrona o un comando CLI)
+    escribe, la versión cambia y el índice se reconstruye en la siguiente
+    búsqueda en lugar de servir resultados antiguos.
+    """
+
+    def __init__(self, max_users=100):
+        self.max_users = max_users
+        self._indexes = OrderedDict()  # user_id -> (versión, índice)
+        self._lock = threading.Lock()
+
+    def get(self, user_id, loader, version=None):
+        """Obtener el índice del usuario, construyéndolo con ``loader`` si
+        falta o se construyó con otra versión (leer la versión antes que las filas)"""
+        with self._lock:
+            entry = self._indexes.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._indexes.move_to_end(user_id)
+                return entry[1]
+
+        index = TrigramIndex()
+        for doc_id, *fields in loader(user_id):
+            index.add(doc_id, *fields)
+
+        with self._lock:
+            self._indexes[user_id] = (version, index)
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+    def apply(self, user_id, version, change):
+        """Aplicar en el sitio una escritura propia al índice ya construido.
+
+        ``version`` es la que dejó la escritura: solo se aplica si sigue a la
+        del índice (nadie más escribió entretanto); si no, o si no hay versión
+        numérica, el índice se descarta y se reconstruirá al buscar.
+        """
+        with self._lock:
+            entry = self._indexes.get(user_id)
+        if entry is None:
+            return
+        built, index = entry
+        if not isinstance(version, int) or not isinstance(built, int) or version != built + 1:
+            self.discard(user_id)
+            return
+        change(index)
+        with self._lock:
+            if self._indexes.get(user_id) is entry:
+                self._indexes[user_id] = (version, index)
+
+    def discard(self, user_id):
+        """Olvidar el índice del usuario; se reconstruirá en la próxima búsqueda"""
+        with self._lock:
+            self._indexes.pop(user_id, None)
+
+    def peek(self, user_id):
+        """Índice del usuario solo si ya está construido"""
+        with self._lock:
+            entry = self._indexes.get(user_id)
+            return entry[1] if entry is not None else None
+
+
+def use_trigram_index():
+    """Indica si la búsqueda debe usar el índice en memoria (por configuración
+    o porque el motor de base de datos no tiene FULLTEXT)"""
+    from models.database import get_backend
+    return (current_app.config.get('CONTACT_SEARCH_BACKEND', 'fulltext') == 'trigram'
+            or not get_backend().supports_fulltext)
+
+
+def get_trigram_registry():
+    """Registro de índices de trigramas de la aplicación actual"""
+    registry = current_app.extensions.get('trigram_index')
+    if registry is None:
+        registry = current_app.extensions.setdefault(
+            'trigram_index',
+            TrigramIndexRegistry(current_app.config.get('SEARCH_INDEX_MAX_USERS', 100)))
+    return registry
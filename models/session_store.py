@@ -0,0 +1,252 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import Signer, BadSignature
+from werkzeug.datastructures import CallbackDict
+from models.database import get_db
+import logging
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_naive(value=None):
+    """Fecha UTC sin zona horaria, como se guarda en la columna DATETIME"""
+    value = value or datetime.now(timezone.utc)
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+SESSION_BACKENDS = ('cookie', 'memory', 'sql', 'filesystem')
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Sesión cuyo contenido vive en el servidor; la cookie solo lleva el id"""
+
+    def __init__(self, initial=None, sid=None, new=False, expires=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires = expires  # timestamp de caducidad en el almacén
+        self.modified = False
+
+
+class MemorySessionStore:
+    """Sesiones en memoria del proceso con expulsión LRU y barrido de caducadas"""
+
+    def __init__(self, max_entries=10000, sweep_interval=60):
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._data = OrderedDict()  # sid -> (datos serializados, expira)
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+        self.evictions = 0
+        self.expired = 0
+
+    def load(self, sid):
+        """Devuelve (datos, timestamp de caducidad) o None"""
+        now = time.time()
+        with self._lock:
+            self._maybe_sweep(now)
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[1] < now:
+                del self._data[sid]
+                self.expired += 1
+                return None
+            self._data.move_to_end(sid)
+            return entry
+
+    def save(self, sid, data, expires):
+        with self._lock:
+            self._data[sid] = (data, expires.timestamp())
+            self._data.move_to_end(sid)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def _maybe_sweep(self, now):
+        if time.monotonic() < self._next_sweep:
+            return
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        expired = [sid for sid, (_, expires) in self._data.items() if expires < now]
+        for sid in expired:
+            del self._data[sid]
+        self.expired += len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'sessions': len(self._data),
+                    'evictions': self.evictions, 'expired': self.expired}
+
+
+class SqlSessionStore:
+    """Sesiones en la tabla ``sesiones``, compartidas entre nodos"""
+
+    def __init__(self, sweep_interval=300, sweep_batch=1000):
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        self._maybe_sweep()
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute('SELECT datos, expira FROM sesiones WHERE id = %s AND expira > %s',
+                       (sid, _utc_naive()))
+        row = cursor.fetchone()
+        cursor.close()
+        if row is None:
+            return None
+        data, expires = row
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return data, expires.replace(tzinfo=timezone.utc).timestamp()
+
+    def save(self, sid, data, expires):
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute('''
+            REPLACE INTO sesiones (id, datos, expira)
+            VALUES (%s, %s, %s)
+        ''', (sid, data, _utc_naive(expires)))
+        db.commit()
+        cursor.close()
+
+    def delete(self, sid):
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute('DELETE FROM sesiones WHERE id = %s', (sid,))
+        db.commit()
+        cursor.close()
+
+    def _maybe_sweep(self):
+        with self._lock:
+            if time.monotonic() < self._next_sweep:
+                return
+            self._next_sweep = time.monotonic() + self.sweep_interval
+        # Seleccionar y borrar por id: DELETE ... LIMIT no existe en todos los motores
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute('SELECT id FROM sesiones WHERE expira < %s LIMIT %s',
+                       (_utc_naive(), self.sweep_batch))
+        expired = [row[0] for row in cursor.fetchall()]
+        if expired:
+            placeholders = ', '.join(['%s'] * len(expired))
+            cursor.execute(f'DELETE FROM sesiones WHERE id IN ({placeholders})', expired)
+            db.commit()
+        cursor.close()
+
+    def stats(self):
+        return {'backend': 'sql'}
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Interfaz de sesión que guarda los datos en un ``store`` (memoria o SQL).
+
+    La cookie contiene solo el id de sesión firmado con SECRET_KEY. Los datos
+    se serializan en JSON (sin pickle) y solo se escriben si cambiaron.
+    """
+
+    serializer = TaggedJSONSerializer()
+    session_class = ServerSideSession
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session')
+
+    def _expiration(self, app, session):
+        expires = self.get_expiration_time(app, session)
+        if expires is None:
+            # Sesiones no permanentes: caducan en el servidor igualmente
+            expires = datetime.now(timezone.utc) + app.permanent_session_lifetime
+        return expires
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        # Con el esquema sin migrar la petición terminará en 503 (init_db) y la
+        # tabla ``sesiones`` puede no existir: sesión nueva sin leer el almacén
+        if cookie and not app.extensions.get('schema_outdated'):
+            try:
+                sid = self._signer(app).unsign(cookie).decode('ascii')
+            except BadSignature:
+                sid = None
+            if sid:
+                entry = self.store.load(sid)
+                if entry is not None:
+                    raw, expires = entry
+                    try:
+                        return self.session_class(self.serializer.loads(raw), sid=sid, expires=expires)
+                    except ValueError:
+                        logger.warning("Sesión corrupta descartada")
+        return self.session_class(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        # Renovar la caducidad cuando ha pasado la mitad de su vida, para no
+        # escribir en el almacén en cada petición
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        stale = session.expires is not None and session.expires - time.time() < lifetime / 2
+        if session.modified or stale:
+            self.store.save(session.sid, self.serializer.dumps(dict(session)),
+                            self._expiration(app, session))
+        if session.new or session.modified or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid).decode('ascii'),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+        response.vary.add('Cookie')
+
+
+def init_session(app):
+    """Configurar el almacenamiento de sesiones según SESSION_BACKEND.
+
+    - 'cookie': sesión firmada en la cookie, sin estado en el servidor
+    - 'memory': en memoria del proceso (un solo nodo), con LRU y caducidad
+    - 'sql': tabla ``sesiones`` de la base de datos, compartida entre nodos
+    - 'filesystem': Flask-Session en disco (comportamiento anterior)
+    """
+    backend = app.config.get('SESSION_BACKEND', 'cookie')
+    if backend not in SESSION_BACKENDS:
+        raise ValueError(f"SESSION_BACKEND no soportado: {backend}")
+
+    if backend == 'memory':
+        app.session_interface = ServerSideSessionInterface(MemorySessionStore(
+            max_entries=app.config.get('SESSION_MAX_ENTRIES', 10000),
+            sweep_interval=app.config.get('SESSION_SWEEP_INTERVAL', 60)))
+    elif backend == 'sql':
+        app.session_interface = ServerSideSessionInterface(SqlSessionStore(
+            sweep_interval=app.config.get('SESSION_SWEEP_INTERVAL', 300)))
+    elif backend == 'filesystem':
+        from flask_session import Session
+        Session(app)
+    # 'cookie' usa la sesión firmada por defecto de Flask
+
+    return backend
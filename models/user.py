@@ -1,8 +1,16 @@
-from werkzeug.security import generate_password_hash, check_password_hash
-from models.database import get_db
+from models.database import get_db, get_read_db, get_backend, mark_write
+from models.cache import MISS, get_user_cache
+from models.hashing import get_hasher, HasherBusyError
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class User:
+    # Mismo orden que las columnas de _SELECT: User(*fila)
+    __slots__ = ('id', 'nombre', 'email', 'password_hash', 'fecha_creacion')
+    _SELECT = f"SELECT {', '.join(__slots__)} FROM usuarios"
+    
     def __init__(self, id=None, nombre=None, email=None, password_hash=None, fecha_creacion=None):
         self.id = id
         self.nombre = nombre
@@ -22,72 +30,244 @@ class User:
         return len(password) >= 8
     
     def set_password(self, password):
-        """Generar hash de contraseña"""
-        self.password_hash = generate_password_hash(password)
+        """Generar hash de contraseña (en el pool de hashing)"""
+        self.password_hash = get_hasher().hash(password)
     
     def check_password(self, password):
-        """Verificar contraseña"""
+        """Verificar contraseña (en el pool de hashing)"""
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        return get_hasher().verify(self.password_hash, password)
+    
+    def _save_password_hash(self):
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute('UPDATE usuarios SET password_hash = %s WHERE id = %s',
+                       (self.password_hash, self.id))
+        db.commit()
+        cursor.close()
+        mark_write()
+        User.invalidate(self.id)
+    
+    @staticmethod
+    def authenticate(email, password):
+        """Verificar email y contraseña; devuelve el usuario o None.
+        
+        Si el hash se generó con otro método o coste que el configurado, se
+        regenera de forma transparente aprovechando que tenemos la contraseña.
+        """
+        user = User.get_by_email(email)
+        if not user or not user.check_password(password):
+            return None
+        
+        if get_hasher().needs_rehash(user.password_hash):
+            try:
+                user.set_password(password)
+                user._save_password_hash()
+            except HasherBusyError:
+                logger.info(f"Rehash pospuesto para el usuario {user.id}: pool ocupado")
+        return user
     
     @staticmethod
     def get_by_id(user_id):
         """Obtener usuario por ID"""
-        db = get_db()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute('SELECT * FROM usuarios WHERE id = %s', (user_id,))
-        user_data = cursor.fetchone()
+        db = get_read_db()
+        cursor = db.cursor()
+        cursor.execute(f'{User._SELECT} WHERE id = %s', (user_id,))
+        row = cursor.fetchone()
         cursor.close()
         
+        if row:
+            return User(*row)
+        return None
+    
+    @staticmethod
+    def get_cached(user_id):
+        """Obtener usuario por ID pasando por la caché con TTL.
+        
+        La copia cacheada no incluye el hash de la contraseña; para
+        verificarla hay que usar get_by_email/get_by_id.
+        """
+        cache = get_user_cache()
+        if cache is None:
+            return User.get_by_id(user_id)
+        
+        key = f'usuario:{user_id}'
+        user_data = cache.get(key)
+        if user_data is MISS:
+            user = User.get_by_id(user_id)
+            user_data = user.to_dict() if user else None
+            cache.set(key, user_data)
+        
         if user_data:
             return User(**user_data)
         return None
     
+    @staticmethod
+    def invalidate(user_id):
+        """Quitar un usuario de la caché tras modificar sus datos"""
+        cache = get_user_cache()
+        if cache is not None:
+            cache.delete(f'usuario:{user_id}')
+    
     @staticmethod
     def get_by_email(email):
         """Obtener usuario por email"""
-        db = get_db()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute('SELECT * FROM usuarios WHERE email = %s', (email,))
-        user_data = cursor.fetchone()
+        db = get_read_db()
+        cursor = db.cursor()
+        cursor.execute(f'{User._SELECT} WHERE email = %s', (email,))
+        row = cursor.fetchone()
         cursor.close()
         
-        if user_data:
-            return User(**user_data)
+        if row:
+            return User(*row)
+        return None
+    
+    @staticmethod
+    def validation_error(nombre, email, password):
+        """Primer error de los datos de un usuario nuevo, o None"""
+        if not nombre or not nombre.strip():
+            return "El nombre es obligatorio"
+        if not email or not User.validate_email(email):
+            return "Email inválido"
+        if not password or not User.validate_password(password):
+            return "La contraseña debe tener al menos 8 caracteres"
         return None
     
     @staticmethod
     def create(nombre, email, password):
-        """Crear nuevo usuario"""
+        """Crear nuevo usuario.
+        
+        Un solo INSERT: el email duplicado lo detecta el índice único, sin
+        consulta previa ni ventana entre comprobar e insertar.
+        """
         if not User.validate_email(email):
             return None, "Email inválido"
         
         if not User.validate_password(password):
             return None, "La contraseña debe tener al menos 8 caracteres"
         
-        # Verificar si el email ya existe
-        if User.get_by_email(email):
-            return None, "El email ya está registrado"
-        
         user = User()
         user.nombre = nombre
         user.email = email
         user.set_password(password)
         
+        backend = get_backend()
         db = get_db()
         cursor = db.cursor()
-        cursor.execute('''
-            INSERT INTO usuarios (nombre, email, password_hash)
-            VALUES (%s, %s, %s)
-        ''', (user.nombre, user.email, user.password_hash))
-        
-        user.id = cursor.lastrowid
-        db.commit()
-        cursor.close()
+        try:
+            cursor.execute('''
+                INSERT INTO usuarios (nombre, email, password_hash)
+                VALUES (%s, %s, %s)
+            ''', (user.nombre, user.email, user.password_hash))
+            user.id = cursor.lastrowid
+            db.commit()
+        except backend.IntegrityError as e:
+            db.rollback()
+            if backend.is_duplicate(e):
+                return None, "El email ya está registrado"
+            raise
+        finally:
+            cursor.close()
         
+        mark_write()
         return user, None
     
+    @staticmethod
+    def _existing_emails(cursor, emails):
+        """Emails (en minúsculas) de la lista que ya están registrados"""
+        placeholders = ', '.join(['%s'] * len(emails))
+        cursor.execute(f'SELECT email FROM usuarios WHERE email IN ({placeholders})', tuple(emails))
+        return {email.lower() for (email,) in cursor.fetchall()}
+    
+    @staticmethod
+    def bulk_create(records, chunk_size=1000, max_errors=1000):
+        """Aprovisionar muchos usuarios de una vez.
+        
+        ``records`` es un iterable de diccionarios con nombre, email y
+        password. Por cada bloque de ``chunk_size``: validación, una sola
+        consulta para descartar los emails ya registrados, hashes en paralelo
+        en el pool de hashing y un ``executemany`` en una transacción. Si otro
+        proceso registra uno de los emails entre medias, el bloque se repite
+        fila a fila. Devuelve un resumen como el de la importación de contactos.
+        """
+        report = {'total': 0, 'created': 0, 'failed': 0, 'errors': []}
+        backend = get_backend()
+        db = get_db()
+        hasher = get_hasher()
+        seen = set()
+        
+        def fail(index, message):
+            report['failed'] += 1
+            if len(report['errors']) < max_errors:
+                report['errors'].append((index, [message]))
+        
+        def flush(chunk):
+            cursor = db.cursor()
+            try:
+                existing = User._existing_emails(cursor, [email for _, _, email, _ in chunk])
+                pending = []
+                for index, nombre, email, password in chunk:
+                    if email.lower() in existing:
+                        fail(index, "El email ya está registrado")
+                    else:
+                        pending.append((index, nombre, email, password))
+                if not pending:
+                    return
+                
+                hashes = hasher.map_hash([password for *_, password in pending])
+                rows = [(nombre, email, password_hash)
+                        for (_, nombre, email, _), password_hash in zip(pending, hashes)]
+                statement = 'INSERT INTO usuarios (nombre, email, password_hash) VALUES (%s, %s, %s)'
+                try:
+                    db.start_transaction()
+                    cursor.executemany(statement, rows)
+                    db.commit()
+                    report['created'] += len(rows)
+                except backend.IntegrityError as e:
+                    db.rollback()
+                    if not backend.is_duplicate(e):
+                        raise
+                    for (index, *_), row in zip(pending, rows):
+                        try:
+                            cursor.execute(statement, row)
+                            db.commit()
+                            report['created'] += 1
+                        except backend.IntegrityError as e:
+                            db.rollback()
+                            if not backend.is_duplicate(e):
+                                raise
+                            fail(index, "El email ya está registrado")
+            finally:
+                cursor.close()
+        
+        chunk = []
+        for index, record in enumerate(records):
+            report['total'] += 1
+            if not isinstance(record, dict):
+                fail(index, "Se esperaba un objeto con nombre, email y password")
+                continue
+            nombre = (record.get('nombre') or '').strip()
+            email = (record.get('email') or '').strip()
+            password = record.get('password') or ''
+            error = User.validation_error(nombre, email, password)
+            if not error and email.lower() in seen:
+                error = "Email repetido en la lista"
+            if error:
+                fail(index, error)
+                continue
+            seen.add(email.lower())
+            chunk.append((index, nombre, email, password))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        report['errors'].sort(key=lambda error: error[0])
+        if report['created']:
+            mark_write()
+        return report
+    
     def to_dict(self):
         """Convertir usuario a diccionario"""
         return {
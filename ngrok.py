@@ -5,6 +5,8 @@ Script para ejecutar la aplicación Flask y exponerla con ngrok
 
 from flask import Flask
 from pyngrok import ngrok
+import importlib.util
+import subprocess
 import threading
 import time
 import os
@@ -46,7 +48,18 @@ def create_ngrok_tunnel(port=5000):
 def run_flask_app():
     """
     Ejecutar la aplicación Flask
+    
+    Usa gunicorn (gunicorn.conf.py) si está instalado; en Windows o sin
+    gunicorn, el servidor de desarrollo de Flask.
     """
+    if os.name != 'nt' and importlib.util.find_spec('gunicorn'):
+        print("🚀 Iniciando aplicación Flask con gunicorn...")
+        subprocess.run(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-b', '0.0.0.0:5000', 'wsgi:app'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return
+    
     try:
         from app import create_app
         
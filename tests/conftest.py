@@ -0,0 +1,96 @@
+"""
+Fixtures comunes: cada prueba levanta create_app() sobre un archivo SQLite
+temporal con las migraciones aplicadas, sin MySQL ni Redis.
+
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PASSWORD = 'password-de-prueba'
+
+# Configuración de las pruebas: base de datos desechable y hash barato
+TEST_CONFIG = {
+    'DB_BACKEND': 'sqlite',
+    'DB_AUTO_MIGRATE': True,
+    'DB_REPLICAS': '',
+    'SESSION_BACKEND': 'cookie',
+    'CONTACT_CACHE_BACKEND': 'memory',
+    'USER_CACHE_BACKEND': 'memory',
+    'FRAGMENT_CACHE_BACKEND': 'memory',
+    'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+    'HASH_WORKERS': 0,
+    'PROVISIONING_TOKEN': '',
+}
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Crear aplicaciones con la configuración de pruebas más ``overrides``.
+
+    Todas las que cree una misma prueba comparten la base de datos, como
+    varios workers o nodos sobre el mismo servidor.
+    """
+    import config
+    from app import create_app
+    from models.database import reset_pool
+
+    apps = []
+
+    def factory(**overrides):
+        settings = {**TEST_CONFIG, 'SQLITE_PATH': str(tmp_path / 'contactos.db'), **overrides}
+        for name, value in settings.items():
+            monkeypatch.setattr(config.Config, name, value, raising=False)
+        app = create_app()
+        app.config['TESTING'] = True
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        reset_pool(app, close=True)
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def create_user(app, email='ana@example.com', nombre='Ana'):
+    """Registrar un usuario y devolver su id"""
+    from models.user import User
+    with app.app_context():
+        user, error = User.create(nombre, email, PASSWORD)
+        assert error is None, error
+        return user.id
+
+
+def login(client, user_id):
+    """Abrir sesión en el cliente sin pasar por el formulario"""
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+        session['user_name'] = 'Prueba'
+
+
+def api_token(app, user_id):
+    """Token Bearer de la API para el usuario"""
+    from itsdangerous import URLSafeTimedSerializer
+    from controllers.api_controller import TOKEN_SALT
+    token = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt=TOKEN_SALT).dumps({'uid': user_id})
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def user_id(app):
+    return create_user(app)
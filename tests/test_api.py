@@ -0,0 +1,45 @@
+import pytest
+
+from conftest import api_token
+
+
+@pytest.fixture
+def headers(app, user_id):
+    return api_token(app, user_id)
+
+
+def create(client, headers, **fields):
+    response = client.post('/api/v1/contacts', json={'nombre': 'Ana', **fields}, headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()
+
+
+@pytest.mark.parametrize('payload', [
+    {'nombre': 5},
+    {'nombre': 'Ana', 'correo': ['ana@example.com']},
+    {'nombre': 'Ana', 'telefono': 600123456},
+    {'nombre': 'Ana', 'detalle': {'a': 1}},
+])
+def test_create_rejects_non_text_fields(client, headers, payload):
+    response = client.post('/api/v1/contacts', json=payload, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['errors']
+
+
+def test_update_rejects_non_text_fields(client, headers):
+    contact = create(client, headers)
+    for method in (client.put, client.patch):
+        response = method(f"/api/v1/contacts/{contact['id']}", json={'nombre': 5}, headers=headers)
+        assert response.status_code == 400
+
+
+def test_bulk_reports_non_text_items(client, headers):
+    response = client.post('/api/v1/contacts/bulk', json=[{'nombre': 'Ana'}, {'nombre': 5}], headers=headers)
+    assert response.status_code == 201
+    assert response.get_json()['created'] == 1
+    assert response.get_json()['errors'][0]['index'] == 1
+
+
+def test_null_fields_are_validated_not_rejected(client, headers):
+    response = client.post('/api/v1/contacts', json={'nombre': None}, headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import api_token
+from models.async_contact import AsyncContactStore
+from models.cache import MemoryCache
+from models.contact import Contact
+
+pytest.importorskip('quart')
+pytest.importorskip('aiosqlite')
+
+
+@pytest.fixture
+def asgi_app(app):
+    import asgi
+    return asgi.create_asgi_app()
+
+
+def run(asgi_app, scenario):
+    async def main():
+        async with asgi_app.test_app() as test_app:
+            return await scenario(test_app.test_client())
+    return asyncio.run(main())
+
+
+def test_crud_and_errors_match_wsgi_api(app, asgi_app, user_id):
+    headers = api_token(app, user_id)
+
+    async def scenario(client):
+        created = await client.post('/api/v1/contacts', json={'nombre': 'Ana'}, headers=headers)
+        contact = await created.get_json()
+        invalid = await client.post('/api/v1/contacts', json={'nombre': 5}, headers=headers)
+        missing = await client.get('/api/v1/contacts/999999', headers=headers)
+        listed = await client.get('/api/v1/contacts', headers=headers)
+        return created, contact, invalid, await invalid.get_json(), missing, await missing.get_json(), listed
+
+    created, contact, invalid, invalid_body, missing, missing_body, listed = run(asgi_app, scenario)
+    assert created.status_code == 201 and contact['nombre'] == 'Ana'
+    assert invalid.status_code == 400 and invalid_body['errors'] == ['nombre debe ser un texto']
+    assert missing.status_code == 404 and missing_body == {'error': 'Contacto no encontrado'}
+    assert listed.headers['ETag']
+
+
+class NetworkCache(MemoryCache):
+    """Caché en memoria que se declara de red y anota desde qué hilo se usa"""
+
+    blocking = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key, count=True):
+        self.threads.add(threading.get_ident())
+        return super().get(key, count)
+
+
+class FakeDatabase:
+    async def fetchone(self, query, params):
+        return (1, 7, 'Ana', '', '', '', None, 1, None)
+
+
+def test_blocking_cache_is_called_off_the_event_loop():
+    cache = NetworkCache()
+    store = AsyncContactStore(FakeDatabase(), cache)
+
+    async def main():
+        contact = await store.get_by_id(1, 7)
+        await store.version(7)
+        return contact, threading.get_ident()
+
+    contact, loop_thread = asyncio.run(main())
+    assert isinstance(contact, Contact)
+    assert cache.threads and loop_thread not in cache.threads
+
+
+def test_outdated_schema_answers_503(make_app):
+    make_app(DB_AUTO_MIGRATE=False)
+    import asgi
+    outdated = asgi.create_asgi_app()
+
+    async def scenario(client):
+        response = await client.get('/api/v1/contacts')
+        return response, await response.get_json()
+
+    response, body = run(outdated, scenario)
+    assert response.status_code == 503
+    assert 'db upgrade' in body['error']
@@ -0,0 +1,58 @@
+import pytest
+from flask import url_for
+
+from conftest import create_user, login
+from models.contact import Contact
+
+
+@pytest.fixture
+def contacts(app, client, user_id):
+    login(client, user_id)
+    with app.app_context():
+        created = [Contact(user_id=user_id, nombre=f'Contacto {i}', correo='', telefono='', detalle='')
+                   for i in range(5)]
+        Contact.bulk_insert(user_id, created)
+        return [c.id for c in Contact.get_all_by_user(user_id)]
+
+
+def test_list_endpoint_name_is_kept(app):
+    with app.test_request_context():
+        assert url_for('contact.list') == '/contactos/'
+
+
+def test_batch_delete_json(app, client, user_id, contacts):
+    response = client.post('/contactos/lote', json={'accion': 'eliminar', 'ids': contacts[:3]})
+    assert response.get_json() == {'deleted': 3, 'requested': 3}
+    with app.app_context():
+        assert Contact.count_by_user(user_id) == 2
+
+
+def test_batch_edit_json(app, client, user_id, contacts):
+    response = client.post('/contactos/lote', json={'accion': 'editar', 'ids': contacts,
+                                                    'valores': {'detalle': 'cliente'}})
+    assert response.get_json() == {'updated': 5, 'requested': 5}
+
+
+@pytest.mark.parametrize('ids', ['1,2', {'1': 2}, None, ['x']])
+def test_batch_rejects_ids_that_are_not_a_list_of_integers(client, contacts, ids):
+    response = client.post('/contactos/lote', json={'accion': 'eliminar', 'ids': ids})
+    assert response.status_code == 400
+
+
+def test_batch_ignores_other_users_contacts(app, client, contacts):
+    other = create_user(app, email='otro@example.com')
+    other_client = app.test_client()
+    login(other_client, other)
+    response = other_client.post('/contactos/lote', json={'accion': 'eliminar', 'ids': contacts})
+    assert response.get_json()['deleted'] == 0
+
+
+def test_batch_form_redirects_to_list(client, contacts):
+    response = client.post('/contactos/lote', data={'accion': 'eliminar', 'ids': [str(contacts[0])]})
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/contactos/')
+
+
+@pytest.mark.parametrize('payload', [{'telefonos': '600123456'}, {'correos': [1]}])
+def test_lookup_rejects_non_list_values(client, contacts, payload):
+    assert client.post('/contactos/lookup', json=payload).status_code == 400
@@ -0,0 +1,92 @@
+import os
+import runpy
+import time
+
+import pytest
+
+from conftest import ROOT, api_token, create_user
+from models.cache import MISS, MemoryCache, contacts_version
+from models.contact import Contact
+
+
+def test_counter_expires_from_creation():
+    cache = MemoryCache(counter_ttl=0.05)
+    first = contacts_version(cache, 1)
+    time.sleep(0.03)
+    cache.incr('contactos:version:1', 0)  # Un incremento no alarga la caducidad
+    time.sleep(0.03)
+
+    assert cache.get_counter('contactos:version:1') is MISS
+    assert contacts_version(cache, 1) not in (first, first + 1)
+
+
+def test_counter_without_ttl_never_expires():
+    cache = MemoryCache()
+    version = contacts_version(cache, 1)
+    assert cache.get_counter('contactos:version:1') == version
+
+
+def count(app, user_id):
+    with app.app_context():
+        return Contact.count_by_user(user_id)
+
+
+def add_contact(app, user_id):
+    with app.app_context():
+        assert Contact(user_id=user_id, nombre='Ana', correo='', telefono='', detalle='').save()[0]
+
+
+def test_write_from_another_process_is_seen_after_version_ttl(make_app):
+    worker_a = make_app(CONTACT_CACHE_VERSION_TTL=0.1)
+    worker_b = make_app(CONTACT_CACHE_VERSION_TTL=0.1)
+    user_id = create_user(worker_a)
+
+    assert count(worker_a, user_id) == 0
+    add_contact(worker_b, user_id)
+    time.sleep(0.15)
+    assert count(worker_a, user_id) == 1
+
+
+def test_etag_changes_after_write_from_another_process(make_app):
+    worker_a = make_app(CONTACT_CACHE_VERSION_TTL=0.1)
+    worker_b = make_app(CONTACT_CACHE_VERSION_TTL=0.1)
+    user_id = create_user(worker_a)
+    client = worker_a.test_client()
+    headers = api_token(worker_a, user_id)
+
+    etag = client.get('/api/v1/contacts', headers=headers).headers['ETag']
+    add_contact(worker_b, user_id)
+    time.sleep(0.15)
+
+    response = client.get('/api/v1/contacts', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == 1
+
+
+def run_gunicorn_conf(monkeypatch, **environ):
+    monkeypatch.setattr(os, 'environ', dict(environ))
+    runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+    return os.environ
+
+
+def test_gunicorn_defaults_to_redis_contact_cache_with_several_workers(monkeypatch):
+    try:
+        environ = run_gunicorn_conf(monkeypatch, GUNICORN_WORKERS='3')
+    except RuntimeError as e:
+        # Sin el paquete redis no arranca, pero dice cómo instalarlo
+        assert 'pip install redis' in str(e)
+        environ = os.environ
+    assert environ['CONTACT_CACHE_BACKEND'] == 'redis'
+
+
+def test_gunicorn_refuses_memory_contact_cache_with_several_workers(monkeypatch):
+    with pytest.raises(RuntimeError, match="CONTACT_CACHE_BACKEND='memory'"):
+        run_gunicorn_conf(monkeypatch, GUNICORN_WORKERS='3', CONTACT_CACHE_BACKEND='memory')
+
+
+@pytest.mark.parametrize('environ, expected', [
+    ({'GUNICORN_WORKERS': '1'}, None),
+    ({'GUNICORN_WORKERS': '3', 'CONTACT_CACHE_BACKEND': 'none'}, 'none'),
+])
+def test_gunicorn_keeps_explicit_contact_cache(monkeypatch, environ, expected):
+    assert run_gunicorn_conf(monkeypatch, **environ).get('CONTACT_CACHE_BACKEND') == expected
@@ -0,0 +1,192 @@
+import gzip
+import json
+import os
+import re
+
+import pytest
+
+from conftest import ROOT, login
+from models.assets import MANIFEST, asset_url, brotli_module, build_assets
+from models.compression import get_compression_stats
+
+LARGE = 'contenido repetido ' * 200
+
+
+@pytest.fixture
+def text_app(app):
+    @app.route('/_texto')
+    def texto():
+        response = app.response_class(LARGE, mimetype='text/plain')
+        response.add_etag()
+        return response
+
+    @app.route('/_corto')
+    def corto():
+        return app.response_class('hola', mimetype='text/plain')
+
+    @app.route('/_binario')
+    def binario():
+        return app.response_class(LARGE, mimetype='application/octet-stream')
+
+    return app
+
+
+def test_large_response_is_gzipped(text_app):
+    client = text_app.test_client()
+    response = client.get('/_texto', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.get_data()) == LARGE.encode()
+    # El ETag fuerte describe los bytes sin comprimir: pasa a débil
+    assert response.headers['ETag'].startswith('W/')
+
+    with text_app.app_context():
+        stats = get_compression_stats().stats()
+    assert stats['responses'] == 1 and stats['bytes_in'] == len(LARGE)
+    assert stats['bytes_out'] == len(response.get_data()) < stats['bytes_in']
+
+
+def test_html_pages_are_compressed(app, client, user_id):
+    login(client, user_id)
+    response = client.get('/contactos/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.get_data()).rstrip().endswith(b'</html>')
+
+
+@pytest.mark.parametrize('path, headers', [
+    ('/_texto', {}),
+    ('/_texto', {'Accept-Encoding': 'identity'}),
+    ('/_corto', {'Accept-Encoding': 'gzip'}),
+    ('/_binario', {'Accept-Encoding': 'gzip'}),
+])
+def test_uncompressed_responses(text_app, path, headers):
+    response = text_app.test_client().get(path, headers=headers)
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True) in (LARGE, 'hola')
+
+
+def test_streamed_export_is_not_compressed(client, user_id):
+    login(client, user_id)
+    response = client.get('/contactos/exportar?format=csv', headers={'Accept-Encoding': 'gzip'})
+    assert response.is_streamed
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_brotli_is_preferred(text_app):
+    brotli = pytest.importorskip('brotli')
+    response = text_app.test_client().get('/_texto', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.get_data()) == LARGE.encode()
+
+
+def test_compression_can_be_disabled(make_app):
+    app = make_app(COMPRESS_ENABLED=False, COMPRESS_MIN_SIZE=0)
+    response = app.test_client().get('/auth/login', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    with app.app_context():
+        assert get_compression_stats() is None
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def test_build_assets(tmp_path):
+    static = tmp_path / 'static'
+    write(static / 'css' / 'style.css', 'body { color: #333; }\n' * 100)
+    write(static / 'js' / 'a.js', 'x')
+    (static / 'img').mkdir()
+    (static / 'img' / 'logo.png').write_bytes(b'\x89PNG' + bytes(range(256)) * 4)
+    dist = static / 'dist'
+    write(dist / 'viejo.txt', 'se borra al reconstruir')
+
+    report = {entry['file']: entry for entry in build_assets(str(static), str(dist))}
+    assert sorted(report) == ['css/style.css', 'img/logo.png', 'js/a.js']
+
+    css = report['css/style.css']
+    assert re.fullmatch(r'css/style\.[0-9a-f]{12}\.css', css['hashed'])
+    assert (dist / css['hashed']).read_bytes() == (static / 'css' / 'style.css').read_bytes()
+    assert gzip.decompress((dist / (css['hashed'] + '.gz')).read_bytes()) == \
+        (static / 'css' / 'style.css').read_bytes()
+    assert css['gzip'] < css['size']
+    assert (css['br'] is None) == (brotli_module() is None)
+
+    # Ni precomprimir lo que no merece la pena ni lo que ya está comprimido
+    assert not (dist / (report['js/a.js']['hashed'] + '.gz')).exists()
+    assert report['js/a.js']['gzip'] is None
+    assert report['img/logo.png']['gzip'] is None
+
+    manifest = json.loads((dist / MANIFEST).read_text(encoding='utf-8'))
+    assert manifest == {name: entry['hashed'] for name, entry in report.items()}
+    assert not (dist / 'viejo.txt').exists()
+
+
+def test_hash_changes_with_content(tmp_path):
+    static = tmp_path / 'static'
+    write(static / 'css' / 'style.css', 'a {}')
+    first = build_assets(str(static), str(tmp_path / 'dist'))[0]['hashed']
+    write(static / 'css' / 'style.css', 'b {}')
+    second = build_assets(str(static), str(tmp_path / 'dist'))[0]['hashed']
+    assert first != second
+
+
+def test_asset_url_falls_back_to_static(make_app, tmp_path):
+    app = make_app(ASSETS_DIST_DIR=str(tmp_path / 'sin-construir'))
+    with app.test_request_context():
+        assert asset_url('css/style.css') == '/static/css/style.css'
+    page = app.test_client().get('/auth/login').get_data(as_text=True)
+    assert 'href="/static/css/style.css"' in page
+
+
+@pytest.fixture
+def built_app(make_app, tmp_path):
+    # ASSETS_DIST_DIR absoluto: os.path.join lo toma tal cual sobre static_folder
+    dist = tmp_path / 'dist'
+    app = make_app(ASSETS_DIST_DIR=str(dist))
+    build_assets(os.path.join(ROOT, 'static'), str(dist))
+    return app
+
+
+def test_hashed_asset_urls_in_pages(built_app):
+    page = built_app.test_client().get('/auth/login').get_data(as_text=True)
+    assert re.search(r'href="/assets/css/style\.[0-9a-f]{12}\.css"', page)
+    assert re.search(r'src="/assets/js/script\.[0-9a-f]{12}\.js"', page)
+
+
+def test_hashed_asset_is_served_immutable_and_precompressed(built_app):
+    client = built_app.test_client()
+    with built_app.test_request_context():
+        url = asset_url('js/script.js')
+    with open(os.path.join(ROOT, 'static', 'js', 'script.js'), 'rb') as f:
+        original = f.read()
+
+    plain = client.get(url)
+    assert plain.status_code == 200
+    assert plain.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert 'Accept-Encoding' in plain.headers['Vary']
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.get_data() == original
+    plain.close()
+
+    compressed = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.mimetype in ('text/javascript', 'application/javascript')
+    assert gzip.decompress(compressed.get_data()) == original
+    compressed.close()
+
+
+def test_unknown_asset_is_404(built_app):
+    client = built_app.test_client()
+    assert client.get('/assets/css/no-existe.css').status_code == 404
+    assert client.get('/assets/../manifest.json').status_code == 404
+
+
+def test_cli_build(make_app, tmp_path):
+    dist = tmp_path / 'dist'
+    app = make_app(ASSETS_DIST_DIR=str(dist))
+    with app.app_context():
+        result = app.test_cli_runner().invoke(args=['assets', 'build'])
+    assert result.exit_code == 0, result.output
+    assert 'css/style.css' in result.output and '2 recursos' in result.output
+    assert (dist / MANIFEST).exists()
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from conftest import api_token, create_user, login
+from models.contact import Contact, ContactConflictError
+
+
+@pytest.fixture
+def headers(app, user_id):
+    return api_token(app, user_id)
+
+
+@pytest.fixture
+def contact(client, headers):
+    response = client.post('/api/v1/contacts', json={'nombre': 'Ana', 'correo': 'ana@example.com'},
+                           headers=headers)
+    return response.get_json()
+
+
+def url(contact):
+    return f"/api/v1/contacts/{contact['id']}"
+
+
+def put_body(**values):
+    """Cuerpo completo de un PUT: todos los campos editables"""
+    return {**{field: '' for field in Contact.EDITABLE}, **values}
+
+
+@pytest.mark.parametrize('method', ['put', 'patch'])
+def test_stale_version_returns_409_and_keeps_row(client, headers, contact, method):
+    first = client.patch(url(contact), json={'nombre': 'Ana B', 'version': contact['version']}, headers=headers)
+    assert first.status_code == 200
+
+    stale = getattr(client, method)(url(contact), json=put_body(nombre='Ana C', version=contact['version']),
+                                    headers=headers)
+    assert stale.status_code == 409
+    assert stale.get_json()['current']['nombre'] == 'Ana B'
+    assert client.get(url(contact), headers=headers).get_json()['nombre'] == 'Ana B'
+
+
+def test_put_with_current_version_replaces_all_fields(client, headers, contact):
+    response = client.put(url(contact), json=put_body(nombre='Ana B', telefono='600123456', version=contact['version']),
+                          headers=headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['nombre'], body['correo'], body['telefono'], body['version']) == \
+        ('Ana B', '', '600123456', contact['version'] + 1)
+
+
+def test_put_with_missing_fields_is_rejected(client, headers, contact):
+    response = client.put(url(contact), json={'nombre': 'Ana B', 'version': contact['version']}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['missing'] == ['correo', 'telefono', 'detalle']
+    assert client.get(url(contact), headers=headers).get_json()['correo'] == 'ana@example.com'
+
+
+def test_put_without_version_is_last_write_wins(client, headers, contact):
+    client.patch(url(contact), json={'nombre': 'Ana B'}, headers=headers)
+    assert client.put(url(contact), json=put_body(nombre='Ana C'), headers=headers).status_code == 200
+
+
+def test_non_integer_version_is_rejected(client, headers, contact):
+    for version in ('1', True, 1.5):
+        response = client.patch(url(contact), json={'nombre': 'Ana', 'version': version}, headers=headers)
+        assert response.status_code == 400
+
+
+def test_stale_put_returns_409_in_asgi_app(app, headers, contact):
+    pytest.importorskip('quart')
+    pytest.importorskip('aiosqlite')
+    import asgi
+    asgi_app = asgi.create_asgi_app()
+
+    async def scenario():
+        async with asgi_app.test_app() as test_app:
+            client = test_app.test_client()
+            partial = await client.put(url(contact), json={'nombre': 'Ana B'}, headers=headers)
+            fresh = await client.put(url(contact), json=put_body(nombre='Ana B', version=contact['version']),
+                                     headers=headers)
+            stale = await client.put(url(contact), json=put_body(nombre='Ana C', version=contact['version']),
+                                     headers=headers)
+            return partial.status_code, fresh.status_code, stale.status_code
+
+    assert asyncio.run(scenario()) == (400, 200, 409)
+
+
+def test_model_save_raises_on_concurrent_update(app, user_id):
+    with app.app_context():
+        contact = Contact(user_id=user_id, nombre='Ana', correo='', telefono='', detalle='')
+        contact.save()
+        first = Contact.get_by_id(contact.id, user_id)
+        second = Contact.get_by_id(contact.id, user_id)
+
+        first.nombre = 'Ana B'
+        assert first.save() == (True, None)
+        second.nombre = 'Ana C'
+        with pytest.raises(ContactConflictError) as conflict:
+            second.save()
+        assert conflict.value.current.nombre == 'Ana B'
+
+
+def test_model_save_raises_with_none_when_deleted(app, user_id):
+    with app.app_context():
+        contact = Contact(user_id=user_id, nombre='Ana', correo='', telefono='', detalle='')
+        contact.save()
+        stale = Contact.get_by_id(contact.id, user_id)
+        assert contact.delete()
+
+        stale.nombre = 'Ana B'
+        with pytest.raises(ContactConflictError) as conflict:
+            stale.save()
+        assert conflict.value.current is None
+
+
+def edit_form(contact, **changes):
+    form = {'version': contact['version']}
+    for field in Contact.EDITABLE:
+        form[f'original_{field}'] = form[field] = contact[field]
+    return {**form, **changes}
+
+
+def test_unchanged_edit_of_missing_contact_is_not_reported_as_saved(client, contact):
+    other = create_user(client.application, email='otro@example.com', nombre='Otro')
+    login(client, other)
+
+    response = client.post(f"/contactos/editar/{contact['id']}", data=edit_form(contact), follow_redirects=True)
+    assert 'Contacto no encontrado' in response.get_data(as_text=True)
+    assert 'actualizado exitosamente' not in response.get_data(as_text=True)
+
+
+def test_unchanged_edit_of_own_contact_succeeds(client, user_id, contact):
+    login(client, user_id)
+
+    response = client.post(f"/contactos/editar/{contact['id']}", data=edit_form(contact), follow_redirects=True)
+    assert 'Contacto actualizado exitosamente' in response.get_data(as_text=True)
@@ -0,0 +1,119 @@
+from collections import namedtuple
+
+import pytest
+
+from conftest import create_user, login
+from models import dedupe
+from models.cache import current_contacts_version
+from models.contact import Contact
+
+Row = namedtuple('Row', 'id nombre correo telefono')
+
+
+def groups(*rows, **kwargs):
+    return dedupe.find_duplicate_groups([Row(i, *row) for i, row in enumerate(rows, 1)], **kwargs)
+
+
+def test_same_email_with_name_variant_is_grouped():
+    assert groups(('Pérez, Juan', 'juan@example.com', ''),
+                  ('Juan Peres', 'JUAN@example.com', ''),
+                  ('Ana López', 'ana@example.com', '')) == [[1, 2]]
+
+
+def test_phone_formats_are_normalized():
+    assert groups(('Lucía Gómez', '', '+34 600-12-34-56'),
+                  ('Lucia Gomez', '', '600123456')) == [[1, 2]]
+
+
+def test_name_alone_is_not_enough():
+    assert groups(('Juan García', 'juan@example.com', '600123456'),
+                  ('Juan García', 'otro@example.com', '611987654'),
+                  ('Juan García', '', '')) == []
+
+
+@pytest.mark.parametrize('first, second', [
+    (('Juan García', 'juan.garcia@gmail.com', ''), ('Juan García', 'juan.garcia@hotmail.com', '')),
+    (('Juan García', 'juan.garcia@gmail.com', ''), ('Juan García', 'juan.garcai@gmail.com', '')),
+    (('Juan García', '', '600123456'), ('Juan García', '', '600123465')),
+    (('Juan García', '', '600123456'), ('Juan García', '', '60012345')),
+])
+def test_exact_name_and_near_email_or_phone_is_grouped(first, second):
+    assert groups(first, second) == [[1, 2]]
+
+
+def test_near_matches_do_not_add_up():
+    # Nombres distintos con email y teléfono a una errata: no es la misma persona
+    assert groups(('Javier Sánchez Vidal', 'jav.sanchez17826@example.com', '600017826'),
+                  ('Gómez Javier Sánchez', 'jav.sanchez17926@example.com', '600017926')) == []
+
+
+def test_groups_are_transitive_and_sorted_by_size():
+    result = groups(('Ana Ruiz', 'ana@example.com', ''),
+                    ('Ana Ruiz', 'ana@example.com', '600111222'),
+                    ('Ana Ruíz', '', '600111222'),
+                    ('Luis Gil', 'luis@example.com', ''),
+                    ('Luis Gil', 'luis@example.com', ''))
+    assert result == [[1, 2, 3], [4, 5]]
+
+
+def test_oversized_blocks_are_skipped():
+    rows = [(f'Persona {chr(65 + i)}{chr(75 + i)}', '', '600000000') for i in range(5)]
+    stats = {}
+    assert groups(*rows, max_block=4, stats=stats) == []
+    assert stats['skipped_blocks'] == 1
+
+
+def test_one_edit_apart():
+    assert dedupe.one_edit_apart('600123456', '600123457')
+    assert dedupe.one_edit_apart('600123456', '600124356')
+    assert dedupe.one_edit_apart('600123456', '60012345')
+    assert not dedupe.one_edit_apart('600123456', '600123456')
+    assert not dedupe.one_edit_apart('600123456', '600654321')
+
+
+def add(user_id, nombre, correo='', telefono='', detalle=''):
+    contact = Contact(user_id=user_id, nombre=nombre, correo=correo, telefono=telefono, detalle=detalle)
+    assert contact.save() == (True, None)
+    return contact.id
+
+
+def test_merge_fills_blanks_and_deletes_the_rest(app, user_id):
+    with app.app_context():
+        keep = add(user_id, 'Ana Ruiz', detalle='cliente')
+        other = add(user_id, 'Ana Ruíz', correo='ana@example.com', detalle='proveedor')
+        third = add(user_id, 'Ana R.', telefono='600111222', detalle='cliente')
+        version = current_contacts_version(user_id)
+
+        merged = dedupe.merge_contacts(user_id, keep, [other, third])
+        assert (merged.id, merged.correo, merged.telefono) == (keep, 'ana@example.com', '600111222')
+        assert merged.detalle == 'cliente\nproveedor'
+        assert merged.version == 2
+        assert [c.id for c in Contact.get_all_by_user(user_id)] == [keep]
+        assert current_contacts_version(user_id) > version
+
+
+def test_merge_only_touches_the_users_contacts(app, user_id):
+    other_user = create_user(app, email='otro@example.com')
+    with app.app_context():
+        keep = add(user_id, 'Ana')
+        foreign = add(other_user, 'Ana')
+        merged = dedupe.merge_contacts(user_id, keep, [foreign])
+        assert merged.id == keep
+        assert Contact.get_by_id(foreign, other_user) is not None
+        assert dedupe.merge_contacts(user_id, foreign, [keep]) is None
+        assert Contact.get_by_id(keep, user_id) is not None
+
+
+def test_duplicates_page_and_merge(app, client, user_id):
+    with app.app_context():
+        first = add(user_id, 'Lucía Gómez', telefono='+34 600 12 34 56')
+        second = add(user_id, 'Lucia Gomez', telefono='600123456')
+    login(client, user_id)
+
+    assert 'Lucia Gomez' in client.get('/contactos/duplicados').get_data(as_text=True)
+    response = client.post('/contactos/duplicados/fusionar', data={'conservar': first, 'fusionar': [second]},
+                           follow_redirects=True)
+    assert 'Contactos fusionados' in response.get_data(as_text=True)
+    with app.app_context():
+        assert Contact.count_by_user(user_id) == 1
+        assert dedupe.find_duplicates(user_id) == []
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+
+import pytest
+
+from conftest import login
+from models import contact_io
+from models.contact import Contact
+
+CONTACTS = [
+    ('Ana López', 'ana@example.com', '600 123 456', 'línea 1\nlínea 2'),
+    ('Pérez, Juan', '', '+34 611 222 333', ''),
+    ('Zoe; Ruiz', 'zoe@example.com', '', 'nota, con coma'),
+]
+
+
+@pytest.fixture
+def contacts(app, client, user_id):
+    login(client, user_id)
+    with app.app_context():
+        Contact.bulk_insert(user_id, [Contact(nombre=n, correo=c, telefono=t, detalle=d)
+                                      for n, c, t, d in CONTACTS])
+
+
+def export(client, fmt):
+    response = client.get(f'/contactos/exportar?format={fmt}')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.headers['Content-Disposition'] == \
+        f'attachment; filename=contactos.{contact_io.EXPORT_FORMATS[fmt][1]}'
+    return response
+
+
+def test_csv_export(client, contacts):
+    response = export(client, 'csv')
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == list(contact_io.EXPORT_FIELDS)
+    assert [row[:4] for row in rows[1:]] == [list(contact) for contact in CONTACTS]
+    assert all(row[4] for row in rows[1:])
+
+
+def test_jsonl_export(client, contacts):
+    response = export(client, 'jsonl')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [(r['nombre'], r['correo'], r['telefono'], r['detalle']) for r in records] == CONTACTS
+
+
+def test_vcard_export_round_trips_through_import(app, client, contacts):
+    response = export(client, 'vcf')
+    assert response.mimetype == 'text/vcard'
+    text = response.get_data(as_text=True)
+    assert text.count('BEGIN:VCARD') == 3
+    assert 'FN:Zoe\\; Ruiz' in text
+
+    records = [fields for _, fields in contact_io.iter_vcard_records(io.StringIO(text))]
+    assert [(r['nombre'], r.get('correo', ''), r.get('telefono', ''), r.get('detalle', ''))
+            for r in records] == CONTACTS
+
+
+def test_unknown_format_redirects(client, contacts):
+    response = client.get('/contactos/exportar?format=xml')
+    assert response.status_code == 302
+
+
+def test_export_of_empty_list_has_only_header(client, user_id):
+    login(client, user_id)
+    assert client.get('/contactos/exportar?format=csv').get_data(as_text=True).splitlines() == \
+        [','.join(contact_io.EXPORT_FIELDS)]
+    assert client.get('/contactos/exportar?format=jsonl').get_data() == b''
+
+
+def test_export_emits_one_chunk_per_batch(app, user_id):
+    with app.app_context():
+        Contact.bulk_insert(user_id, [Contact(nombre=f'Contacto {i:02d}', correo='', telefono='', detalle='')
+                                      for i in range(10)])
+        chunks = list(contact_io.export_contacts(user_id, 'jsonl', batch_size=4))
+    assert [chunk.count('\n') for chunk in chunks] == [4, 4, 2]
+
+
+def test_export_reads_lazily_and_returns_connection(app, user_id):
+    from models.database import get_pool
+    with app.app_context():
+        Contact.bulk_insert(user_id, [Contact(nombre=f'Contacto {i:02d}', correo='', telefono='', detalle='')
+                                      for i in range(10)])
+        in_use = get_pool().stats()['in_use']
+        chunks = contact_io.export_contacts(user_id, 'csv', batch_size=3)
+        # Nada se lee hasta pedir el primer trozo
+        assert get_pool().stats()['in_use'] == in_use
+        assert next(chunks).startswith(','.join(contact_io.EXPORT_FIELDS))
+        assert get_pool().stats()['in_use'] == in_use + 1
+        # Abandonar la exportación a medias devuelve la conexión al pool
+        chunks.close()
+        assert get_pool().stats()['in_use'] == in_use
+
+
+def test_unknown_export_format_raises(app, user_id):
+    with app.app_context(), pytest.raises(ValueError):
+        contact_io.export_contacts(user_id, 'xml')
@@ -0,0 +1,43 @@
+import time
+
+from conftest import create_user, login
+from models.contact import Contact
+
+
+def add_contact(app, user_id, nombre):
+    with app.app_context():
+        assert Contact(user_id=user_id, nombre=nombre, correo='', telefono='', detalle='').save()[0]
+
+
+def test_list_fragment_is_cached_and_invalidated_by_writes(app, client, user_id):
+    login(client, user_id)
+    add_contact(app, user_id, 'Ana Torres')
+
+    assert client.get('/contactos/').headers['X-Fragment-Cache'] == 'MISS'
+    assert client.get('/contactos/').headers['X-Fragment-Cache'] == 'HIT'
+
+    add_contact(app, user_id, 'Luis Pérez')
+    response = client.get('/contactos/')
+    assert response.headers['X-Fragment-Cache'] == 'MISS'
+    assert 'Luis Pérez' in response.get_data(as_text=True)
+
+
+def test_fragment_from_another_process_expires_with_version(make_app):
+    worker_a = make_app(CONTACT_CACHE_VERSION_TTL=0.1)
+    worker_b = make_app(CONTACT_CACHE_VERSION_TTL=0.1)
+    user_id = create_user(worker_a)
+    client = worker_a.test_client()
+    login(client, user_id)
+
+    client.get('/contactos/')
+    add_contact(worker_b, user_id, 'Luis Pérez')
+    time.sleep(0.15)
+    assert 'Luis Pérez' in client.get('/contactos/').get_data(as_text=True)
+
+
+def test_no_fragment_cache_without_contact_cache(make_app):
+    app = make_app(CONTACT_CACHE_BACKEND='none')
+    user_id = create_user(app)
+    client = app.test_client()
+    login(client, user_id)
+    assert 'X-Fragment-Cache' not in client.get('/contactos/').headers
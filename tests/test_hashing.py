@@ -0,0 +1,60 @@
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from models.hashing import HasherBusyError, PasswordHasher
+
+
+@pytest.mark.parametrize('method', ['pbkdf2', 'pbkdf2:sha256:1000', 'scrypt', 'scrypt:16384:8:1'])
+def test_needs_rehash_accepts_hashes_from_configured_method(method):
+    hasher = PasswordHasher(method=method, workers=0)
+    assert not hasher.needs_rehash(hasher.hash('secreto'))
+
+
+def test_needs_rehash_detects_other_cost():
+    hasher = PasswordHasher(method='pbkdf2:sha256:2000', workers=0)
+    assert hasher.needs_rehash(generate_password_hash('secreto', 'pbkdf2:sha256:1000'))
+
+
+@pytest.fixture
+def pool_hasher():
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000', workers=1, max_pending=1, timeout=0.2)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_pool_hashes_and_verifies(pool_hasher):
+    password_hash = pool_hasher.hash('secreto')
+    assert pool_hasher.verify(password_hash, 'secreto')
+    assert not pool_hasher.verify(password_hash, 'otro')
+
+
+def test_timed_out_task_keeps_its_slot_until_it_finishes(pool_hasher):
+    pool_hasher.hash('arranque')  # Procesos ya creados: el tiempo es el de la tarea
+    with pytest.raises(HasherBusyError):
+        pool_hasher._run(time.sleep, 0.6)
+    # La tarea sigue ocupando el proceso: no se admite otra
+    with pytest.raises(HasherBusyError, match='cola'):
+        pool_hasher.hash('secreto')
+
+    time.sleep(0.6)
+    assert pool_hasher.hash('secreto')
+
+
+def test_map_hash_through_pool():
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000', workers=1, max_pending=4)
+    try:
+        passwords = [f'secreto-{i}' for i in range(7)]
+        hashes = hasher.map_hash(passwords)
+        assert all(hasher.verify(h, p) for h, p in zip(hashes, passwords))
+    finally:
+        hasher.shutdown()
+
+
+def test_map_hash_respects_queue_limit(pool_hasher):
+    pool_hasher.hash('arranque')
+    busy = pool_hasher._submit(time.sleep, 0.6)  # Ocupa el único hueco
+    with pytest.raises(HasherBusyError, match='cola'):
+        pool_hasher.map_hash(['a', 'b'])
+    busy.result()
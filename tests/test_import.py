@@ -0,0 +1,139 @@
+import io
+
+from conftest import login
+from models import contact_io
+from models.contact import Contact
+
+CSV = '''Name,E-mail,Teléfono,Notas
+Ana López,ana@example.com,600 123 456,cliente
+,sin-nombre@example.com,,
+Luis Gil,no-es-un-email,,
+Marta Ruiz,,611 222 333,
+
+"Pérez, Juan",juan@example.com,,"varias, comas"
+'''
+
+VCARD = '''BEGIN:VCARD\r
+VERSION:3.0\r
+FN:Ana López\r
+EMAIL;TYPE=work:ana@example.com\r
+EMAIL:segundo@example.com\r
+TEL;TYPE=cell:+34 600 123 456\r
+NOTE:primera línea\\nsegunda\\, con coma\r
+END:VCARD\r
+BEGIN:VCARD\r
+VERSION:3.0\r
+N:Gil;Luis;;;\r
+item1.TEL:611 222 333\r
+NOTE:una nota muy larga que se ha plegado en\r
+  dos líneas\r
+END:VCARD\r
+BEGIN:VCARD\r
+VERSION:3.0\r
+EMAIL:sin-nombre@example.com\r
+END:VCARD\r
+'''
+
+
+def imported(app, user_id):
+    with app.app_context():
+        return {c.nombre: c for c in Contact.get_all_by_user(user_id)}
+
+
+def run_import(app, user_id, text, fmt, chunk_size=2):
+    with app.app_context():
+        return contact_io.import_contacts(user_id, io.StringIO(text), fmt, chunk_size=chunk_size)
+
+
+def test_csv_import_reports_row_errors(app, user_id):
+    report = run_import(app, user_id, CSV, 'csv')
+    assert (report['total'], report['imported'], report['failed']) == (5, 3, 2)
+    assert [line for line, _ in report['errors']] == [3, 4]
+    assert report['errors'][1][1] == ['El email no tiene un formato válido']
+
+    contacts = imported(app, user_id)
+    assert sorted(contacts) == ['Ana López', 'Marta Ruiz', 'Pérez, Juan']
+    assert contacts['Ana López'].telefono == '600 123 456'
+    assert contacts['Pérez, Juan'].detalle == 'varias, comas'
+
+
+def test_vcard_import(app, user_id):
+    report = run_import(app, user_id, VCARD, 'vcf')
+    assert (report['total'], report['imported'], report['failed']) == (3, 2, 1)
+    assert report['errors'][0][0] == 16
+
+    contacts = imported(app, user_id)
+    ana, luis = contacts['Ana López'], contacts['Luis Gil']
+    assert (ana.correo, ana.telefono) == ('ana@example.com', '+34 600 123 456')
+    assert ana.detalle == 'primera línea\nsegunda, con coma'
+    assert luis.telefono == '611 222 333'
+    assert luis.detalle == 'una nota muy larga que se ha plegado en dos líneas'
+
+
+def test_errors_are_capped(app, user_id):
+    text = 'nombre,correo\n' + ''.join(f'Persona {i},malo{i}\n' for i in range(10))
+    with app.app_context():
+        report = contact_io.import_contacts(user_id, io.StringIO(text), 'csv', chunk_size=3, max_errors=4)
+    assert (report['failed'], len(report['errors'])) == (10, 4)
+
+
+def test_chunks_are_lazy():
+    def records():
+        for i in range(5):
+            yield i
+            assert i < 3, 'se leyó más allá del bloque pedido'
+
+    chunks = contact_io.iter_chunks(records(), 2)
+    assert next(chunks) == [0, 1]
+    assert next(chunks) == [2, 3]
+
+
+def test_import_page(app, client, user_id):
+    login(client, user_id)
+    response = client.post('/contactos/importar', data={
+        'archivo': (io.BytesIO(('\ufeff' + CSV).encode('utf-8')), 'contactos.csv'),
+    }, content_type='multipart/form-data')
+    page = response.get_data(as_text=True)
+    assert '3 contactos importados' in page
+    assert '3 de 5 contactos importados' in page
+    assert len(imported(app, user_id)) == 3
+
+
+def test_import_page_detects_vcard_by_extension(app, client, user_id):
+    login(client, user_id)
+    client.post('/contactos/importar', data={
+        'archivo': (io.BytesIO(VCARD.encode('utf-8')), 'agenda.VCF'),
+    }, content_type='multipart/form-data')
+    assert sorted(imported(app, user_id)) == ['Ana López', 'Luis Gil']
+
+
+def test_import_page_rejects_invalid_encoding(app, client, user_id):
+    login(client, user_id)
+    response = client.post('/contactos/importar', data={
+        'archivo': (io.BytesIO(b'nombre\n\xff\xfe\n'), 'roto.csv'),
+    }, content_type='multipart/form-data')
+    assert 'Archivo no válido' in response.get_data(as_text=True)
+
+
+def invoke(app, *args):
+    # El comando ``flask`` abre el contexto de la aplicación; el runner de pruebas no
+    with app.app_context():
+        return app.test_cli_runner().invoke(args=list(args))
+
+
+def test_cli_import(app, user_id, tmp_path):
+    path = tmp_path / 'contactos.csv'
+    path.write_text(CSV, encoding='utf-8')
+    result = invoke(app, 'contactos', 'importar', 'ana@example.com', str(path), '--lote', '2')
+    assert result.exit_code == 0, result.output
+    assert '3 de 5 contactos importados (2 con errores)' in result.output
+    assert 'Línea 4: El email no tiene un formato válido' in result.output
+    assert len(imported(app, user_id)) == 3
+
+
+def test_cli_import_unknown_user(app, tmp_path):
+    path = tmp_path / 'contactos.csv'
+    path.write_text(CSV, encoding='utf-8')
+    result = invoke(app, 'contactos', 'importar', 'nadie@example.com', str(path))
+    assert result.exit_code != 0
+    assert 'No existe el usuario' in result.output
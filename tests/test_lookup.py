@@ -0,0 +1,75 @@
+import pytest
+
+from conftest import login
+from models import dedupe
+from models.contact import Contact, normalize_phone
+
+
+@pytest.mark.parametrize('phone, expected', [
+    ('+34 600-12-34-56', '600123456'),
+    ('0034 600 123 456', '600123456'),
+    ('600123456', '600123456'),
+    ('+1 212 555 1234', '12125551234'),
+    ('001 212 555 1234', '12125551234'),
+    ('', ''),
+    (None, ''),
+])
+def test_normalize_phone(phone, expected):
+    assert normalize_phone(phone, '34') == expected
+
+
+def test_numbers_differing_before_last_digits_do_not_collide():
+    assert normalize_phone('+1 212 555 1234', '34') != normalize_phone('+1 312 555 1234', '34')
+
+
+def test_trunk_zero_is_ignored_for_default_country():
+    assert normalize_phone('+44 (0)20 7946 0958', '44') == normalize_phone('020 7946 0958', '44') == '2079460958'
+
+
+def test_country_code_comes_from_config(make_app):
+    app = make_app(PHONE_COUNTRY_CODE='1')
+    with app.app_context():
+        assert normalize_phone('+1 212 555 1234') == '2125551234'
+
+
+def add(app, user_id, nombre, telefono='', correo=''):
+    with app.app_context():
+        contact = Contact(user_id=user_id, nombre=nombre, correo=correo, telefono=telefono, detalle='')
+        assert contact.save() == (True, None)
+        return contact.id
+
+
+def test_lookup_matches_full_number(app, client, user_id):
+    nyc = add(app, user_id, 'Nueva York', '+1 212 555 1234')
+    add(app, user_id, 'Chicago', '+1 312 555 1234')
+    madrid = add(app, user_id, 'Madrid', '600 12 34 56')
+    login(client, user_id)
+
+    response = client.post('/contactos/lookup', json={'telefonos': ['001 (212) 555-1234', '+34600123456']})
+    results = response.get_json()['results']
+    assert [[c['id'] for c in r['contacts']] for r in results] == [[nyc], [madrid]]
+
+
+def test_backfill_recomputes_stale_values(app, user_id):
+    contact_id = add(app, user_id, 'Nueva York', '+1 212 555 1234')
+    with app.app_context():
+        from models.database import get_db
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute("UPDATE contactos SET telefono_norm = '125551234' WHERE id = %s", (contact_id,))
+        db.commit()
+        assert [changed for _, changed in Contact.backfill_normalized()] == [1]
+        assert list(Contact.lookup(user_id, 'telefono', ['+12125551234'])) == ['12125551234']
+
+
+def test_dedupe_does_not_group_different_foreign_numbers(app, user_id):
+    # Mismos 9 últimos dígitos, pero números distintos (y no casi iguales)
+    add(app, user_id, 'Ana', '+1 212 555 1234')
+    add(app, user_id, 'Ana', '+44 20 1255 51234')
+    add(app, user_id, 'Luis Pérez', '+34 600 123 456')
+    add(app, user_id, 'Luis Perez', '600123456')
+    with app.app_context():
+        contacts = Contact.get_all_by_user(user_id)
+        groups = dedupe.find_duplicate_groups(contacts)
+    names = [sorted(c.nombre for c in contacts if c.id in group) for group in groups]
+    assert names == [['Luis Perez', 'Luis Pérez']]
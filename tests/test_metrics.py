@@ -0,0 +1,82 @@
+import logging
+import re
+
+from conftest import login
+from models.contact import Contact
+from models.database import get_db
+from models.metrics import InstrumentedConnection, get_registry
+
+
+def metric(body, name, **labels):
+    """Valor de una serie en la exposición de Prometheus (None si no está)"""
+    label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+    series = f'{name}{{{label_text}}}' if labels else name
+    for line in body.splitlines():
+        if line.startswith(series + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+def test_server_timing_counts_queries(client, user_id):
+    login(client, user_id)
+    response = client.get('/contactos/')
+    timings = response.headers.getlist('Server-Timing')
+    assert re.fullmatch(r'app;dur=\d+\.\d', timings[0])
+    match = re.fullmatch(r'db;dur=\d+\.\d;desc="(\d+) consultas"', timings[1])
+    assert match and int(match.group(1)) > 0
+
+
+def test_metrics_endpoint(client, user_id):
+    login(client, user_id)
+    client.get('/contactos/')
+    client.get('/contactos/')
+    client.get('/no-existe')
+
+    response = client.get('/metrics')
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    labels = {'endpoint': 'contact.list', 'method': 'GET'}
+    assert metric(body, 'http_request_duration_seconds_count', **labels) == 2
+    assert metric(body, 'http_request_duration_seconds_bucket', **labels, le='+Inf') == 2
+    assert metric(body, 'http_responses_total', **labels, status='200') == 2
+    assert metric(body, 'http_responses_total', endpoint='desconocido', method='GET', status='404') == 1
+    assert metric(body, 'db_queries_total', endpoint='contact.list') > 0
+    assert metric(body, 'db_slow_queries_total') == 0
+    assert metric(body, 'db_pool_checkouts') > 0
+    assert metric(body, 'cache_hits', cache='contactos') is not None
+
+
+def test_histogram_buckets_are_cumulative(app):
+    with app.app_context():
+        registry = get_registry()
+        for duration in (0.001, 0.02, 0.3, 20):
+            registry.observe_request('x', 'GET', 200, duration, 0, 0.0)
+        body = registry.render()
+    labels = {'endpoint': 'x', 'method': 'GET'}
+    assert metric(body, 'http_request_duration_seconds_bucket', **labels, le='0.005') == 1
+    assert metric(body, 'http_request_duration_seconds_bucket', **labels, le='0.025') == 2
+    assert metric(body, 'http_request_duration_seconds_bucket', **labels, le='10.0') == 3
+    assert metric(body, 'http_request_duration_seconds_bucket', **labels, le='+Inf') == 4
+    assert metric(body, 'http_request_duration_seconds_sum', **labels) == 20.321
+
+
+def test_slow_queries_are_logged_without_parameters(make_app, user_id, caplog):
+    app = make_app(SLOW_QUERY_THRESHOLD=0)
+    with app.app_context(), caplog.at_level(logging.WARNING, logger='models.metrics'):
+        Contact(user_id=user_id, nombre='Ana Secreta', correo='secreto@example.com',
+                telefono='', detalle='').save()
+        body = get_registry().render()
+    assert metric(body, 'db_slow_queries_total') >= 1
+    assert 'Consulta lenta' in caplog.text
+    assert 'parámetros redactados' in caplog.text
+    assert 'secreto@example.com' not in caplog.text and 'Ana Secreta' not in caplog.text
+
+
+def test_metrics_can_be_disabled(make_app, user_id):
+    app = make_app(METRICS_ENABLED=False)
+    client = app.test_client()
+    login(client, user_id)
+    assert 'Server-Timing' not in client.get('/contactos/').headers
+    assert client.get('/metrics').status_code == 404
+    with app.app_context():
+        assert not isinstance(get_db(), InstrumentedConnection)
@@ -0,0 +1,114 @@
+import base64
+import re
+
+import pytest
+
+from conftest import api_token, create_user, login
+from models.contact import Contact
+from models.database import get_db
+
+NAMES = ['Carla', 'Ana', 'Bruno', 'Ana', 'Diego']
+
+
+@pytest.fixture
+def paged_app(make_app):
+    return make_app(CONTACTS_PER_PAGE=2)
+
+
+@pytest.fixture
+def owner(paged_app):
+    user_id = create_user(paged_app)
+    with paged_app.app_context():
+        Contact.bulk_insert(user_id, [Contact(nombre=nombre, correo='', telefono='', detalle='')
+                                      for nombre in NAMES])
+    return user_id
+
+
+def expected_order(app, user_id):
+    with app.app_context():
+        return [(c.nombre, c.id) for c in Contact.get_all_by_user(user_id)]
+
+
+def test_walk_forward_and_back(paged_app, owner):
+    with paged_app.app_context():
+        pages, after = [], None
+        while True:
+            contacts, next_cursor, prev_cursor = Contact.get_page_by_user(owner, limit=2, after=after)
+            pages.append([(c.nombre, c.id) for c in contacts])
+            assert (prev_cursor is None) == (after is None)
+            if not next_cursor:
+                break
+            after = Contact.decode_cursor(next_cursor)
+
+        # Los empates de nombre se ordenan por id: ninguna fila se repite ni se pierde
+        seen = [row for page in pages for row in page]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert seen == sorted(seen) == sorted(expected_order(paged_app, owner))
+
+        contacts, next_cursor, prev_cursor = Contact.get_page_by_user(
+            owner, limit=2, before=Contact.decode_cursor(prev_cursor))
+        assert [(c.nombre, c.id) for c in contacts] == pages[1]
+        contacts, _, prev_cursor = Contact.get_page_by_user(
+            owner, limit=2, before=Contact.decode_cursor(prev_cursor))
+        assert [(c.nombre, c.id) for c in contacts] == pages[0]
+        assert prev_cursor is None
+
+
+def test_cursor_round_trip():
+    cursor = Contact.encode_cursor('Ñandú, José', 42)
+    assert re.fullmatch(r'[A-Za-z0-9_-]+', cursor)
+    assert Contact.decode_cursor(cursor) == ('Ñandú, José', 42)
+
+
+@pytest.mark.parametrize('value', [
+    None, '', 'no-es-base64!', base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+    base64.urlsafe_b64encode(b'["Ana"]').decode(), base64.urlsafe_b64encode(b'["Ana", "x"]').decode(),
+    base64.urlsafe_b64encode(b'\xff\xfe').decode(),
+])
+def test_malformed_cursor_is_ignored(value):
+    assert Contact.decode_cursor(value) is None
+
+
+def test_list_page_links(paged_app, owner):
+    client = paged_app.test_client()
+    login(client, owner)
+    order = [nombre for nombre, _ in expected_order(paged_app, owner)]
+
+    first = client.get('/contactos/').get_data(as_text=True)
+    assert 'Total de contactos: 5' in first
+    next_url = re.search(r'href="(/contactos/\?after=[^"]+)"', first).group(1)
+    second = client.get(next_url.replace('&amp;', '&')).get_data(as_text=True)
+    assert re.search(r'href="/contactos/\?before=', second)
+    assert order[2] in second and order[3] in second
+
+
+def test_list_with_malformed_cursor_shows_first_page(paged_app, owner):
+    client = paged_app.test_client()
+    login(client, owner)
+    response = client.get('/contactos/?after=%%%basura')
+    assert response.status_code == 200
+    assert 'after=' in response.get_data(as_text=True)
+
+
+def test_api_pagination(paged_app, owner):
+    client = paged_app.test_client()
+    headers = api_token(paged_app, owner)
+    names = []
+    url = '/api/v1/contacts?limit=2'
+    while url:
+        body = client.get(url, headers=headers).get_json()
+        names += [item['nombre'] for item in body['items']]
+        url = f"/api/v1/contacts?limit=2&after={body['next']}" if body['next'] else None
+    assert names == sorted(NAMES)
+
+    body = client.get('/api/v1/contacts?limit=2&after=basura', headers=headers).get_json()
+    assert [item['nombre'] for item in body['items']] == ['Ana', 'Ana']
+
+
+def test_page_index_exists(app):
+    with app.app_context():
+        cursor = get_db().cursor()
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_user_nombre_id'")
+        (sql,) = cursor.fetchone()
+        cursor.close()
+    assert re.sub(r'\s+', '', sql).endswith('(user_id,nombre,id)')
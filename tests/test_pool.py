@@ -0,0 +1,163 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from models.database import get_pool, reset_pool
+from models.pool import ConnectionPool, PoolTimeoutError
+
+
+class Factory:
+    """Conexiones sqlite3 en memoria que cuentan cuántas se abren"""
+
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.created.append(conn)
+        return conn
+
+
+def is_closed(conn):
+    try:
+        conn.execute('SELECT 1')
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+def test_release_reuses_connection():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=2, max_overflow=0)
+
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    assert len(factory.created) == 1
+    assert pool.stats()['in_use'] == 1
+
+
+def test_connection_context_manager_releases():
+    pool = ConnectionPool(Factory(), size=1, max_overflow=0)
+    with pool.connection() as conn:
+        conn.execute('SELECT 1')
+        assert pool.stats()['in_use'] == 1
+    stats = pool.stats()
+    assert (stats['in_use'], stats['idle']) == (0, 1)
+
+
+def test_release_rolls_back_open_transaction():
+    pool = ConnectionPool(Factory(), size=1, max_overflow=0)
+    conn = pool.acquire()
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.commit()
+    conn.execute('INSERT INTO t VALUES (1)')
+    pool.release(conn)
+
+    conn = pool.acquire()
+    assert conn.execute('SELECT COUNT(*) FROM t').fetchone() == (0,)
+
+
+def test_overflow_connections_are_closed_on_release():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=1, max_overflow=2)
+
+    conns = [pool.acquire() for _ in range(3)]
+    assert pool.stats()['open'] == 3
+    for conn in conns:
+        pool.release(conn)
+
+    stats = pool.stats()
+    assert (stats['open'], stats['idle'], stats['in_use']) == (1, 1, 0)
+    assert sum(is_closed(conn) for conn in conns) == 2
+
+
+def test_acquire_times_out_when_exhausted():
+    pool = ConnectionPool(Factory(), size=1, max_overflow=1, timeout=0.05)
+    pool.acquire()
+    pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    stats = pool.stats()
+    assert stats['timeouts'] == 1
+    assert stats['open'] == 2
+
+
+def test_waiting_acquire_gets_released_connection():
+    pool = ConnectionPool(Factory(), size=1, max_overflow=0, timeout=5)
+    conn = pool.acquire()
+    threading.Timer(0.05, pool.release, (conn,)).start()
+
+    assert pool.acquire() is conn
+    assert pool.stats()['waits'] == 1
+
+
+def test_stale_connection_is_recycled():
+    factory = Factory()
+    pool = ConnectionPool(factory, size=1, max_overflow=0, recycle=0.01)
+    old = pool.acquire()
+    pool.release(old)
+    time.sleep(0.02)
+
+    new = pool.acquire()
+    assert new is not old
+    assert is_closed(old)
+    assert pool.stats()['recycled'] == 1
+
+
+def test_dead_connection_fails_pre_ping():
+    pool = ConnectionPool(Factory(), size=1, max_overflow=0, recycle=0)
+    old = pool.acquire()
+    pool.release(old)
+    old.close()  # El servidor cerró la conexión mientras estaba libre
+
+    new = pool.acquire()
+    assert new is not old
+    new.execute('SELECT 1')
+    assert pool.stats()['recycled'] == 1
+
+
+def test_failed_connect_frees_the_slot():
+    def broken():
+        raise sqlite3.OperationalError('sin servidor')
+
+    pool = ConnectionPool(broken, size=1, max_overflow=0, timeout=0.05)
+    for _ in range(2):
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire()
+    assert pool.stats()['open'] == 0
+
+
+def test_dispose_closes_idle_connections():
+    pool = ConnectionPool(Factory(), size=2, max_overflow=0)
+    conns = [pool.acquire() for _ in range(2)]
+    for conn in conns:
+        pool.release(conn)
+
+    pool.dispose()
+    assert all(is_closed(conn) for conn in conns)
+    assert pool.stats()['open'] == 0
+
+
+def test_reset_pool_creates_a_new_pool(app):
+    with app.app_context():
+        pool = get_pool()
+        with pool.connection() as conn:
+            conn.cursor().execute('SELECT 1')
+
+    reset_pool(app, close=True)
+    assert pool.stats()['open'] == 0
+    with app.app_context():
+        assert get_pool() is not pool
+
+
+def test_requests_return_connections_to_the_pool(app, client):
+    for _ in range(3):
+        assert client.get('/health/db').status_code == 200
+    with app.app_context():
+        stats = get_pool().stats()
+    assert stats['in_use'] == 0
+    assert stats['open'] <= stats['size']
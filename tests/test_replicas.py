@@ -0,0 +1,182 @@
+import sqlite3
+import time
+
+import pytest
+from flask import g, session
+
+from conftest import api_token, create_user, login
+from models.cache import get_contact_cache
+from models.contact import Contact
+from models.database import (WRITE_MARKER, get_db, get_read_db, get_replicas, mark_write,
+                             replica_stats, reset_pool)
+from models.pool import ConnectionPool, ReplicaSet
+
+
+def broken():
+    raise sqlite3.OperationalError('réplica caída')
+
+
+def snapshot(app, path):
+    """Copiar la base de datos del primario: una réplica parada en este instante"""
+    source = sqlite3.connect(app.config['SQLITE_PATH'])
+    target = sqlite3.connect(path)
+    source.backup(target)
+    source.close()
+    target.close()
+    return str(path)
+
+
+@pytest.fixture
+def replicated(make_app, tmp_path):
+    """Aplicación con una réplica atrasada: tiene el usuario pero no lo que se
+    escriba después. Devuelve (aplicación, id del usuario)."""
+    primary = make_app()
+    user_id = create_user(primary)
+    app = make_app(DB_REPLICAS=snapshot(primary, tmp_path / 'replica.db'))
+    return app, user_id
+
+
+def names(response):
+    return [item['nombre'] for item in response.get_json()['items']]
+
+
+def test_replica_set_round_robin():
+    pools = [ConnectionPool(lambda: sqlite3.connect(':memory:', check_same_thread=False), size=1)
+             for _ in range(2)]
+    replicas = ReplicaSet(['a', 'b'], pools)
+
+    chosen = []
+    for _ in range(4):
+        index, conn = replicas.acquire()
+        chosen.append(index)
+        replicas.release(index, conn)
+    assert chosen == [0, 1, 0, 1]
+    assert [stats['reads'] for stats in replicas.stats()] == [2, 2]
+
+
+def test_replica_set_skips_failed_replica():
+    healthy = ConnectionPool(lambda: sqlite3.connect(':memory:', check_same_thread=False), size=1)
+    replicas = ReplicaSet(['caida', 'sana'], [ConnectionPool(broken, size=1), healthy], retry_after=60)
+
+    for _ in range(3):
+        index, conn = replicas.acquire()
+        assert index == 1
+        replicas.release(index, conn)
+
+    down, up = replicas.stats()
+    # Apartada tras el primer fallo: no se vuelve a intentar hasta retry_after
+    assert (down['healthy'], down['failures']) == (False, 1)
+    assert (up['healthy'], up['reads']) == (True, 3)
+
+
+def test_replica_set_skips_busy_replica_without_waiting():
+    def memory():
+        return sqlite3.connect(':memory:', check_same_thread=False)
+    busy = ConnectionPool(memory, size=1, max_overflow=0, timeout=30)
+    held = busy.acquire()
+    replicas = ReplicaSet(['ocupada', 'libre'], [busy, ConnectionPool(memory, size=1)])
+
+    start = time.monotonic()
+    index, conn = replicas.acquire()
+    assert index == 1
+    assert time.monotonic() - start < 1
+    replicas.release(index, conn)
+
+    # Ocupada no es caída: en cuanto se libera vuelve a recibir lecturas
+    stats = replicas.stats()[0]
+    assert (stats['healthy'], stats['failures'], stats['busy']) == (True, 0, 1)
+    busy.release(held)
+    assert sorted(replicas.acquire()[0] for _ in range(2)) == [0, 1]
+
+
+def test_replica_set_all_busy_returns_nothing():
+    busy = ConnectionPool(lambda: sqlite3.connect(':memory:', check_same_thread=False),
+                          size=1, max_overflow=0)
+    busy.acquire()
+    replicas = ReplicaSet(['ocupada'], [busy])
+    assert replicas.acquire() == (None, None)
+    assert replicas.stats()[0]['healthy']
+
+
+def test_read_db_falls_back_to_primary_without_replicas(app, user_id):
+    app.config['DB_REPLICA_CONNECTION_FACTORIES'] = [broken]
+    reset_pool(app, close=True)
+    with app.test_request_context():
+        assert get_read_db() is get_db()
+        assert Contact.count_by_user(user_id) == 0
+        assert replica_stats()[0]['failures'] == 1
+
+
+def test_reads_go_to_replica_until_write(replicated):
+    app, user_id = replicated
+    with app.test_request_context():
+        assert get_read_db() is not get_db()
+        mark_write(user_id)
+        assert get_read_db() is get_db()
+
+
+def test_session_marker_routes_next_request_to_primary(replicated):
+    app, user_id = replicated
+    # Sin caché de contactos la única marca es la de la sesión
+    app.extensions['contact_cache'] = None
+    client = app.test_client()
+    login(client, user_id)
+
+    response = client.post('/contactos/agregar', data={'nombre': 'Beatriz'})
+    assert response.status_code == 302
+    with client.session_transaction() as stored:
+        assert WRITE_MARKER in stored
+
+    response = client.get('/contactos/')
+    assert b'Beatriz' in response.data
+
+
+def test_api_client_reads_its_writes(replicated):
+    app, user_id = replicated
+    client = app.test_client()
+    headers = api_token(app, user_id)
+
+    response = client.post('/api/v1/contacts', json={'nombre': 'Beatriz'}, headers=headers)
+    assert response.status_code == 201
+    # La API no tiene sesión: la marca va en la caché de contactos, sin cookie
+    assert 'Set-Cookie' not in response.headers
+
+    fresh = app.test_client()
+    assert names(fresh.get('/api/v1/contacts', headers=headers)) == ['Beatriz']
+
+
+def test_api_mark_write_does_not_touch_session(replicated):
+    app, user_id = replicated
+    with app.test_request_context():
+        g.api_user_id = user_id
+        mark_write()
+        assert WRITE_MARKER not in session
+        assert not session.modified
+        assert get_contact_cache().get(f'{WRITE_MARKER}:{user_id}', count=False) is not None
+
+
+def test_lagging_replica_does_not_poison_writer_cache(replicated):
+    app, user_id = replicated
+    client = app.test_client()
+    headers = api_token(app, user_id)
+    client.post('/api/v1/contacts', json={'nombre': 'Beatriz'}, headers=headers)
+
+    # Una lectura sin la marca (p. ej. de otro proceso) llega a la réplica
+    # atrasada y guarda la página vacía bajo la versión nueva
+    with app.test_request_context():
+        assert list(Contact.get_page_by_user(user_id)[0]) == []
+
+    assert names(client.get('/api/v1/contacts', headers=headers)) == ['Beatriz']
+
+
+def test_marker_expires_after_window(replicated):
+    app, user_id = replicated
+    app.config['DB_READ_YOUR_WRITES_WINDOW'] = 0.05
+    with app.test_request_context():
+        g.api_user_id = user_id
+        mark_write()
+    time.sleep(0.1)
+    with app.test_request_context():
+        g.api_user_id = user_id
+        assert get_replicas() is not None
+        assert get_read_db() is not get_db()
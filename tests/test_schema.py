@@ -0,0 +1,99 @@
+import pytest
+
+from models.database import get_backend
+from models.schema import (SchemaVersionError, applied_migrations, check_schema, current_version,
+                           discover_migrations, latest_version, upgrade)
+
+
+def version(app):
+    backend = get_backend(app)
+    conn = backend.connect()
+    try:
+        return current_version(conn.cursor(), backend)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def empty_app(make_app):
+    """Aplicación sobre una base de datos sin migrar"""
+    return make_app(DB_AUTO_MIGRATE=False)
+
+
+def test_outdated_schema_answers_503(empty_app):
+    response = empty_app.test_client().get('/auth/login')
+    assert response.status_code == 503
+    assert b'db upgrade' in response.data
+
+
+def test_check_schema_raises_without_auto_migrate(empty_app):
+    with pytest.raises(SchemaVersionError):
+        check_schema(empty_app)
+
+
+def test_upgrade_applies_pending_migrations_in_order(empty_app):
+    expected = [number for number, _, _ in discover_migrations()]
+    assert upgrade(empty_app) == expected
+    assert version(empty_app) == latest_version()
+    assert check_schema(empty_app) == latest_version()
+
+
+def test_upgrade_is_idempotent(empty_app):
+    upgrade(empty_app)
+    assert upgrade(empty_app) == []
+
+
+def test_upgrade_to_target(empty_app):
+    assert upgrade(empty_app, target=1) == [1]
+    assert version(empty_app) == 1
+    assert upgrade(empty_app) == list(range(2, latest_version() + 1))
+
+
+def test_auto_migrate_at_startup(app):
+    assert version(app) == latest_version()
+
+
+def write_migration(directory, filename, body):
+    (directory / filename).write_text(body, encoding='utf-8')
+
+
+def test_failed_migration_keeps_previous_ones(empty_app, tmp_path):
+    migrations = tmp_path / 'migrations'
+    migrations.mkdir()
+    write_migration(migrations, '0001_tabla.py',
+                    "def upgrade(cursor, backend):\n    cursor.execute('CREATE TABLE prueba (id INT)')\n")
+    write_migration(migrations, '0002_rota.py',
+                    "def upgrade(cursor, backend):\n    raise RuntimeError('rota')\n")
+
+    with pytest.raises(RuntimeError, match='rota'):
+        upgrade(empty_app, directory=str(migrations))
+    assert version(empty_app) == 1
+
+    write_migration(migrations, '0002_rota.py', "def upgrade(cursor, backend):\n    pass\n")
+    assert upgrade(empty_app, directory=str(migrations)) == [2]
+
+    backend = get_backend(empty_app)
+    conn = backend.connect()
+    try:
+        assert [row[:2] for row in applied_migrations(conn.cursor(), backend)] == [(1, 'tabla'), (2, 'rota')]
+    finally:
+        conn.close()
+
+
+def test_duplicate_migration_numbers_are_rejected(tmp_path):
+    for filename in ('0001_a.py', '0001_b.py'):
+        write_migration(tmp_path, filename, "def upgrade(cursor, backend):\n    pass\n")
+    with pytest.raises(SchemaVersionError):
+        discover_migrations(str(tmp_path))
+
+
+def test_outdated_schema_answers_503_with_sql_sessions(make_app):
+    from itsdangerous import Signer
+    app = make_app(DB_AUTO_MIGRATE=False, SESSION_BACKEND='sql')
+    client = app.test_client()
+    cookie = Signer(app.secret_key, salt='server-side-session').sign('sesion-existente').decode('ascii')
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], cookie)
+
+    response = client.get('/auth/login')
+    assert response.status_code == 503
+    assert b'db upgrade' in response.data
@@ -0,0 +1,92 @@
+import pytest
+
+from conftest import create_user
+from models.contact import Contact
+from models.search import TrigramIndexRegistry
+
+
+def rows(*names):
+    return lambda user_id: [(i, name, '', '') for i, name in enumerate(names, 1)]
+
+
+def test_registry_reuses_index_for_same_version():
+    registry = TrigramIndexRegistry()
+    index = registry.get(1, rows('Ana'), version=5)
+    assert registry.get(1, rows('Otro'), version=5) is index
+
+
+def test_registry_rebuilds_when_version_changes():
+    registry = TrigramIndexRegistry()
+    registry.get(1, rows('Ana'), version=5)
+    index = registry.get(1, rows('Ana', 'Berta'), version=6)
+    assert index.search('berta') == [2]
+
+
+def test_apply_keeps_index_after_own_write():
+    registry = TrigramIndexRegistry()
+    index = registry.get(1, rows('Ana'), version=5)
+    registry.apply(1, 6, lambda idx: idx.add(2, 'Berta', '', ''))
+
+    assert registry.get(1, rows(), version=6) is index
+    assert index.search('berta') == [2]
+
+
+@pytest.mark.parametrize('version', [7, None])
+def test_apply_discards_index_after_foreign_write(version):
+    registry = TrigramIndexRegistry()
+    registry.get(1, rows('Ana'), version=5)
+    # Otro proceso escribió antes (la versión saltó) o no hay versión numérica
+    registry.apply(1, version, lambda idx: idx.add(2, 'Berta', '', ''))
+    assert registry.peek(1) is None
+
+
+def test_registry_evicts_least_recently_used():
+    registry = TrigramIndexRegistry(max_users=2)
+    for user_id in (1, 2, 3):
+        registry.get(user_id, rows('Ana'), version=1)
+    assert registry.peek(1) is None
+    assert registry.peek(3) is not None
+
+
+def add_contact(app, user_id, nombre):
+    with app.app_context():
+        contact = Contact(user_id=user_id, nombre=nombre, correo='', telefono='', detalle='')
+        assert contact.save() == (True, None)
+        return contact.id
+
+
+def search_names(app, user_id, query):
+    with app.app_context():
+        contacts, _ = Contact.search(user_id, query)
+        return [contact.nombre for contact in contacts]
+
+
+@pytest.mark.parametrize('cache_backend', ['memory', 'none'])
+def test_search_sees_writes_from_another_process(make_app, cache_backend):
+    worker_a = make_app(CONTACT_CACHE_BACKEND=cache_backend)
+    worker_b = make_app(CONTACT_CACHE_BACKEND=cache_backend)
+    if cache_backend == 'memory':
+        # Una caché compartida entre los dos, como Redis
+        with worker_a.app_context():
+            from models.cache import get_contact_cache
+            worker_b.extensions['contact_cache'] = get_contact_cache()
+    user_id = create_user(worker_a)
+
+    add_contact(worker_a, user_id, 'Ana Torres')
+    assert search_names(worker_a, user_id, 'torres') == ['Ana Torres']
+
+    add_contact(worker_b, user_id, 'Luis Torres')
+    assert sorted(search_names(worker_a, user_id, 'torres')) == ['Ana Torres', 'Luis Torres']
+
+
+def test_own_writes_update_index_in_place(app, user_id):
+    add_contact(app, user_id, 'Ana Torres')
+    search_names(app, user_id, 'torres')
+    with app.app_context():
+        from models.search import get_trigram_registry
+        index = get_trigram_registry().peek(user_id)
+
+    add_contact(app, user_id, 'Luis Torres')
+    assert len(search_names(app, user_id, 'torres')) == 2
+    with app.app_context():
+        assert get_trigram_registry().peek(user_id) is index
@@ -0,0 +1,140 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import PASSWORD, create_user
+from models.session_store import MemorySessionStore, ServerSideSessionInterface, SqlSessionStore
+
+BACKENDS = ['cookie', 'memory', 'sql', 'filesystem']
+
+
+@pytest.fixture(params=BACKENDS)
+def session_app(request, make_app, tmp_path):
+    return make_app(SESSION_BACKEND=request.param, SESSION_FILE_DIR=str(tmp_path / 'flask_session'))
+
+
+def log_in(client, email='ana@example.com'):
+    return client.post('/auth/login', data={'email': email, 'password': PASSWORD})
+
+
+def test_login_survives_requests_and_logout_ends_it(session_app):
+    create_user(session_app)
+    client = session_app.test_client()
+    assert client.get('/contactos/').status_code == 302
+
+    assert log_in(client).status_code == 302
+    assert client.get('/contactos/').status_code == 200
+    client.get('/auth/logout')
+    assert client.get('/contactos/').status_code == 302
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sql'])
+def test_server_side_cookie_only_carries_the_signed_id(make_app, backend):
+    app = make_app(SESSION_BACKEND=backend)
+    create_user(app)
+    client = app.test_client()
+    log_in(client)
+    cookie = client.get_cookie(app.config['SESSION_COOKIE_NAME']).value
+    assert 'user_id' not in cookie and '.' in cookie
+
+    # Un id manipulado no abre ninguna sesión
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], cookie[:-2] + 'xx')
+    assert client.get('/contactos/').status_code == 302
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sql'])
+def test_unchanged_session_is_not_rewritten(make_app, backend, monkeypatch):
+    app = make_app(SESSION_BACKEND=backend)
+    create_user(app)
+    client = app.test_client()
+    log_in(client)
+
+    saves = []
+    store = app.session_interface.store
+    original = store.save
+    monkeypatch.setattr(store, 'save', lambda *args: saves.append(args) or original(*args))
+    response = client.get('/auth/profile')
+    assert response.status_code == 200
+    assert saves == []
+
+
+def test_sessions_are_shared_between_nodes_with_sql(make_app):
+    first = make_app(SESSION_BACKEND='sql')
+    second = make_app(SESSION_BACKEND='sql')
+    create_user(first)
+    client = first.test_client()
+    log_in(client)
+    cookie = client.get_cookie(first.config['SESSION_COOKIE_NAME']).value
+
+    other = second.test_client()
+    other.set_cookie(second.config['SESSION_COOKIE_NAME'], cookie)
+    assert other.get('/contactos/').status_code == 200
+
+
+def test_filesystem_backend_writes_session_files(make_app, tmp_path):
+    app = make_app(SESSION_BACKEND='filesystem', SESSION_FILE_DIR=str(tmp_path / 'flask_session'))
+    create_user(app)
+    log_in(app.test_client())
+    assert any((tmp_path / 'flask_session').iterdir())
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_entries=2)
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    store.save('a', '{}', expires)
+    store.save('b', '{}', expires)
+    store.load('a')
+    store.save('c', '{}', expires)
+    assert store.load('b') is None
+    assert store.load('a') is not None and store.load('c') is not None
+    assert store.stats()['evictions'] == 1
+
+
+def test_memory_store_expires_and_sweeps():
+    store = MemorySessionStore(sweep_interval=0)
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    store.save('viejo', '{}', past)
+    store.save('otro', '{}', past)
+    assert store.load('viejo') is None
+    assert store.stats() == {'backend': 'memory', 'sessions': 0, 'evictions': 0, 'expired': 2}
+
+
+def test_sql_store_round_trip_and_expiry(app):
+    store = SqlSessionStore(sweep_interval=0)
+    with app.app_context():
+        future = datetime.now(timezone.utc) + timedelta(hours=1)
+        store.save('vigente', '{"a": 1}', future)
+        store.save('caducada', '{}', datetime.now(timezone.utc) - timedelta(seconds=1))
+
+        data, expires = store.load('vigente')
+        assert data == '{"a": 1}'
+        assert abs(expires - future.timestamp()) < 1
+        assert store.load('caducada') is None
+
+        store.delete('vigente')
+        assert store.load('vigente') is None
+
+
+def test_stale_session_is_renewed(make_app):
+    app = make_app(SESSION_BACKEND='memory')
+    create_user(app)
+    client = app.test_client()
+    log_in(client)
+
+    store = app.session_interface.store
+    (sid, (data, _)), = store._data.items()
+    # Más de la mitad de la vida consumida: la siguiente petición la renueva
+    store._data[sid] = (data, time.time() + 60)
+    client.get('/auth/profile')
+    assert store._data[sid][1] > time.time() + 1800
+
+
+def test_unknown_backend_is_rejected(make_app):
+    with pytest.raises(ValueError):
+        make_app(SESSION_BACKEND='redis')
+
+
+def test_interface_is_server_side_only_for_stores(make_app):
+    assert isinstance(make_app(SESSION_BACKEND='memory').session_interface, ServerSideSessionInterface)
+    assert not isinstance(make_app(SESSION_BACKEND='cookie').session_interface, ServerSideSessionInterface)
@@ -0,0 +1,34 @@
+import pytest
+
+PROVISIONING_TOKEN = 'token-de-aprovisionamiento'
+
+
+@pytest.fixture
+def provisioning(make_app):
+    app = make_app(PROVISIONING_TOKEN=PROVISIONING_TOKEN, PROVISIONING_MAX_USERS=3)
+    return app.test_client(), {'Authorization': f'Bearer {PROVISIONING_TOKEN}'}
+
+
+def users(count, start=0):
+    return [{'nombre': f'Usuario {i}', 'email': f'u{i}@example.com', 'password': 'password-largo'}
+            for i in range(start, start + count)]
+
+
+def test_bulk_provisioning_creates_users(provisioning):
+    client, headers = provisioning
+    response = client.post('/api/v1/users/bulk', json=users(2) + [{'nombre': 'x'}], headers=headers)
+    assert response.status_code == 201
+    assert (response.get_json()['created'], response.get_json()['failed']) == (2, 1)
+
+
+def test_bulk_provisioning_is_capped(provisioning):
+    client, headers = provisioning
+    response = client.post('/api/v1/users/bulk', json=users(4), headers=headers)
+    assert response.status_code == 413
+    assert 'aprovisionar' in response.get_json()['error']
+
+
+def test_bulk_provisioning_requires_token(provisioning):
+    client, _ = provisioning
+    response = client.post('/api/v1/users/bulk', json=users(1), headers={'Authorization': 'Bearer otro'})
+    assert response.status_code == 401
@@ -0,0 +1,11 @@
+"""
+Punto de entrada WSGI para servidores de producción:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+``python app.py`` sigue usando el servidor de desarrollo de Flask.
+"""
+
+from app import create_app
+
+app = create_app()